@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+from sys import path as syspath
+from os import path as ospath
+from argparse import ArgumentParser
+from asyncio import sleep, gather, Event, wait_for, TimeoutError as AsyncTimeoutError
+from statistics import mean, median
+from time import perf_counter
+
+syspath.insert(0, ospath.dirname(ospath.abspath(__file__)))
+
+from harness import BenchEnvironment
+
+
+def summarize(name, samples, unit='ms', scale=1000):
+    if not samples:
+        print(f'{name:<34} no samples')
+        return
+    ordered = sorted(samples)
+    p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    print(f'{name:<34} mean {mean(samples) * scale:9.2f}{unit}  p50 {median(samples) * scale:9.2f}{unit}  '
+          f'p95 {p95 * scale:9.2f}{unit}  max {ordered[-1] * scale:9.2f}{unit}')
+
+
+class LagProbe:
+    def __init__(self, period=0.01):
+        self.period = period
+        self.samples = []
+        self.__stop = Event()
+
+    async def run(self):
+        while not self.__stop.is_set():
+            start = perf_counter()
+            await sleep(self.period)
+            self.samples.append(max(perf_counter() - start - self.period, 0))
+
+    def stop(self):
+        self.__stop.set()
+
+
+async def bench_render(env, ticks, views):
+    from bot.helper.ext_utils.bot_utils import get_readable_messages, sync_to_async
+    lock = env.bot.download_dict_lock
+    render, hold = [], []
+    probe = LagProbe()
+    probe_task = env.loop.create_task(probe.run())
+    for _ in range(ticks):
+        start = perf_counter()
+        async with lock:
+            acquired = perf_counter()
+            await sync_to_async(get_readable_messages, views)
+            hold.append(perf_counter() - acquired)
+        render.append(perf_counter() - start)
+        await sleep(0)
+    probe.stop()
+    await probe_task
+    summarize(f'render {len(views)} view(s)/tick', render)
+    summarize('download_dict_lock hold/tick', hold)
+    summarize('event loop lag (render)', probe.samples)
+    print(f'{"backend calls/tick":<34} qbit {env.qbit_counter.calls / ticks:.1f}  aria2 {env.aria2_counter.calls / ticks:.1f}')
+
+
+async def bench_get_all(env, rounds):
+    from bot.helper.ext_utils.bot_utils import getAllDownload, MirrorStatus
+    samples = []
+    for index in range(rounds):
+        start = perf_counter()
+        await getAllDownload(MirrorStatus.STATUS_DOWNLOADING, index % env.users + 1)
+        await getAllDownload('all', index % env.users + 1)
+        samples.append(perf_counter() - start)
+    summarize('getAllDownload (status + user)', samples)
+
+
+async def bench_start_from_queued(env, rounds, queued):
+    from bot.helper.ext_utils.task_manager import start_from_queued
+    bot = env.bot
+    bot.config_dict.update(QUEUE_DOWNLOAD=4, QUEUE_UPLOAD=4)
+    samples = []
+    for _ in range(rounds):
+        bot.queued_dl.clear()
+        bot.non_queued_dl.clear()
+        for uid in range(queued):
+            bot.queued_dl[uid] = Event()
+        start = perf_counter()
+        await start_from_queued()
+        samples.append(perf_counter() - start)
+    bot.config_dict.update(QUEUE_DOWNLOAD=0, QUEUE_UPLOAD=0)
+    bot.queued_dl.clear()
+    summarize(f'start_from_queued ({queued} waiting)', samples)
+
+
+async def bench_qbit_listener(env, duration):
+    from bot.helper.listeners import qbit_listener
+    bot = env.bot
+    for tag in env.torrents:
+        bot.QbTorrents[tag] = {'stalled_time': 0, 'stop_dup_check': True, 'rechecked': True, 'uploaded': False,
+                               'seeding': False, 'size_checked': True}
+    env.qbit_counter.calls = 0
+    waits = []
+    probe = LagProbe()
+    probe_task = env.loop.create_task(probe.run())
+    listener = env.loop.create_task(getattr(qbit_listener, '__qb_listener')())
+
+    async def contend():
+        while not listener.done():
+            start = perf_counter()
+            async with bot.qb_listener_lock:
+                waits.append(perf_counter() - start)
+            await sleep(0.05)
+
+    try:
+        await wait_for(gather(listener, contend()), duration)
+    except AsyncTimeoutError:
+        pass
+    probe.stop()
+    await probe_task
+    summarize('qb_listener_lock wait', waits)
+    summarize('event loop lag (qbit listener)', probe.samples)
+    print(f'{"qbit calls during listener":<34} {env.qbit_counter.calls}')
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark status rendering, queue release and the qBittorrent listener.')
+    parser.add_argument('-t', '--tasks', type=int, default=300, help='number of synthetic tasks')
+    parser.add_argument('-u', '--users', type=int, default=20, help='number of distinct task owners')
+    parser.add_argument('-l', '--latency', type=float, default=0.002, help='seconds added to every qBit/aria2 call')
+    parser.add_argument('-n', '--ticks', type=int, default=20, help='status render ticks')
+    parser.add_argument('-v', '--views', type=int, default=3, help='distinct status pages rendered per tick')
+    parser.add_argument('-d', '--duration', type=float, default=5, help='seconds to run the qbit listener')
+    args = parser.parse_args()
+
+    env = BenchEnvironment(args.tasks, args.latency, args.users)
+    env.populate()
+    print(f'{args.tasks} tasks, {args.users} users, {args.latency * 1000:.1f}ms backend latency')
+    views = {(page, 'all') for page in range(1, args.views + 1)}
+    env.loop.run_until_complete(bench_render(env, args.ticks, views))
+    env.loop.run_until_complete(bench_get_all(env, args.ticks * 10))
+    env.loop.run_until_complete(bench_start_from_queued(env, args.ticks, args.tasks))
+    env.loop.run_until_complete(bench_qbit_listener(env, args.duration))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+from sys import modules
+from time import sleep, time
+from types import ModuleType, SimpleNamespace
+from logging import getLogger, basicConfig, WARNING
+from asyncio import Lock, new_event_loop, set_event_loop
+from os import path as ospath
+from random import Random
+
+ROOT = ospath.dirname(ospath.dirname(ospath.abspath(__file__)))
+BOT_DIR = ospath.join(ROOT, 'bot')
+
+QBIT_STATES = ['downloading', 'downloading', 'downloading', 'stalledDL', 'queuedDL', 'pausedDL', 'uploading']
+ARIA2_STATES = ['active', 'active', 'active', 'waiting', 'paused']
+
+
+class BenchConfig(dict):
+    def __missing__(self, key):
+        return ''
+
+
+class LatencyCounter:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.blocked = 0
+
+    def hit(self):
+        self.calls += 1
+        if self.latency:
+            sleep(self.latency)
+            self.blocked += self.latency
+
+
+class FakeQbClient:
+    def __init__(self, torrents, counter):
+        self.__torrents = torrents
+        self.__counter = counter
+
+    def torrents_info(self, tag=None, **kwargs):
+        self.__counter.hit()
+        if tag is None:
+            return list(self.__torrents.values())
+        return [tor] if (tor := self.__torrents.get(tag)) is not None else []
+
+    def torrents_reannounce(self, **kwargs):
+        self.__counter.hit()
+
+    def auth_log_out(self):
+        pass
+
+
+class FakeAria2Client:
+    TELL_ACTIVE = 'aria2.tellActive'
+    TELL_WAITING = 'aria2.tellWaiting'
+    TELL_STOPPED = 'aria2.tellStopped'
+
+    def __init__(self, structs, counter):
+        self.__structs = structs
+        self.__counter = counter
+
+    def multicall2(self, calls):
+        self.__counter.hit()
+        by_status = {self.TELL_ACTIVE: 'active', self.TELL_WAITING: ('waiting', 'paused'), self.TELL_STOPPED: 'complete'}
+        results = []
+        for method, _ in calls:
+            wanted = by_status[method]
+            results.append([[struct for struct in self.__structs.values() if struct['status'] in wanted]])
+        return results
+
+    def tell_status(self, gid, keys=None):
+        self.__counter.hit()
+        return self.__structs[gid]
+
+
+class FakeAria2:
+    def __init__(self, structs, counter):
+        self.client = FakeAria2Client(structs, counter)
+        self.__structs = structs
+
+    def get_download(self, gid):
+        from aria2p import Download
+        return Download(self, self.client.tell_status(gid))
+
+
+class BenchEnvironment:
+    def __init__(self, tasks=300, latency=0.0, users=20, seed=7):
+        self.tasks = tasks
+        self.users = users
+        self.random = Random(seed)
+        self.qbit_counter = LatencyCounter(latency)
+        self.aria2_counter = LatencyCounter(latency)
+        self.torrents = {}
+        self.structs = {}
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+        self.bot = self.__install()
+
+    def __install(self):
+        basicConfig(level=WARNING)
+        bot = ModuleType('bot')
+        bot.__path__ = [BOT_DIR]
+        bot.__file__ = ospath.join(BOT_DIR, '__init__.py')
+        modules['bot'] = bot
+        from bot.helper.ext_utils.task_registry import TaskRegistry, TaskQueue
+        from bot.helper.ext_utils.startup import Startup
+        config_dict = BenchConfig(STATUS_LIMIT=10, STATUS_UPDATE_INTERVAL=10, BOT_THEME='minimal', DOWNLOAD_DIR='/tmp/',
+                                  SAFE_MODE=False, DELETE_LINKS=False, BOT_MAX_TASKS=0, QUEUE_ALL=0, QUEUE_DOWNLOAD=0,
+                                  QUEUE_UPLOAD=0, USER_MAX_TASKS=0, TORRENT_TIMEOUT=0, STOP_DUPLICATE=False, STORAGE_THRESHOLD=0,
+                                  QUEUE_POLICY='fair', QUEUE_AGING=1800, AUTHOR_NAME='bench', AUTHOR_URL='', IMAGES=[], LEECH_SPLIT_SIZE=2097152000)
+        vars(bot).update(
+            LOGGER=getLogger('bot'), config_dict=config_dict, bot_loop=self.loop, botStartTime=time(),
+            download_dict=TaskRegistry(), download_dict_lock=Lock(), status_reply_dict={}, status_reply_dict_lock=Lock(),
+            queue_dict_lock=Lock(), qb_listener_lock=Lock(), queued_dl=TaskQueue(), queued_up=TaskQueue(), non_queued_dl=set(),
+            non_queued_up=set(), Interval=[], QbInterval=[], QbTorrents={}, bot_cache={}, user_data={}, extra_buttons={},
+            categories_dict={}, list_drives_dict={}, rss_dict={}, aria2_options={}, qbit_options={}, shorteners_list=[],
+            GLOBAL_EXTENSION_FILTER=['aria2', '!qB'], DATABASE_URL='', OWNER_ID=1, bot_id='1', bot_name='benchbot',
+            CMD_SUFFIX='', DOWNLOAD_DIR='/tmp/', startup=Startup(), MAX_SPLIT_SIZE=2097152000, user='', bot=None, IS_PREMIUM_USER=False,
+            aria2=FakeAria2(self.structs, self.aria2_counter),
+            get_client=lambda: FakeQbClient(self.torrents, self.qbit_counter))
+        telegraph = ModuleType('bot.helper.ext_utils.telegraph_helper')
+        telegraph.telegraph = None
+        modules[telegraph.__name__] = telegraph
+        return bot
+
+    def __listener(self, uid, user_id):
+        from_user = SimpleNamespace(id=user_id, mention=lambda style=None: f'<a href="tg://user?id={user_id}">user</a>')
+        chat = SimpleNamespace(id=-100, type=None)
+        message = SimpleNamespace(from_user=from_user, chat=chat, link='', date=SimpleNamespace(timestamp=lambda: time() - 60))
+        return SimpleNamespace(uid=uid, message=message, upload_details={'mode': 'Leech'})
+
+    def __torrent(self, uid):
+        size = self.random.randint(1, 50) * 1024 ** 3
+        progress = self.random.random()
+        return SimpleNamespace(tags=str(uid), hash=f'{uid:040x}', name=f'torrent-{uid}.mkv', size=size, total_size=size,
+                               progress=progress, downloaded=int(size * progress), dlspeed=self.random.randint(0, 50) * 1024 ** 2,
+                               upspeed=self.random.randint(0, 5) * 1024 ** 2, eta=self.random.randint(0, 86400),
+                               state=self.random.choice(QBIT_STATES), num_seeds=12, num_leechs=3, uploaded=0, ratio=0.0,
+                               seeding_time=0, added_on=time(), completion_on=0)
+
+    def __struct(self, uid):
+        size = self.random.randint(1, 20) * 1024 ** 3
+        return {'gid': f'{uid:016x}', 'status': self.random.choice(ARIA2_STATES), 'totalLength': str(size),
+                'completedLength': str(int(size * self.random.random())), 'downloadSpeed': str(self.random.randint(0, 80) * 1024 ** 2),
+                'uploadSpeed': '0', 'uploadLength': '0', 'connections': '8', 'numSeeders': '0', 'seeder': 'false', 'dir': '/tmp',
+                'files': [{'index': '1', 'path': f'/tmp/file-{uid}.bin', 'length': str(size), 'completedLength': '0', 'selected': 'true', 'uris': []}]}
+
+    def populate(self):
+        from bot.helper.mirror_utils.status_utils.qbit_status import QbittorrentStatus
+        from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
+        download_dict = self.bot.download_dict
+        for uid in range(1, self.tasks + 1):
+            listener = self.__listener(uid, uid % self.users + 1)
+            if uid % 2:
+                self.torrents[str(uid)] = self.__torrent(uid)
+                download_dict[uid] = QbittorrentStatus(listener)
+            else:
+                struct = self.__struct(uid)
+                self.structs[struct['gid']] = struct
+                download_dict[uid] = Aria2Status(struct['gid'], listener)
+        self.qbit_counter.calls = self.aria2_counter.calls = 0
+        self.qbit_counter.blocked = self.aria2_counter.blocked = 0
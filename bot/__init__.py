@@ -8,8 +8,8 @@ from pymongo import MongoClient
 from asyncio import Lock
 from dotenv import load_dotenv, dotenv_values
 from threading import Thread
-from time import sleep, time
-from subprocess import Popen, run as srun, check_output
+from time import time
+from subprocess import Popen, run as srun
 from os import remove as osremove, path as ospath, environ, getcwd
 from aria2p import API as ariaAPI, Client as ariaClient
 from qbittorrentapi import Client as qbClient
@@ -19,6 +19,10 @@ from logging import getLogger, Formatter, FileHandler, StreamHandler, INFO, basi
 from uvloop import install
 import logging
 
+from bot.helper.ext_utils.task_registry import TaskRegistry, TaskQueue
+from bot.helper.ext_utils.startup import Startup, wait_until
+from bot.helper.ext_utils.trackers import TrackerCache
+
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[logging.FileHandler('log.txt'), logging.StreamHandler()],
@@ -32,6 +36,7 @@ install()
 setdefaulttimeout(600)
 
 botStartTime = time()
+startup = Startup()
 
 basicConfig(format="[%(asctime)s] [%(levelname)s] - %(message)s", #  [%(filename)s:%(lineno)d]
             datefmt="%d-%b-%y %I:%M:%S %p",
@@ -51,8 +56,8 @@ shorteners_list = []
 categories_dict = {}
 aria2_options = {}
 qbit_options = {}
-queued_dl = {}
-queued_up = {}
+queued_dl = TaskQueue()
+queued_up = TaskQueue()
 bot_cache = {}
 non_queued_dl = set()
 non_queued_up = set()
@@ -70,7 +75,7 @@ status_reply_dict_lock = Lock()
 queue_dict_lock = Lock()
 qb_listener_lock = Lock()
 status_reply_dict = {}
-download_dict = {}
+download_dict = TaskRegistry()
 rss_dict = {}
 
 BOT_TOKEN = environ.get('BOT_TOKEN', '')
@@ -186,6 +191,11 @@ if len(SUDO_USERS) != 0:
     aid = SUDO_USERS.split()
     for id_ in aid:
         user_data[int(id_.strip())] = {'is_sudo': True}
+
+PAID_USERS = environ.get('PAID_USERS', '')
+if len(PAID_USERS) != 0:
+    for id_ in PAID_USERS.split():
+        user_data.setdefault(int(id_.strip()), {})['is_paid'] = True
         
 BLACKLIST_USERS = environ.get('BLACKLIST_USERS', '')
 if len(BLACKLIST_USERS) != 0:
@@ -219,13 +229,14 @@ user = ''
 USER_SESSION_STRING = environ.get('USER_SESSION_STRING', '')
 if len(USER_SESSION_STRING) != 0:
     log_info("Creating client from USER_SESSION_STRING")
-    try:
-        user = tgClient('user', TELEGRAM_API, TELEGRAM_HASH, session_string=USER_SESSION_STRING,
-                        parse_mode=enums.ParseMode.HTML, no_updates=True).start()
-        IS_PREMIUM_USER = user.me.is_premium
-    except Exception as e:
-        log_error(f"Failed making client from USER_SESSION_STRING : {e}")
-        user = ''
+    with startup.measure('user_client'):
+        try:
+            user = tgClient('user', TELEGRAM_API, TELEGRAM_HASH, session_string=USER_SESSION_STRING,
+                            parse_mode=enums.ParseMode.HTML, no_updates=True).start()
+            IS_PREMIUM_USER = user.me.is_premium
+        except Exception as e:
+            log_error(f"Failed making client from USER_SESSION_STRING : {e}")
+            user = ''
 
 MEGA_EMAIL = environ.get('MEGA_EMAIL', '')
 MEGA_PASSWORD = environ.get('MEGA_PASSWORD', '')
@@ -302,6 +313,12 @@ if str(LEECH_SPLIT_SIZE) in ["4194304000", "2097152000"] or len(LEECH_SPLIT_SIZE
 else:
     LEECH_SPLIT_SIZE = int(LEECH_SPLIT_SIZE)
 
+LEECH_CONCURRENCY = environ.get('LEECH_CONCURRENCY', '')
+LEECH_CONCURRENCY = 3 if len(LEECH_CONCURRENCY) == 0 else int(LEECH_CONCURRENCY)
+
+LEECH_CHAT_CONCURRENCY = environ.get('LEECH_CHAT_CONCURRENCY', '')
+LEECH_CHAT_CONCURRENCY = 6 if len(LEECH_CHAT_CONCURRENCY) == 0 else int(LEECH_CHAT_CONCURRENCY)
+
 BOT_MAX_TASKS = environ.get('BOT_MAX_TASKS', '')
 BOT_MAX_TASKS = int(BOT_MAX_TASKS) if BOT_MAX_TASKS.isdigit() else ''
 
@@ -349,6 +366,18 @@ QUEUE_DOWNLOAD = '' if len(QUEUE_DOWNLOAD) == 0 else int(QUEUE_DOWNLOAD)
 QUEUE_UPLOAD = environ.get('QUEUE_UPLOAD', '')
 QUEUE_UPLOAD = '' if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+QUEUE_POLICY = environ.get('QUEUE_POLICY', '')
+QUEUE_POLICY = 'fair' if QUEUE_POLICY.lower() != 'fifo' else 'fifo'
+
+QUEUE_SMALL_FIRST = environ.get('QUEUE_SMALL_FIRST', '')
+QUEUE_SMALL_FIRST = QUEUE_SMALL_FIRST.lower() == 'true'
+
+QUEUE_AGING = environ.get('QUEUE_AGING', '')
+QUEUE_AGING = 1800 if len(QUEUE_AGING) == 0 else int(QUEUE_AGING)
+
+QUEUE_DOWNLOAD_ENGINES = environ.get('QUEUE_DOWNLOAD_ENGINES', '')
+QUEUE_UPLOAD_ENGINES = environ.get('QUEUE_UPLOAD_ENGINES', '')
+
 INCOMPLETE_TASK_NOTIFIER = environ.get('INCOMPLETE_TASK_NOTIFIER', '')
 INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == 'true'
 
@@ -660,6 +689,8 @@ config_dict = {'ANIME_TEMPLATE': ANIME_TEMPLATE,
                'MIRROR_FILENAME_SUFFIX': MIRROR_FILENAME_SUFFIX,
                'MIRROR_FILENAME_REMNAME': MIRROR_FILENAME_REMNAME,
                'LEECH_SPLIT_SIZE': LEECH_SPLIT_SIZE,
+               'LEECH_CONCURRENCY': LEECH_CONCURRENCY,
+               'LEECH_CHAT_CONCURRENCY': LEECH_CHAT_CONCURRENCY,
                'LOGIN_PASS': LOGIN_PASS,
                'TOKEN_TIMEOUT': TOKEN_TIMEOUT,
                'MDL_TEMPLATE': MDL_TEMPLATE,
@@ -670,6 +701,12 @@ config_dict = {'ANIME_TEMPLATE': ANIME_TEMPLATE,
                'QUEUE_ALL': QUEUE_ALL,
                'QUEUE_DOWNLOAD': QUEUE_DOWNLOAD,
                'QUEUE_UPLOAD': QUEUE_UPLOAD,
+               'QUEUE_POLICY': QUEUE_POLICY,
+               'QUEUE_SMALL_FIRST': QUEUE_SMALL_FIRST,
+               'QUEUE_AGING': QUEUE_AGING,
+               'QUEUE_DOWNLOAD_ENGINES': QUEUE_DOWNLOAD_ENGINES,
+               'QUEUE_UPLOAD_ENGINES': QUEUE_UPLOAD_ENGINES,
+               'PAID_USERS': PAID_USERS,
                'RCLONE_FLAGS': RCLONE_FLAGS,
                'RCLONE_PATH': RCLONE_PATH,
                'RCLONE_SERVE_URL': RCLONE_SERVE_URL,
@@ -751,82 +788,104 @@ Popen(f"gunicorn web.wserver:app --bind 0.0.0.0:{PORT} --worker-class gevent", s
 
 bot_cache['pkgs'] = ['zetra', 'xon-bit', 'ggrof', 'cross-suck', 'zetra|xon-bit|ggrof|cross-suck']
 
-srun([bot_cache['pkgs'][1], "-d", f"--profile={getcwd()}"])
-if not ospath.exists('.netrc'):
-    with open('.netrc', 'w'):
-        pass
-srun(["chmod", "600", ".netrc"])
-srun(["cp", ".netrc", "/root/.netrc"])
-trackers = check_output("curl -Ns https://raw.githubusercontent.com/XIU2/TrackersListCollection/master/all.txt https://ngosang.github.io/trackerslist/trackers_all_http.txt https://newtrackon.com/api/all https://raw.githubusercontent.com/hezhijie0327/Trackerslist/main/trackerslist_tracker.txt | awk '$0' | tr '\n\n' ','", shell=True).decode('utf-8').rstrip(',')
-with open("a2c.conf", "a+") as a:
-    if TORRENT_TIMEOUT:
-        a.write(f"bt-stop-timeout={TORRENT_TIMEOUT}\n")
-    a.write(f"bt-tracker=[{trackers}]")
-srun([bot_cache['pkgs'][0], "--conf-path=/usr/src/app/a2c.conf"])
-alive = Popen(["python3", "alive.py"])
-sleep(0.5)
-if ospath.exists('accounts.zip'):
-    if ospath.exists('accounts'):
-        srun(["rm", "-rf", "accounts"])
-    srun(["7z", "x", "-o.", "-aoa", "accounts.zip", "accounts/*.json"])
-    srun(["chmod", "-R", "777", "accounts"])
-    osremove('accounts.zip')
-if not ospath.exists('accounts'):
-    config_dict['USE_SERVICE_ACCOUNTS'] = False
-sleep(0.5)
-
 aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
+tracker_cache = TrackerCache()
 
 
 def get_client():
     return qbClient(host="localhost", port=8090, VERIFY_WEBUI_CERTIFICATE=False, REQUESTS_ARGS={'timeout': (30, 60)})
 
 
+def netrc_init():
+    if not ospath.exists('.netrc'):
+        with open('.netrc', 'w'):
+            pass
+    srun(["chmod", "600", ".netrc"])
+    srun(["cp", ".netrc", "/root/.netrc"])
+
+
+def aria2c_start():
+    args = [bot_cache['pkgs'][0], "--conf-path=/usr/src/app/a2c.conf"]
+    if TORRENT_TIMEOUT:
+        args.append(f"--bt-stop-timeout={TORRENT_TIMEOUT}")
+    srun(args)
+
+
+def accounts_init():
+    if ospath.exists('accounts.zip'):
+        if ospath.exists('accounts'):
+            srun(["rm", "-rf", "accounts"])
+        srun(["7z", "x", "-o.", "-aoa", "accounts.zip", "accounts/*.json"])
+        srun(["chmod", "-R", "777", "accounts"])
+        osremove('accounts.zip')
+    if not ospath.exists('accounts'):
+        config_dict['USE_SERVICE_ACCOUNTS'] = False
+
+
 def aria2c_init():
     try:
         log_info("Initializing Aria2c")
         link = "https://linuxmint.com/torrents/lmde-5-cinnamon-64bit.iso.torrent"
         dire = DOWNLOAD_DIR.rstrip("/")
-        aria2.add_uris([link], {'dir': dire})
-        sleep(3)
-        downloads = aria2.get_downloads()
-        sleep(10)
-        aria2.remove(downloads, force=True, files=True, clean=True)
+        downloads = aria2.add_uris([link], {'dir': dire})
+        wait_until('Aria2c warm up', lambda: True if (d := aria2.get_download(downloads.gid)).followed_by_ids or d.is_complete or d.has_failed else None, 15, 0.5)
+        warmup = aria2.get_download(downloads.gid)
+        aria2.remove([warmup, *warmup.followed_by], force=True, files=True, clean=True)
     except Exception as e:
         log_error(f"Aria2c initializing error: {e}")
 
 
-Thread(target=aria2c_init).start()
-sleep(1.5)
-
-aria2c_global = ['bt-max-open-files', 'download-result', 'keep-unfinished-download-result', 'log', 'log-level',
+aria2c_global = ['bt-max-open-files', 'bt-tracker', 'download-result', 'keep-unfinished-download-result', 'log', 'log-level',
                  'max-concurrent-downloads', 'max-download-result', 'max-overall-download-limit', 'save-session',
                  'max-overall-upload-limit', 'optimize-concurrent-downloads', 'save-cookies', 'server-stat-of']
 
-if not aria2_options:
-    aria2_options = aria2.client.get_global_option()
-else:
-    a2c_glo = {op: aria2_options[op]
-               for op in aria2c_global if op in aria2_options}
-    aria2.set_global_options(a2c_glo)
-
-qb_client = get_client()
-if not qbit_options:
-    qbit_options = dict(qb_client.app_preferences())
-    del qbit_options['listen_port']
-    for k in list(qbit_options.keys()):
-        if k.startswith('rss'):
-            del qbit_options[k]
-else:
-    qb_opt = {**qbit_options}
-    for k, v in list(qb_opt.items()):
-        if v in ["", "*"]:
-            del qb_opt[k]
-    qb_client.app_set_preferences(qb_opt)
+
+def aria2_options_init():
+    global aria2_options
+    if not aria2_options:
+        aria2_options = aria2.client.get_global_option()
+    else:
+        a2c_glo = {op: aria2_options[op]
+                   for op in aria2c_global if op in aria2_options}
+        aria2.set_global_options(a2c_glo)
+    Thread(target=aria2c_init, daemon=True).start()
+
+
+def qbit_options_init():
+    global qbit_options
+    qb_client = get_client()
+    if not qbit_options:
+        qbit_options = dict(qb_client.app_preferences())
+        del qbit_options['listen_port']
+        for k in list(qbit_options.keys()):
+            if k.startswith('rss'):
+                del qbit_options[k]
+    else:
+        qb_opt = {**qbit_options}
+        for k, v in list(qb_opt.items()):
+            if v in ["", "*"]:
+                del qb_opt[k]
+        qb_client.app_set_preferences(qb_opt)
+
+
+startup.add('qbittorrent', lambda: srun([bot_cache['pkgs'][1], "-d", f"--profile={getcwd()}"]))
+startup.add('netrc', netrc_init)
+startup.add('aria2c', aria2c_start)
+startup.add('alive', lambda: Popen(["python3", "alive.py"]))
+startup.add('accounts', accounts_init)
+startup.add('aria2_rpc', lambda: wait_until('Aria2c RPC', aria2.client.get_version), 'aria2c')
+startup.add('aria2_options', aria2_options_init, 'aria2_rpc')
+startup.add('trackers', lambda: tracker_cache.start(aria2), 'aria2_options')
+startup.add('qbit_webui', lambda: wait_until('qBittorrent WebUI', lambda: get_client().app_version()), 'qbittorrent')
+startup.add('qbit_options', qbit_options_init, 'qbit_webui')
+startup.start()
 
 log_info("Creating client from BOT_TOKEN")
-bot = tgClient('bot', TELEGRAM_API, TELEGRAM_HASH, bot_token=BOT_TOKEN, workers=1000,
-               parse_mode=enums.ParseMode.HTML).start()
+with startup.measure('bot_client'):
+    bot = tgClient('bot', TELEGRAM_API, TELEGRAM_HASH, bot_token=BOT_TOKEN, workers=1000,
+                   parse_mode=enums.ParseMode.HTML).start()
+startup.wait()
+alive = startup.result('alive')
 bot_loop = bot.loop
 bot_name = bot.me.username
 scheduler = AsyncIOScheduler(timezone=str(get_localzone()), event_loop=bot_loop)
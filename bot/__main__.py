@@ -19,20 +19,22 @@ from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.filters import command, private, regex
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-from bot import bot, user, bot_name, config_dict, user_data, botStartTime, LOGGER, Interval, DATABASE_URL, QbInterval, INCOMPLETE_TASK_NOTIFIER, scheduler, bot_cache
+from bot import bot, user, bot_name, config_dict, user_data, botStartTime, LOGGER, Interval, DATABASE_URL, QbInterval, INCOMPLETE_TASK_NOTIFIER, scheduler, bot_cache, startup
 from bot.version import get_version
 from .helper.ext_utils.fs_utils import start_cleanup, clean_all, exit_clean_up
 from .helper.ext_utils.bot_utils import get_readable_time, cmd_exec, sync_to_async, new_task, set_commands, update_user_ldata, get_stats
-from .helper.ext_utils.db_handler import DbManger
+from .helper.ext_utils.db_handler import DbManger, DbPool, user_writer
+from .helper.ext_utils.system_metrics import system_metrics
+from .helper.ext_utils.daily_usage import daily_usage
 from .helper.telegram_helper.bot_commands import BotCommands
 from .helper.telegram_helper.message_utils import sendMessage, editMessage, editReplyMarkup, sendFile, deleteMessage, delete_all_messages
 from .helper.telegram_helper.filters import CustomFilters
 from .helper.telegram_helper.button_build import ButtonMaker
 from .helper.listeners.aria2_listener import start_aria2_listener
 from .helper.themes import BotTheme
-from .modules import authorize, clone, gd_count, gd_delete, gd_list, cancel_mirror, mirror_leech, status, torrent_search, torrent_select, ytdlp, \
-                     rss, shell, eval, users_settings, bot_settings, speedtest, save_msg, images, imdb, anilist, mediainfo, mydramalist, gen_pyro_sess, \
-                     gd_clean, broadcast, category_select
+from .modules import authorize, clone, gd_count, gd_delete, gd_list, cancel_mirror, mirror_leech, status, torrent_select, ytdlp, \
+                     users_settings, bot_settings, save_msg, images, mediainfo, gen_pyro_sess, gd_clean, broadcast, category_select, \
+                     log_import_profile
 
 async def stats(client, message):
     msg, btns = await get_stats(message)
@@ -107,6 +109,9 @@ async def restart(client, message):
     if scheduler.running:
         scheduler.shutdown(wait=False)
     await delete_all_messages()
+    await daily_usage.flush()
+    await user_writer.flush()
+    DbPool.close()
     for interval in [QbInterval, Interval]:
         if interval:
             interval[0].cancel()
@@ -243,8 +248,9 @@ async def log_check():
     
 
 async def main():
-    await gather(start_cleanup(), torrent_search.initiate_search_tools(), restart_notification(), search_images(), set_commands(bot), log_check())
+    await startup.track('main_init', gather(start_cleanup(), restart_notification(), search_images(), set_commands(bot), log_check()))
     await sync_to_async(start_aria2_listener, wait=False)
+    system_metrics.start()
     
     bot.add_handler(MessageHandler(
         start, filters=command(BotCommands.StartCommand) & private))
@@ -266,6 +272,8 @@ async def main():
     if user:
         LOGGER.info(f"WZ's User [@{user.me.username}] Ready!")
     signal(SIGINT, exit_clean_up)
+    log_import_profile()
+    startup.report()
 
 async def stop_signals():
     if user:
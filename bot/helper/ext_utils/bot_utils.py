@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import platform
 from base64 import b64encode
-from datetime import datetime
 from os import path as ospath
 from pkg_resources import get_distribution, DistributionNotFound
 from aiofiles import open as aiopen
@@ -11,24 +10,27 @@ from time import time
 from html import escape
 from uuid import uuid4
 from subprocess import run as srun
-from psutil import disk_usage, disk_io_counters, Process, cpu_percent, swap_memory, cpu_count, cpu_freq, getloadavg, virtual_memory, net_io_counters, boot_time
+from psutil import Process, cpu_count, cpu_freq, getloadavg, boot_time
 from asyncio import create_subprocess_exec, create_subprocess_shell, run_coroutine_threadsafe, sleep
 from asyncio.subprocess import PIPE
 from functools import partial, wraps
 from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from collections import deque
 
 from aiohttp import ClientSession as aioClientSession
-from psutil import virtual_memory, cpu_percent, disk_usage
 from requests import get as rget
 from mega import MegaApi
 from pyrogram.enums import ChatType
 from pyrogram.types import BotCommand
 from pyrogram.errors import PeerIdInvalid
 
-from bot.helper.ext_utils.db_handler import DbManger
-from bot.helper.themes import BotTheme
+from bot.helper.ext_utils.daily_usage import daily_usage
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.ext_utils.system_metrics import system_metrics
+from bot.helper.themes import BotTheme, BotThemeBlock
 from bot.version import get_version
-from bot import OWNER_ID, bot_name, bot_cache, DATABASE_URL, LOGGER, get_client, aria2, download_dict, download_dict_lock, botStartTime, user_data, config_dict, bot_loop, extra_buttons, user
+from bot import OWNER_ID, bot_name, bot_cache, LOGGER, get_client, aria2, download_dict, download_dict_lock, botStartTime, user_data, config_dict, bot_loop, extra_buttons, user, Interval
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.telegraph_helper import telegraph
@@ -38,9 +40,6 @@ THREADPOOL   = ThreadPoolExecutor(max_workers=1000)
 MAGNET_REGEX = r'magnet:\?xt=urn:(btih|btmh):[a-zA-Z0-9]*\s*'
 URL_REGEX    = r'^(?!\/)(rtmps?:\/\/|mms:\/\/|rtsp:\/\/|https?:\/\/|ftp:\/\/)?([^\/:]+:[^\/@]+@)?(www\.)?(?=[^\/:\s]+\.[^\/:\s]+)([^\/:\s]+\.[^\/:\s]+)(:\d+)?(\/[^#\s]*[\s\S]*)?(\?[^#\s]*)?(#.*)?$'
 SIZE_UNITS   = ['B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB']
-STATUS_START = 0
-PAGES        = 1
-PAGE_NO      = 1
 
 
 class MirrorStatus:
@@ -57,6 +56,27 @@ class MirrorStatus:
     STATUS_SEEDING     = "Seed"
 
 
+class ProgressRecord(NamedTuple):
+    processed: float
+    size: float
+    speed: float
+    eta: Optional[float]
+    state: str
+
+    @classmethod
+    def build(cls, processed, size, speed, state, eta=None):
+        if eta is None and speed and size > processed:
+            eta = (size - processed) / speed
+        return cls(processed or 0, size or 0, speed or 0, eta, state)
+
+    @property
+    def percent(self):
+        try:
+            return self.processed / self.size * 100
+        except ZeroDivisionError:
+            return 0
+
+
 class setInterval:
     def __init__(self, interval, action):
         self.interval = interval
@@ -72,6 +92,59 @@ class setInterval:
         self.task.cancel()
 
 
+class setAdaptiveInterval:
+    floodwaits = deque(maxlen=20)
+    IDLE_TASKS = 2
+
+    def __init__(self, interval, action, load=None):
+        self.base = interval
+        self.interval = interval
+        self.action = action
+        self.load = load
+        self.lag = 0
+        self.task = bot_loop.create_task(self.__set_interval())
+
+    @classmethod
+    def report_floodwait(cls, seconds):
+        cls.floodwaits.append((time(), seconds))
+
+    def __next_interval(self, elapsed):
+        now = time()
+        floods = [seconds for stamp, seconds in self.floodwaits if now - stamp < 600]
+        lower, upper = max(self.base / 2, 3), self.base * 6
+        target = self.base
+        if floods:
+            target = max(target * (1 + len(floods)), max(floods) * 1.5)
+        if self.lag > 0.5 or elapsed > self.base / 2:
+            target = max(target, self.interval * 1.5)
+        elif not floods and self.lag < 0.1:
+            chats, tasks = self.load() if self.load else (0, 0)
+            if chats <= 1 and tasks <= self.IDLE_TASKS:
+                target = lower
+        target = min(max(target, lower), upper)
+        if target < self.interval:
+            target = max(target, self.interval * 0.8)
+        return round(target, 1)
+
+    async def __set_interval(self):
+        while True:
+            start = bot_loop.time()
+            await sleep(self.interval)
+            self.lag = max(bot_loop.time() - start - self.interval, 0)
+            start = bot_loop.time()
+            try:
+                await self.action()
+            except Exception as e:
+                LOGGER.error(f'{e}: while running status update')
+            self.interval = self.__next_interval(bot_loop.time() - start)
+
+    def cadence(self):
+        return f'{self.interval}s (Base: {self.base}s | Lag: {self.lag * 1000:.0f}ms)'
+
+    def cancel(self):
+        self.task.cancel()
+
+
 def get_readable_file_size(size_in_bytes):
     if size_in_bytes is None:
         return '0B'
@@ -84,24 +157,36 @@ def get_readable_file_size(size_in_bytes):
 
 async def getDownloadByGid(gid):
     async with download_dict_lock:
-        return next((dl for dl in download_dict.values() if dl.gid() == gid), None)
+        return download_dict.by_gid(gid)
 
 
 async def getAllDownload(req_status, user_id=None):
-    dls = []
     async with download_dict_lock:
-        for dl in list(download_dict.values()):
-            if user_id and user_id != dl.message.from_user.id:
-                continue
-            status = dl.status()
-            if req_status in ['all', status]:
-                dls.append(dl)
-    return dls
+        if req_status != 'all':
+            return download_dict.by_status(req_status, user_id)
+        if user_id:
+            return download_dict.by_user(user_id)
+        return list(download_dict.values())
+
+
+async def sync_task_status(*uids):
+    engine_snapshot.invalidate()
+    async with download_dict_lock:
+        tasks = [(uid, task) for uid in uids if (task := download_dict.get(uid)) is not None]
+    for uid, task in tasks:
+        try:
+            status = await sync_to_async(task.status)
+        except Exception as e:
+            LOGGER.error(f'{e}: while syncing task status')
+            continue
+        async with download_dict_lock:
+            if download_dict.get(uid) is task:
+                download_dict.update_status(uid, status)
 
 
 async def get_user_tasks(user_id, maxtask):
-    if tasks := await getAllDownload('all', user_id):
-        return len(tasks) >= maxtask
+    async with download_dict_lock:
+        return download_dict.count_user(user_id) >= maxtask
 
 
 def bt_selection_buttons(id_):
@@ -200,89 +285,92 @@ class EngineStatus:
         self.STATUS_RCLONE = f"RClone {version_cache['rclone']}"
 
 
-def get_readable_message():
+def get_status_records():
+    engine_snapshot.invalidate()
+    dl_speed = 0
+    up_speed = 0
+    records = []
+    for uid, download in list(download_dict.items()):
+        record = download.progress_record()
+        download_dict.update_status(uid, record.state)
+        records.append((download, record))
+        if record.state == MirrorStatus.STATUS_DOWNLOADING:
+            dl_speed += record.speed
+        elif record.state in [MirrorStatus.STATUS_UPLOADING, MirrorStatus.STATUS_SEEDING]:
+            up_speed += record.speed
+    return records, dl_speed, up_speed
+
+
+def get_status_pages(tasks):
+    STATUS_LIMIT = config_dict['STATUS_LIMIT']
+    return max((tasks + STATUS_LIMIT - 1) // STATUS_LIMIT, 1)
+
+
+def get_readable_messages(views):
+    status_records = get_status_records()
+    return {view: get_readable_message(*view, status_records=status_records) for view in views}
+
+
+def get_readable_message(page_no=1, status='all', status_records=None):
     msg = ""
     button = None
     STATUS_LIMIT = config_dict['STATUS_LIMIT']
-    tasks = len(download_dict)
-    globals()['PAGES'] = (tasks + STATUS_LIMIT - 1) // STATUS_LIMIT
-    if PAGE_NO > PAGES and PAGES != 0:
-        globals()['STATUS_START'] = STATUS_LIMIT * (PAGES - 1)
-        globals()['PAGE_NO'] = PAGES
-    for download in list(download_dict.values())[STATUS_START:STATUS_LIMIT+STATUS_START]:
+    records, dl_speed, up_speed = status_records or get_status_records()
+    if status != 'all':
+        records = [(download, record) for download, record in records if record.state == status]
+    tasks = len(records)
+    pages = get_status_pages(tasks)
+    page_no = min(max(page_no, 1), pages)
+    start = STATUS_LIMIT * (page_no - 1)
+    for download, record in records[start:start+STATUS_LIMIT]:
         msg_link = download.message.link if download.message.chat.type in [
             ChatType.SUPERGROUP, ChatType.CHANNEL] and not config_dict['DELETE_LINKS'] else ''
         elapsed = time() - download.message.date.timestamp()
-        msg += BotTheme('STATUS_NAME', Name="Task is being Processed!" if config_dict['SAFE_MODE'] and elapsed >= config_dict['STATUS_UPDATE_INTERVAL'] else escape(f'{download.name()}'))
-        if download.status() not in [MirrorStatus.STATUS_SPLITTING, MirrorStatus.STATUS_SEEDING]:
-            msg += BotTheme('BAR', Bar=f"{get_progress_bar_string(download.progress())} {download.progress()}")
-            msg += BotTheme('PROCESSED', Processed=f"{download.processed_bytes()} of {download.size()}")
-            msg += BotTheme('STATUS', Status=download.status(), Url=msg_link)
-            msg += BotTheme('ETA', Eta=download.eta())
-            msg += BotTheme('SPEED', Speed=download.speed())
-            msg += BotTheme('ELAPSED', Elapsed=get_readable_time(elapsed))
-            msg += BotTheme('ENGINE', Engine=download.eng())
-            msg += BotTheme('STA_MODE', Mode=download.upload_details['mode'])
+        parts = [('STATUS_NAME', {'Name': "Task is being Processed!" if config_dict['SAFE_MODE'] and elapsed >= config_dict['STATUS_UPDATE_INTERVAL'] else escape(f'{download.name()}')})]
+        if record.state not in [MirrorStatus.STATUS_SPLITTING, MirrorStatus.STATUS_SEEDING]:
+            parts.extend((('BAR', {'Bar': f"{get_progress_bar_string(record.percent)} {round(record.percent, 2)}%"}),
+                          ('PROCESSED', {'Processed': f"{get_readable_file_size(record.processed)} of {get_readable_file_size(record.size)}"}),
+                          ('STATUS', {'Status': record.state, 'Url': msg_link}),
+                          ('ETA', {'Eta': (get_readable_time(record.eta) or '0s') if record.eta is not None else '-'}),
+                          ('SPEED', {'Speed': f"{get_readable_file_size(record.speed)}/s"}),
+                          ('ELAPSED', {'Elapsed': get_readable_time(elapsed)}),
+                          ('ENGINE', {'Engine': download.eng()}),
+                          ('STA_MODE', {'Mode': download.upload_details['mode']})))
+            if hasattr(download, 'queue_position'):
+                position, total, start_eta = download.queue_position()
+                parts.append(('QUEUE_POS', {'Position': position, 'Total': total, 'Start': (get_readable_time(start_eta) or '0s') if start_eta is not None else '-'}))
             if hasattr(download, 'seeders_num'):
                 try:
-                    msg += BotTheme('SEEDERS', Seeders=download.seeders_num())
-                    msg += BotTheme('LEECHERS', Leechers=download.leechers_num())
+                    parts.extend((('SEEDERS', {'Seeders': download.seeders_num()}),
+                                  ('LEECHERS', {'Leechers': download.leechers_num()})))
                 except Exception:
                     pass
-        elif download.status() == MirrorStatus.STATUS_SEEDING:
-            msg += BotTheme('STATUS', Status=download.status(), Url=msg_link)
-            msg += BotTheme('SEED_SIZE', Size=download.size())
-            msg += BotTheme('SEED_SPEED', Speed=download.upload_speed())
-            msg += BotTheme('UPLOADED', Upload=download.uploaded_bytes())
-            msg += BotTheme('RATIO', Ratio=download.ratio())
-            msg += BotTheme('TIME', Time=download.seeding_time())
-            msg += BotTheme('SEED_ENGINE', Engine=download.eng())
+        elif record.state == MirrorStatus.STATUS_SEEDING:
+            parts.extend((('STATUS', {'Status': record.state, 'Url': msg_link}),
+                          ('SEED_SIZE', {'Size': get_readable_file_size(record.size)}),
+                          ('SEED_SPEED', {'Speed': f"{get_readable_file_size(record.speed)}/s"}),
+                          ('UPLOADED', {'Upload': download.uploaded_bytes()}),
+                          ('RATIO', {'Ratio': download.ratio()}),
+                          ('TIME', {'Time': download.seeding_time()}),
+                          ('SEED_ENGINE', {'Engine': download.eng()})))
         else:
-            msg += BotTheme('STATUS', Status=download.status(), Url=msg_link)
-            msg += BotTheme('STATUS_SIZE', Size=download.size())
-            msg += BotTheme('NON_ENGINE', Engine=download.eng())
+            parts.extend((('STATUS', {'Status': record.state, 'Url': msg_link}),
+                          ('STATUS_SIZE', {'Size': get_readable_file_size(record.size)}),
+                          ('NON_ENGINE', {'Engine': download.eng()})))
 
-        msg += BotTheme('USER',
-                        User=download.message.from_user.mention(style="html"))
-        msg += BotTheme('ID', Id=download.message.from_user.id)
+        parts.extend((('USER', {'User': download.message.from_user.mention(style="html")}),
+                      ('ID', {'Id': download.message.from_user.id})))
         if (download.eng()).startswith("qBit"):
-            msg += BotTheme('BTSEL', Btsel=f"/{BotCommands.BtSelectCommand}_{download.gid()}")
-        msg += BotTheme('CANCEL', Cancel=f"/{BotCommands.CancelMirror}_{download.gid()}")
+            parts.append(('BTSEL', {'Btsel': f"/{BotCommands.BtSelectCommand}_{download.gid()}"}))
+        parts.append(('CANCEL', {'Cancel': f"/{BotCommands.CancelMirror}_{download.gid()}"}))
+        msg += BotThemeBlock(*parts)
 
     if len(msg) == 0:
         return None, None
 
-    dl_speed = 0
-
-    def convert_speed_to_bytes_per_second(spd):
-        if 'K' in spd:
-            return float(spd.split('K')[0]) * 1024
-        elif 'M' in spd:
-            return float(spd.split('M')[0]) * 1048576
-        elif 'G' in spd:
-            return float(spd.split('G')[0]) * 1073741824
-        elif 'T' in spd:
-            return float(spd.split('T')[0]) * 1099511627776
-        else:
-            return 0
-
-    dl_speed = 0
-    up_speed = 0
-    for download in download_dict.values():
-        tstatus = download.status()
-        spd = download.speed() if tstatus != MirrorStatus.STATUS_SEEDING else download.upload_speed()
-        speed_in_bytes_per_second = convert_speed_to_bytes_per_second(spd)
-        if tstatus == MirrorStatus.STATUS_DOWNLOADING:
-            dl_speed += speed_in_bytes_per_second
-        elif tstatus in [
-            MirrorStatus.STATUS_UPLOADING,
-            MirrorStatus.STATUS_SEEDING,
-        ]:
-            up_speed += speed_in_bytes_per_second
-
     msg += BotTheme('FOOTER')
     buttons = ButtonMaker()
-    buttons.ibutton(BotTheme('REFRESH', Page=f"{PAGE_NO}/{PAGES}"), "status ref")
+    buttons.ibutton(BotTheme('REFRESH', Page=f"{page_no}/{pages}"), "status ref")
     if tasks > STATUS_LIMIT:
         if config_dict['BOT_MAX_TASKS']:
             msg += BotTheme('BOT_TASKS', Tasks=tasks, Ttask=config_dict['BOT_MAX_TASKS'], Free=config_dict['BOT_MAX_TASKS']-tasks)
@@ -290,36 +378,31 @@ def get_readable_message():
             msg += BotTheme('TASKS', Tasks=tasks)
         buttons = ButtonMaker()
         buttons.ibutton(BotTheme('PREVIOUS'), "status pre")
-        buttons.ibutton(BotTheme('REFRESH', Page=f"{PAGE_NO}/{PAGES}"), "status ref")
+        buttons.ibutton(BotTheme('REFRESH', Page=f"{page_no}/{pages}"), "status ref")
         buttons.ibutton(BotTheme('NEXT'), "status nex")
     button = buttons.build_menu(3)
-    msg += BotTheme('Cpu', cpu=cpu_percent())
-    msg += BotTheme('FREE', free=get_readable_file_size(disk_usage(config_dict['DOWNLOAD_DIR']).free), free_p=round(100-disk_usage(config_dict['DOWNLOAD_DIR']).percent, 1))
-    msg += BotTheme('Ram', ram=virtual_memory().percent)
+    sample = system_metrics.latest()
+    msg += BotTheme('Cpu', cpu=sample.cpu)
+    msg += BotTheme('FREE', free=get_readable_file_size(sample.download_disk.free), free_p=round(100-sample.download_disk.percent, 1))
+    msg += BotTheme('Ram', ram=sample.memory.percent)
     msg += BotTheme('uptime', uptime=get_readable_time(time() - botStartTime))
     msg += BotTheme('DL', DL=get_readable_file_size(dl_speed))
     msg += BotTheme('UL', UL=get_readable_file_size(up_speed))
     return msg, button
 
 
-async def turn_page(data):
-    STATUS_LIMIT = config_dict['STATUS_LIMIT']
-    global STATUS_START, PAGE_NO
-    async with download_dict_lock:
-        if data[1] == "nex":
-            if PAGE_NO == PAGES:
-                STATUS_START = 0
-                PAGE_NO = 1
-            else:
-                STATUS_START += STATUS_LIMIT
-                PAGE_NO += 1
-        elif data[1] == "pre":
-            if PAGE_NO == 1:
-                STATUS_START = STATUS_LIMIT * (PAGES - 1)
-                PAGE_NO = PAGES
-            else:
-                STATUS_START -= STATUS_LIMIT
-                PAGE_NO -= 1
+def turn_page(page_no, status, data):
+    if status == 'all':
+        tasks = len(download_dict)
+    else:
+        tasks = len(download_dict.by_status(status))
+    pages = get_status_pages(tasks)
+    page_no = min(page_no, pages)
+    if data[1] == "nex":
+        page_no = 1 if page_no == pages else page_no + 1
+    elif data[1] == "pre":
+        page_no = pages if page_no == 1 else page_no - 1
+    return page_no
 
 
 def get_readable_time(seconds):
@@ -510,13 +593,15 @@ async def get_stats(event, key="home"):
         btns.ibutton('Bot Limits', f'wzmlx {user_id} stats botlimits')
         msg = "⌬ <b><i>Bot & OS Statistics!</i></b>"
     elif key == "stbot":
-        total, used, free, disk = disk_usage('/')
-        swap = swap_memory()
-        memory = virtual_memory()
-        disk_io = disk_io_counters()
+        sample = system_metrics.latest()
+        total, used, free, disk = sample.disk
+        swap = sample.swap
+        memory = sample.memory
+        disk_io = sample.disk_io
         msg = BotTheme(
             'BOT_STATS',
             bot_uptime=get_readable_time(time() - botStartTime),
+            status_cadence=Interval[0].cadence() if Interval else 'Idle',
             ram_bar=get_progress_bar_string(memory.percent),
             ram=memory.percent,
             ram_u=get_readable_file_size(memory.used),
@@ -540,18 +625,23 @@ async def get_stats(event, key="home"):
             disk_f=get_readable_file_size(free),
         )
     elif key == "stsys":
-        cpuUsage = cpu_percent(interval=0.5)
+        sample = system_metrics.latest()
+        cpuUsage = sample.cpu
+        net_io = sample.net_io
+        up_rate, dl_rate, _, _ = system_metrics.rates()
         msg = BotTheme('SYS_STATS',
             os_uptime=get_readable_time(time() - boot_time()),
             os_version=platform.version(),
             os_arch=platform.platform(),
-            up_data=get_readable_file_size(net_io_counters().bytes_sent),
-            dl_data=get_readable_file_size(net_io_counters().bytes_recv),
-            pkt_sent=str(net_io_counters().packets_sent)[:-3],
-            pkt_recv=str(net_io_counters().packets_recv)[:-3],
-            tl_data=get_readable_file_size(net_io_counters().bytes_recv + net_io_counters().bytes_sent),
+            up_data=get_readable_file_size(net_io.bytes_sent),
+            dl_data=get_readable_file_size(net_io.bytes_recv),
+            pkt_sent=str(net_io.packets_sent)[:-3],
+            pkt_recv=str(net_io.packets_recv)[:-3],
+            tl_data=get_readable_file_size(net_io.bytes_recv + net_io.bytes_sent),
+            net_rate=f"{get_readable_file_size(up_rate)}/s ▲ | {get_readable_file_size(dl_rate)}/s ▼",
             cpu=cpuUsage,
             cpu_bar=get_progress_bar_string(cpuUsage),
+            cpu_spark=system_metrics.sparkline(),
             cpu_freq=f"{cpu_freq(percpu=False).current / 1000:.2f} GHz" if cpu_freq() else "Access Denied",
             sys_load="%, ".join(str(round((x / cpu_count() * 100), 2)) for x in getloadavg()) + "%, (1m, 5m, 15m)",
             p_core=cpu_count(logical=False),
@@ -592,33 +682,14 @@ async def get_stats(event, key="home"):
 
 
 async def getdailytasks(user_id, increase_task=False, upleech=0, upmirror=0, check_mirror=False, check_leech=False):
-    task, lsize, msize = 0, 0, 0
-    if user_id in user_data and user_data[user_id].get('dly_tasks'):
-        userdate, task, lsize, msize = user_data[user_id]['dly_tasks']
-        nowdate = datetime.now()
-        if userdate.year <= nowdate.year and userdate.month <= nowdate.month and userdate.day < nowdate.day:
-            task, lsize, msize = 0, 0, 0
-            if increase_task:
-                task = 1
-            elif upleech != 0:
-                lsize += upleech
-            elif upmirror != 0:
-                msize += upmirror
-        elif increase_task:
-            task += 1
-        elif upleech != 0:
-            lsize += upleech
-        elif upmirror != 0:
-            msize += upmirror
-    elif increase_task:
-        task += 1
+    if increase_task:
+        task, lsize, msize = daily_usage.add(user_id, task=1)
     elif upleech != 0:
-        lsize += upleech
+        task, lsize, msize = daily_usage.add(user_id, leech=upleech)
     elif upmirror != 0:
-        msize += upmirror
-    update_user_ldata(user_id, 'dly_tasks', [datetime.now(), task, lsize, msize])
-    if DATABASE_URL:
-        await DbManger().update_user_data(user_id)
+        task, lsize, msize = daily_usage.add(user_id, mirror=upmirror)
+    else:
+        task, lsize, msize = daily_usage.get(user_id)
     if check_leech:
         return lsize
     elif check_mirror:
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+from datetime import datetime
+from asyncio import sleep
+
+from pymongo import UpdateOne
+
+from bot import DATABASE_URL, user_data, bot_loop, LOGGER
+from bot.helper.ext_utils.db_handler import DbManger
+
+
+class DailyUsage:
+    def __init__(self, interval=30):
+        self.__interval = interval
+        self.__pending = {}
+        self.__task = None
+
+    def __counters(self, user_id):
+        if user_id in user_data and user_data[user_id].get('dly_tasks'):
+            userdate, task, lsize, msize = user_data[user_id]['dly_tasks']
+            if userdate.date() >= datetime.now().date():
+                return userdate, task, lsize, msize
+            user_data[user_id]['dly_tasks'] = [datetime.now(), 0, 0, 0]
+            self.__pending[user_id] = {'reset': True}
+        return None, 0, 0, 0
+
+    def get(self, user_id):
+        _, task, lsize, msize = self.__counters(user_id)
+        return task, lsize, msize
+
+    def add(self, user_id, task=0, leech=0, mirror=0):
+        _, task_, lsize, msize = self.__counters(user_id)
+        counters = [datetime.now(), task_ + task, lsize + leech, msize + mirror]
+        user_data.setdefault(user_id, {})['dly_tasks'] = counters
+        pending = self.__pending.setdefault(user_id, {})
+        if not pending.get('reset'):
+            for key, value in (('task', task), ('leech', leech), ('mirror', mirror)):
+                pending[key] = pending.get(key, 0) + value
+        if DATABASE_URL and self.__task is None:
+            self.__task = bot_loop.create_task(self.__flusher())
+        return counters[1:]
+
+    def __operations(self):
+        pending, self.__pending = self.__pending, {}
+        operations = []
+        for user_id, delta in pending.items():
+            if not (counters := user_data.get(user_id, {}).get('dly_tasks')):
+                continue
+            date, task, lsize, msize = counters
+            if delta.get('reset'):
+                update = {'$set': {'date': date, 'task': task, 'leech': lsize, 'mirror': msize}}
+            else:
+                update = {'$set': {'date': date},
+                          '$inc': {key: delta.get(key, 0) for key in ('task', 'leech', 'mirror')}}
+            operations.append(UpdateOne({'_id': user_id}, update, upsert=True))
+        return operations, pending
+
+    async def flush(self):
+        if not DATABASE_URL or not self.__pending:
+            return
+        operations, pending = self.__operations()
+        if not operations:
+            return
+        if not await DbManger().update_daily_usage(operations):
+            for user_id, delta in pending.items():
+                current = self.__pending.setdefault(user_id, {})
+                if delta.get('reset'):
+                    self.__pending[user_id] = {'reset': True}
+                elif not current.get('reset'):
+                    for key in ('task', 'leech', 'mirror'):
+                        current[key] = current.get(key, 0) + delta.get(key, 0)
+
+    async def __flusher(self):
+        while True:
+            await sleep(self.__interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                LOGGER.error(f'{e}: while flushing daily usage')
+
+
+daily_usage = DailyUsage()
@@ -1,30 +1,60 @@
 #!/usr/bin/env python3
-from aiofiles.os import path as aiopath, makedirs
+from asyncio import sleep, Lock
+from copy import deepcopy
+from aiofiles.os import path as aiopath
 from aiofiles import open as aiopen
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from bson import ObjectId
+from gridfs.errors import NoFile
+from pymongo import UpdateOne
 from pymongo.errors import PyMongoError
 from dotenv import dotenv_values
 
-from bot import DATABASE_URL, user_data, rss_dict, LOGGER, bot_id, config_dict, aria2_options, qbit_options, bot_loop
+from bot import DATABASE_URL, user_data, rss_dict, LOGGER, bot_id, config_dict, aria2_options, qbit_options, bot_loop, startup
+
+
+class DbPool:
+    __client = None
+
+    @classmethod
+    def client(cls):
+        if cls.__client is None:
+            cls.__client = AsyncIOMotorClient(DATABASE_URL, io_loop=bot_loop, maxPoolSize=20, minPoolSize=2,
+                                              maxIdleTimeMS=300000, heartbeatFrequencyMS=30000,
+                                              serverSelectionTimeoutMS=10000, connectTimeoutMS=10000, retryWrites=True)
+        return cls.__client
+
+    @classmethod
+    async def ping(cls):
+        try:
+            await cls.client().admin.command('ping')
+            return True
+        except PyMongoError as e:
+            LOGGER.error(f"DB health check failed: {e}")
+            return False
+
+    @classmethod
+    def close(cls):
+        if cls.__client is not None:
+            cls.__client.close()
+            cls.__client = None
 
 
 class DbManger:
     def __init__(self):
         self.__err = False
         self.__db = None
-        self.__conn = None
         self.__connect()
 
     def __connect(self):
         try:
-            self.__conn = AsyncIOMotorClient(DATABASE_URL)
-            self.__db = self.__conn.wzmlx # New Section for not conflicting with mltb section !!
+            self.__db = DbPool.client().wzmlx # New Section for not conflicting with mltb section !!
         except PyMongoError as e:
             LOGGER.error(f"Error in DB connection: {e}")
             self.__err = True
 
     async def db_load(self):
-        if self.__err:
+        if self.__err or not await DbPool.ping():
             return
         # Save bot settings
         await self.__db.settings.config.update_one({'_id': bot_id}, {'$set': config_dict}, upsert=True)
@@ -36,26 +66,17 @@ class DbManger:
             await self.__db.settings.qbittorrent.update_one({'_id': bot_id}, {'$set': qbit_options}, upsert=True)
         # User Data
         if await self.__db.users[bot_id].find_one():
-            rows = self.__db.users[bot_id].find({})
+            # blobs stay in the database, only their presence is loaded
+            rows = self.__db.users[bot_id].aggregate([{'$addFields': {key: {'$in': [{'$type': f'${key}'}, ['binData', 'objectId']]}
+                                                                      for key in UserDataWriter.DOC_KEYS}}])
             # return a dict ==> {_id, is_sudo, is_auth, as_doc, thumb, yt_opt, media_group, equal_splits, split_size, rclone}
             async for row in rows:
                 uid = row['_id']
                 del row['_id']
-                thumb_path = f'Thumbnails/{uid}.jpg'
-                rclone_path = f'wcl/{uid}.conf'
-                if row.get('thumb'):
-                    if not await aiopath.exists('Thumbnails'):
-                        await makedirs('Thumbnails')
-                    async with aiopen(thumb_path, 'wb+') as f:
-                        await f.write(row['thumb'])
-                    row['thumb'] = thumb_path
-                if row.get('rclone'):
-                    if not await aiopath.exists('wcl'):
-                        await makedirs('wcl')
-                    async with aiopen(rclone_path, 'wb+') as f:
-                        await f.write(row['rclone'])
-                    row['rclone'] = rclone_path
+                row['thumb'] = f'Thumbnails/{uid}.jpg' if row['thumb'] else ''
+                row['rclone'] = f'wcl/{uid}.conf' if row['rclone'] else ''
                 user_data[uid] = row
+                user_writer.loaded(uid, row)
             LOGGER.info("Users data has been imported from Database")
         # Rss Data
         if await self.__db.rss[bot_id].find_one():
@@ -66,32 +87,31 @@ class DbManger:
                 del row['_id']
                 rss_dict[user_id] = row
             LOGGER.info("Rss data has been imported from Database.")
-        self.__conn.close
+        # Daily Usage
+        async for row in self.__db.usage[bot_id].find({}):
+            if row['_id'] in user_data or row.get('task') or row.get('leech') or row.get('mirror'):
+                user_data.setdefault(row['_id'], {})['dly_tasks'] = [row['date'], row.get('task', 0), row.get('leech', 0), row.get('mirror', 0)]
 
     async def update_deploy_config(self):
         if self.__err:
             return
         current_config = dict(dotenv_values('config.env'))
         await self.__db.settings.deployConfig.replace_one({'_id': bot_id}, current_config, upsert=True)
-        self.__conn.close
 
     async def update_config(self, dict_):
         if self.__err:
             return
         await self.__db.settings.config.update_one({'_id': bot_id}, {'$set': dict_}, upsert=True)
-        self.__conn.close
 
     async def update_aria2(self, key, value):
         if self.__err:
             return
         await self.__db.settings.aria2c.update_one({'_id': bot_id}, {'$set': {key: value}}, upsert=True)
-        self.__conn.close
 
     async def update_qbittorrent(self, key, value):
         if self.__err:
             return
         await self.__db.settings.qbittorrent.update_one({'_id': bot_id}, {'$set': {key: value}}, upsert=True)
-        self.__conn.close
 
     async def update_private_file(self, path):
         if self.__err:
@@ -105,30 +125,73 @@ class DbManger:
         await self.__db.settings.files.update_one({'_id': bot_id}, {'$set': {path: pf_bin}}, upsert=True)
         if path == 'config.env':
             await self.update_deploy_config()
-        else:
-            self.__conn.close
 
     async def update_user_data(self, user_id):
         if self.__err:
             return
-        data = user_data[user_id]
-        if data.get('thumb'):
-            del data['thumb']
-        if data.get('rclone'):
-            del data['rclone']
-        await self.__db.users[bot_id].replace_one({'_id': user_id}, data, upsert=True)
-        self.__conn.close
+        user_writer.update(user_id)
+
+    async def get_user_doc(self, user_id, key):
+        if self.__err:
+            return None
+        if (row := await self.__db.users[bot_id].find_one({'_id': user_id}, {key: 1})) is None:
+            return None
+        if isinstance(doc := row.get(key), ObjectId):
+            try:
+                stream = await self.__bucket().open_download_stream(doc)
+                return await stream.read()
+            except NoFile:
+                LOGGER.error(f"Missing {key} blob for user {user_id}")
+                return None
+        return doc or None
+
+    def __bucket(self):
+        return AsyncIOMotorGridFSBucket(self.__db, bucket_name=f'blobs_{bot_id}')
+
+    async def upload_user_blob(self, user_id, key, doc_bin=b''):
+        if self.__err:
+            return doc_bin, []
+        bucket = self.__bucket()
+        old_ids = [old['_id'] async for old in bucket.find({'filename': f'{user_id}_{key}'})]
+        doc = await bucket.upload_from_stream(f'{user_id}_{key}', doc_bin) if doc_bin else ''
+        return doc, old_ids
+
+    async def delete_user_blobs(self, blob_ids):
+        if self.__err:
+            return
+        bucket = self.__bucket()
+        for blob_id in blob_ids:
+            try:
+                await bucket.delete(blob_id)
+            except NoFile:
+                pass
+            except PyMongoError as e:
+                LOGGER.error(f"Error while deleting user blob {blob_id}: {e}")
+
+    async def update_users(self, operations):
+        if self.__err:
+            return False
+        try:
+            await self.__db.users[bot_id].bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            LOGGER.error(f"Error while updating users data: {e}")
+            return False
+        return True
+
+    async def update_daily_usage(self, operations):
+        if self.__err:
+            return False
+        try:
+            await self.__db.usage[bot_id].bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            LOGGER.error(f"Error while updating daily usage: {e}")
+            return False
+        return True
 
     async def update_user_doc(self, user_id, key, path=''):
         if self.__err:
             return
-        if path:
-            async with aiopen(path, 'rb+') as doc:
-                doc_bin = await doc.read()
-        else:
-            doc_bin = ''
-        await self.__db.users[bot_id].update_one({'_id': user_id}, {'$set': {key: doc_bin}}, upsert=True)
-        self.__conn.close
+        await user_writer.update_doc(user_id, key, path)
 
     async def get_pm_uids(self):
         if self.__err:
@@ -141,44 +204,37 @@ class DbManger:
         if not bool(await self.__db.pm_users[bot_id].find_one({'_id': user_id})):
             await self.__db.pm_users[bot_id].insert_one({'_id': user_id})
             LOGGER.info(f'New PM User Added : {user_id}')
-        self.__conn.close
         
     async def rm_pm_user(self, user_id):
         if self.__err:
             return
         await self.__db.pm_users[bot_id].delete_one({'_id': user_id})
-        self.__conn.close
         
     async def rss_update_all(self):
         if self.__err:
             return
         for user_id in list(rss_dict.keys()):
             await self.__db.rss[bot_id].replace_one({'_id': user_id}, rss_dict[user_id], upsert=True)
-        self.__conn.close
 
     async def rss_update(self, user_id):
         if self.__err:
             return
         await self.__db.rss[bot_id].replace_one({'_id': user_id}, rss_dict[user_id], upsert=True)
-        self.__conn.close
 
     async def rss_delete(self, user_id):
         if self.__err:
             return
         await self.__db.rss[bot_id].delete_one({'_id': user_id})
-        self.__conn.close
 
     async def add_incomplete_task(self, cid, link, tag, msg_link, msg):
         if self.__err:
             return
         await self.__db.tasks[bot_id].insert_one({'_id': link, 'cid': cid, 'tag': tag, 'source': msg_link, 'org_msg': msg})
-        self.__conn.close
 
     async def rm_complete_task(self, link):
         if self.__err:
             return
         await self.__db.tasks[bot_id].delete_one({'_id': link})
-        self.__conn.close
 
     async def get_incomplete_tasks(self):
         notifier_dict = {}
@@ -196,14 +252,105 @@ class DbManger:
                 else:
                     notifier_dict[row['cid']] = {row['tag']: [{row['_id']: row['source']}]}
         await self.__db.tasks[bot_id].drop()
-        self.__conn.close
         return notifier_dict  # return a dict ==> {cid: {tag: [{_id: source}, {_id, source}, ...]}}
 
     async def trunc_table(self, name):
         if self.__err:
             return
         await self.__db[name][bot_id].drop()
-        self.__conn.close
+
+
+class UserDataWriter:
+    DOC_KEYS = ('thumb', 'rclone')
+    GRIDFS_LIMIT = 1024 * 1024
+    MAX_ATTEMPTS = 8
+
+    def __init__(self, delay=1):
+        self.__delay = delay
+        self.__failures = 0
+        self.__dirty = set()
+        self.__docs = {}
+        self.__stale = set()
+        self.__persisted = {}
+        self.__task = None
+        self.__lock = Lock()
+
+    def __fields(self, user_id):
+        return {key: value for key, value in user_data.get(user_id, {}).items() if key not in self.DOC_KEYS}
+
+    def loaded(self, user_id, data):
+        self.__persisted[user_id] = deepcopy({key: value for key, value in data.items() if key not in self.DOC_KEYS})
+
+    def __enqueue(self):
+        if self.__task is None or self.__task.done():
+            self.__task = bot_loop.create_task(self.__flush_later())
+
+    async def __flush_later(self, delay=None):
+        await sleep(delay or self.__delay)
+        self.__task = None
+        await self.flush()
+
+    def update(self, user_id):
+        self.__dirty.add(user_id)
+        self.__enqueue()
+
+    async def update_doc(self, user_id, key, path=''):
+        if path:
+            async with aiopen(path, 'rb+') as doc:
+                doc_bin = await doc.read()
+        else:
+            doc_bin = ''
+        if len(doc_bin) > self.GRIDFS_LIMIT:
+            doc_bin, stale = await DbManger().upload_user_blob(user_id, key, doc_bin)
+        else:
+            _, stale = await DbManger().upload_user_blob(user_id, key)
+        self.__stale.update(stale)
+        self.__docs.setdefault(user_id, {})[key] = doc_bin
+        self.__enqueue()
+
+    def __operations(self, dirty, docs):
+        operations, snapshots = [], {}
+        for user_id in dirty | docs.keys():
+            update, fields = {}, {}
+            if user_id in dirty:
+                data = self.__fields(user_id)
+                previous = self.__persisted.get(user_id, {})
+                fields = {key: value for key, value in data.items() if key not in previous or previous[key] != value}
+                if unset := {key: '' for key in previous if key not in data}:
+                    update['$unset'] = unset
+                snapshots[user_id] = deepcopy(data)
+            fields.update(docs.get(user_id, {}))
+            if fields:
+                update['$set'] = fields
+            if update:
+                operations.append(UpdateOne({'_id': user_id}, update, upsert=True))
+        return operations, snapshots
+
+    async def flush(self):
+        async with self.__lock:
+            dirty, self.__dirty = self.__dirty, set()
+            docs, self.__docs = self.__docs, {}
+            stale, self.__stale = self.__stale, set()
+            operations, snapshots = self.__operations(dirty, docs)
+            done = not operations or await DbManger().update_users(operations)
+            if done:
+                self.__failures = 0
+                self.__persisted.update(snapshots)
+                await DbManger().delete_user_blobs(stale)
+            else:
+                self.__failures += 1
+                if self.__failures >= self.MAX_ATTEMPTS and dirty:
+                    LOGGER.error(f"Dropping user settings update for {sorted(dirty)} after {self.__failures} failed attempts")
+                else:
+                    self.__dirty |= dirty
+                for user_id, fields in docs.items():
+                    self.__docs[user_id] = {**fields, **self.__docs.get(user_id, {})}
+                self.__stale |= stale
+        if self.__failures and (self.__dirty or self.__docs) and (self.__task is None or self.__task.done()):
+            self.__task = bot_loop.create_task(self.__flush_later(min(self.__delay * 2 ** min(self.__failures, 9), 300)))
+
+
+user_writer = UserDataWriter()
 
 if DATABASE_URL:
-    bot_loop.run_until_complete(DbManger().db_load())
+    bot_loop.run_until_complete(startup.track('db_load', DbManger().db_load()))
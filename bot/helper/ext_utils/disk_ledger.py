@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+from threading import Lock
+from shutil import disk_usage
+from contextlib import suppress
+from os import walk, lstat, path as ospath
+
+from bot import DOWNLOAD_DIR
+
+PHASE_DOWNLOAD = 'download'
+PHASE_EXTRACT = 'extract'
+PHASE_COMPRESS = 'compress'
+PHASE_SPLIT = 'split'
+
+
+class DiskLedger:
+    def __init__(self, path=DOWNLOAD_DIR):
+        self.__path = path
+        self.__lock = Lock()
+        self.__reservations = {}
+
+    @staticmethod
+    def phases(size, extract=False, compress=False, split_size=0, window=1):
+        phases = {PHASE_DOWNLOAD: size}
+        if extract:
+            phases[PHASE_EXTRACT] = size
+        if compress:
+            phases[PHASE_COMPRESS] = size
+        if split_size and size > split_size and not compress:
+            phases[PHASE_SPLIT] = min(size, split_size * window)
+        return phases
+
+    def __written(self, uid):
+        written = 0
+        for path in (f"{self.__path}{uid}", f"{self.__path}{uid}10000"):
+            for dirpath, _, files in walk(path):
+                for file_ in files:
+                    with suppress(OSError):
+                        written += lstat(ospath.join(dirpath, file_)).st_blocks * 512
+        return written
+
+    def __sample(self):
+        with self.__lock:
+            uids = [uid for uid, phases in self.__reservations.items() if phases.get(PHASE_DOWNLOAD)]
+        return {uid: self.__written(uid) for uid in uids}
+
+    @staticmethod
+    def __outstanding(reservations, written, exclude=None):
+        return sum(max(phases.get(PHASE_DOWNLOAD, 0) - written.get(uid, 0), 0) +
+                   sum(size for phase, size in phases.items() if phase != PHASE_DOWNLOAD)
+                   for uid, phases in reservations if uid != exclude)
+
+    def available(self, exclude=None):
+        written = self.__sample()
+        with self.__lock:
+            reserved = self.__outstanding(self.__reservations.items(), written, exclude)
+        return disk_usage(self.__path).free - reserved
+
+    def admit(self, uid, phases, threshold=0):
+        written = self.__sample()
+        with self.__lock:
+            reserved = self.__outstanding(self.__reservations.items(), written, uid)
+            if disk_usage(self.__path).free - reserved - sum(phases.values()) < threshold:
+                return False
+            self.__reservations[uid] = dict(phases)
+        return True
+
+    def reserve(self, uid, phases):
+        with self.__lock:
+            self.__reservations[uid] = dict(phases)
+
+    def release(self, uid, *phases):
+        with self.__lock:
+            if (reservation := self.__reservations.get(uid)) is None:
+                return
+            if not phases:
+                del self.__reservations[uid]
+                return
+            for phase in phases:
+                reservation.pop(phase, None)
+            if not reservation:
+                del self.__reservations[uid]
+
+
+disk_ledger = DiskLedger()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+from time import time
+from threading import Lock
+from types import MappingProxyType
+
+from aria2p import Download, Client as ariaClient
+
+from bot import aria2, get_client, LOGGER
+
+
+class EngineSnapshot:
+    def __init__(self, ttl=1):
+        self.__ttl = ttl
+        self.__lock = Lock()
+        self.__qb_client = None
+        self.__qbit = MappingProxyType({})
+        self.__aria2 = MappingProxyType({})
+        self.__qbit_time = 0
+        self.__aria2_time = 0
+
+    def invalidate(self):
+        self.__qbit_time = 0
+        self.__aria2_time = 0
+
+    def __fetch_qbit(self):
+        if self.__qb_client is None:
+            self.__qb_client = get_client()
+        try:
+            torrents = self.__qb_client.torrents_info()
+        except Exception as e:
+            LOGGER.error(f'{e}: Qbittorrent, while taking engine snapshot')
+            self.__qb_client = None
+            return {}
+        snapshot = {}
+        for tor in torrents:
+            for tag in tor.tags.split(','):
+                if tag := tag.strip():
+                    snapshot[tag] = tor
+        return snapshot
+
+    def __fetch_aria2(self):
+        try:
+            results = aria2.client.multicall2([(ariaClient.TELL_ACTIVE, []),
+                                               (ariaClient.TELL_WAITING, [0, 1000]),
+                                               (ariaClient.TELL_STOPPED, [0, 1000])])
+        except Exception as e:
+            LOGGER.error(f'{e}: Aria2c, while taking engine snapshot')
+            return {}
+        snapshot = {}
+        for result in results:
+            structs = result[0] if result and isinstance(result[0], list) else result
+            for struct in structs:
+                snapshot[struct['gid']] = Download(aria2, struct)
+        return snapshot
+
+    def qbit(self, tag):
+        with self.__lock:
+            if time() - self.__qbit_time > self.__ttl:
+                self.__qbit = MappingProxyType(self.__fetch_qbit())
+                self.__qbit_time = time()
+            return self.__qbit.get(tag)
+
+    def aria2(self, gid):
+        with self.__lock:
+            if time() - self.__aria2_time > self.__ttl:
+                self.__aria2 = MappingProxyType(self.__fetch_aria2())
+                self.__aria2_time = time()
+            return self.__aria2.get(gid)
+
+
+engine_snapshot = EngineSnapshot()
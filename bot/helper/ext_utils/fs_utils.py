@@ -2,7 +2,7 @@
 from os import walk, path as ospath
 from aiofiles.os import remove as aioremove, path as aiopath, listdir, rmdir, makedirs
 from aioshutil import rmtree as aiormtree
-from shutil import rmtree, disk_usage
+from shutil import rmtree
 from magic import Magic
 from re import split as re_split, I, search as re_search
 from subprocess import run as srun
@@ -11,6 +11,7 @@ from sys import exit as sexit
 from .exceptions import NotSupportedExtractionArchive
 from bot import bot_cache, aria2, LOGGER, DOWNLOAD_DIR, get_client, GLOBAL_EXTENSION_FILTER
 from bot.helper.ext_utils.bot_utils import sync_to_async, cmd_exec
+from bot.helper.ext_utils.disk_ledger import disk_ledger
 
 ARCH_EXT = [".tar.bz2", ".tar.gz", ".bz2", ".gz", ".tar.xz", ".tar", ".tbz2", ".tgz", ".lzma2",
             ".zip", ".7z", ".z", ".rar", ".iso", ".wim", ".cab", ".apm", ".arj", ".chm",
@@ -142,8 +143,10 @@ def get_mime_type(file_path):
     return mime_type
 
 
-def check_storage_threshold(size, threshold, arch=False, alloc=False):
-    free = disk_usage(DOWNLOAD_DIR).free
+def check_storage_threshold(size, threshold, arch=False, alloc=False, uid=None, phases=None):
+    if uid is not None:
+        return disk_ledger.admit(uid, phases or disk_ledger.phases(size, compress=arch), threshold)
+    free = disk_ledger.available()
     if not alloc:
         if (not arch and free - size < threshold or arch and free - (size * 2) < threshold):
             return False
@@ -1,34 +1,82 @@
 from hashlib import md5
+from collections import OrderedDict, deque
+from json import loads
 from time import strftime, gmtime, time
 from re import sub as re_sub, search as re_search
 from shlex import split as ssplit
 from natsort import natsorted
-from os import path as ospath
-from aiofiles.os import remove as aioremove, path as aiopath, mkdir, makedirs, listdir
+from os import walk, path as ospath, pread, SEEK_SET, SEEK_CUR, SEEK_END
+from io import IOBase
+from aiofiles.os import remove as aioremove, path as aiopath, mkdir, makedirs, listdir, stat as aiostat
 from aioshutil import rmtree as aiormtree
-from contextlib import suppress
-from asyncio import create_subprocess_exec, create_task, gather, Semaphore
+from contextlib import suppress, nullcontext
+from asyncio import create_subprocess_exec, create_task, gather, Semaphore, shield
 from asyncio.subprocess import PIPE
-from telegraph import upload_file
 from langcodes import Language
 
-from bot import bot_cache, LOGGER, MAX_SPLIT_SIZE, config_dict, user_data
+from bot import bot_cache, bot_loop, LOGGER, MAX_SPLIT_SIZE, config_dict, user_data
 from bot.modules.mediainfo import parseinfo
 from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async, get_readable_file_size, get_readable_time
 from bot.helper.ext_utils.fs_utils import ARCH_EXT, get_mime_type
 from bot.helper.ext_utils.telegraph_helper import telegraph
 
+SS_BATCH = 50
+
+
+class MediaProbe:
+    def __init__(self, limit=512):
+        self.__limit = limit
+        self.__cache = OrderedDict()
+        self.__pending = {}
+
+    @staticmethod
+    async def __key(path):
+        st = await aiostat(path)
+        return st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+
+    async def __run(self, key, path):
+        try:
+            result = await cmd_exec(["ffprobe", "-hide_banner", "-loglevel", "error", "-print_format",
+                                     "json", "-show_format", "-show_streams", path])
+            if res := result[1]:
+                LOGGER.warning(f'Media Probe: {res}')
+            try:
+                data = loads(result[0])
+            except ValueError:
+                LOGGER.error(f"Media Probe: {result}")
+                return None
+            self.__cache[key] = data
+            while len(self.__cache) > self.__limit:
+                self.__cache.popitem(last=False)
+            return data
+        finally:
+            self.__pending.pop(key, None)
+
+    async def probe(self, path):
+        try:
+            key = await self.__key(path)
+        except OSError as e:
+            LOGGER.error(f'Media Probe: {e}. Mostly File not found!')
+            return None
+        if (data := self.__cache.get(key)) is not None:
+            self.__cache.move_to_end(key)
+            return data
+        if (task := self.__pending.get(key)) is None:
+            task = self.__pending[key] = bot_loop.create_task(self.__run(key, path))
+        try:
+            return await shield(task)
+        except Exception as e:
+            LOGGER.error(f'Media Probe: {e}. Path: {path}')
+            return None
+
+
+media_probe = MediaProbe()
+
 
 async def is_multi_streams(path):
-    try:
-        result = await cmd_exec(["ffprobe", "-hide_banner", "-loglevel", "error", "-print_format",
-                                 "json", "-show_streams", path])
-        if res := result[1]:
-            LOGGER.warning(f'Get Video Streams: {res}')
-    except Exception as e:
-        LOGGER.error(f'Get Video Streams: {e}. Mostly File not found!')
+    if (result := await media_probe.probe(path)) is None:
         return False
-    fields = eval(result[0]).get('streams')
+    fields = result.get('streams')
     if fields is None:
         LOGGER.error(f"get_video_streams: {result}")
         return False
@@ -43,18 +91,11 @@ async def is_multi_streams(path):
 
 
 async def get_media_info(path, metadata=False):
-    try:
-        result = await cmd_exec(["ffprobe", "-hide_banner", "-loglevel", "error", "-print_format",
-                                 "json", "-show_format", "-show_streams", path])
-        if res := result[1]:
-            LOGGER.warning(f'Media Info FF: {res}')
-    except Exception as e:
-        LOGGER.error(f'Media Info: {e}. Mostly File not found!')
+    if (ffresult := await media_probe.probe(path)) is None:
         return (0, "", "", "") if metadata else (0, None, None)
-    ffresult = eval(result[0])
     fields = ffresult.get('format')
     if fields is None:
-        LOGGER.error(f"Media Info Sections: {result}")
+        LOGGER.error(f"Media Info Sections: {ffresult}")
         return (0, "", "", "") if metadata else (0, None, None)
     duration = round(float(fields.get('duration', 0)))
     if metadata:
@@ -91,15 +132,9 @@ async def get_document_type(path):
         return False, False, True
     if not mime_type.startswith('video') and not mime_type.endswith('octet-stream'):
         return is_video, is_audio, is_image
-    try:
-        result = await cmd_exec(["ffprobe", "-hide_banner", "-loglevel", "error", "-print_format",
-                                 "json", "-show_streams", path])
-        if res := result[1]:
-            LOGGER.warning(f'Get Document Type: {res}')
-    except Exception as e:
-        LOGGER.error(f'Get Document Type: {e}. Mostly File not found!')
+    if (result := await media_probe.probe(path)) is None:
         return is_video, is_audio, is_image
-    fields = eval(result[0]).get('streams')
+    fields = result.get('streams')
     if fields is None:
         LOGGER.error(f"get_document_type: {result}")
         return is_video, is_audio, is_image
@@ -135,32 +170,181 @@ async def take_ss(video_file, duration=None, total=1, gen_ss=False):
     if duration == 0:
         duration = 3
     duration = duration - (duration * 2 / 100)
-    cmd = [bot_cache['pkgs'][2], "-hide_banner", "-loglevel", "error", "-ss", "",
-           "-i", video_file, "-vf", "thumbnail", "-frames:v", "1", des_dir]
     tstamps = {}
+    frames = []
+    for eq_thumb in range(1, total+1):
+        stamp = (duration // total) * eq_thumb
+        tstamps[f"wz_thumb_{eq_thumb}.jpg"] = strftime("%H:%M:%S", gmtime(stamp))
+        frames.append((stamp, f"wz_thumb_{eq_thumb}.jpg"))
     thumb_sem = Semaphore(3)
-    
-    async def extract_ss(eq_thumb):
+
+    async def extract_ss(batch):
         async with thumb_sem:
-            cmd[5] = str((duration // total) * eq_thumb)
-            tstamps[f"wz_thumb_{eq_thumb}.jpg"] = strftime("%H:%M:%S", gmtime(float(cmd[5])))
-            cmd[-1] = ospath.join(des_dir, f"wz_thumb_{eq_thumb}.jpg")
+            cmd = [bot_cache['pkgs'][2], "-hide_banner", "-loglevel", "error"]
+            for stamp, _ in batch:
+                cmd.extend(["-ss", str(stamp), "-i", video_file])
+            for index, (_, name) in enumerate(batch):
+                cmd.extend(["-map", f"{index}:V:0", "-frames:v", "1"])
+                if total == 1:
+                    cmd.extend(["-vf", "thumbnail"])
+                cmd.append(ospath.join(des_dir, name))
             task = await create_subprocess_exec(*cmd, stderr=PIPE)
-            return (task, await task.wait(), eq_thumb)
-    
-    tasks = [extract_ss(eq_thumb) for eq_thumb in range(1, total+1)]
+            return (task, await task.wait(), batch)
+
+    tasks = [extract_ss(frames[i:i+SS_BATCH]) for i in range(0, len(frames), SS_BATCH)]
     status = await gather(*tasks)
-    
-    for task, rtype, eq_thumb in status:
-        if rtype != 0 or not await aiopath.exists(ospath.join(des_dir, f"wz_thumb_{eq_thumb}.jpg")):
+
+    for task, rtype, batch in status:
+        if rtype != 0 or not all([await aiopath.exists(ospath.join(des_dir, name)) for _, name in batch]):
             err = (await task.stderr.read()).decode().strip()
-            LOGGER.error(f'Error while extracting thumbnail no. {eq_thumb} from video. Name: {video_file} stderr: {err}')
+            LOGGER.error(f'Error while extracting thumbnails {batch[0][1]} to {batch[-1][1]} from video. Name: {video_file} stderr: {err}')
             await aiormtree(des_dir)
             return None
     return (des_dir, tstamps) if gen_ss else ospath.join(des_dir, "wz_thumb_1.jpg")
 
 
-async def split_file(path, size, file_, dirpath, split_size, listener, start_time=0, i=1, inLoop=False, multi_streams=True):
+class FilePart(IOBase):
+    def __init__(self, path, name, offset, length):
+        self.__source = open(path, 'rb')
+        self.__pos = 0
+        self.name = name
+        self.offset = offset
+        self.length = length
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.__pos
+
+    def seek(self, offset, whence=SEEK_SET):
+        base = {SEEK_SET: 0, SEEK_CUR: self.__pos, SEEK_END: self.length}[whence]
+        self.__pos = min(max(base + offset, 0), self.length)
+        return self.__pos
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.length - self.__pos:
+            size = self.length - self.__pos
+        data = pread(self.__source.fileno(), size, self.offset + self.__pos) if size else b''
+        self.__pos += len(data)
+        return data
+
+    def close(self):
+        pass
+
+    def release(self):
+        self.__source.close()
+
+
+async def get_keyframes(path):
+    try:
+        stdout, stderr, code = await cmd_exec(["ffprobe", "-hide_banner", "-loglevel", "error", "-select_streams", "v:0",
+                                               "-show_entries", "packet=pts_time,pos,flags", "-of", "csv=p=0", path])
+    except Exception as e:
+        LOGGER.error(f'Get Keyframes: {e}. Path: {path}')
+        return []
+    if code != 0:
+        LOGGER.warning(f'Get Keyframes: {stderr}. Path: {path}')
+        return []
+    keyframes = []
+    for line in stdout.splitlines():
+        pts_time, pos, flags = (line.split(',') + ['', '', ''])[:3]
+        if 'K' not in flags:
+            continue
+        with suppress(ValueError):
+            keyframes.append((float(pts_time), int(pos)))
+    return sorted(keyframes)
+
+
+def plan_cuts(keyframes, split_size, size):
+    cuts, start_pos, last = [0.0], 0, None
+    for pts_time, pos in [*keyframes, (None, size)]:
+        if pos - start_pos > split_size and last is not None and last[0] > cuts[-1]:
+            cuts.append(last[0])
+            start_pos = last[1]
+        last = (pts_time, pos)
+    return cuts
+
+
+async def split_video(path, size, file_, dirpath, split_size, listener, multi_streams, part_queue=None):
+    if len(cuts := plan_cuts(await get_keyframes(path), split_size, size)) < 2:
+        return None
+    base_name, extension = ospath.splitext(file_)
+    procs = []
+
+    def part_path(index):
+        return ospath.join(dirpath, f"{base_name}.part{index + 1:03}{extension}")
+
+    async def cut(index, map_streams):
+        out_path = part_path(index)
+        cmd = [bot_cache['pkgs'][2], "-hide_banner", "-loglevel", "error", "-ss", str(cuts[index]), "-i", path,
+               "-map", "0", "-map_chapters", "-1", "-async", "1", "-strict", "-2", "-c", "copy", out_path]
+        if index + 1 < len(cuts):
+            cmd[8:8] = ["-t", str(cuts[index + 1] - cuts[index])]
+        if not map_streams:
+            cmd.remove("-map")
+            cmd.remove("0")
+        if listener.suproc == 'cancelled' or listener.suproc is not None and listener.suproc.returncode == -9:
+            return False
+        listener.suproc = proc = await create_subprocess_exec(*cmd, stderr=PIPE)
+        procs.append(proc)
+        code = await proc.wait()
+        if code == -9:
+            return False
+        elif code != 0:
+            err = (await proc.stderr.read()).decode().strip()
+            with suppress(Exception):
+                await aioremove(out_path)
+            if map_streams:
+                LOGGER.warning(f"{err}. Retrying without map, -map 0 not working in all situations. Path: {path}")
+                return await cut(index, False)
+            LOGGER.warning(f"{err}. Unable to split this video. Path: {path}")
+            return None
+        if await aiopath.getsize(out_path) > MAX_SPLIT_SIZE:
+            LOGGER.warning(f"Part {index + 1} is larger than {MAX_SPLIT_SIZE}, keyframes too far apart, splitting by size from here. Path: {path}")
+            await aioremove(out_path)
+            return "oversize"
+        return out_path
+
+    async def stop():
+        for _, task in tasks:
+            task.cancel()
+        for proc in procs:
+            if proc.returncode is None:
+                proc.kill()
+        await gather(*(task for _, task in tasks), return_exceptions=True)
+        for pending, _ in tasks:
+            with suppress(Exception):
+                await aioremove(part_path(pending))
+        tasks.clear()
+
+    workers = max(config_dict['LEECH_CONCURRENCY'], 1) + 1
+    tasks, index = deque(), 0
+    try:
+        while tasks or index < len(cuts):
+            while index < len(cuts) and len(tasks) < workers:
+                tasks.append((index, create_task(cut(index, multi_streams))))
+                index += 1
+            done, task = tasks.popleft()
+            if (out_path := await task) is False:
+                return False
+            elif out_path is None:
+                return "errored"
+            elif out_path == "oversize":
+                await stop()
+                return await split_file(path, size, file_, dirpath, split_size, listener, cuts[done], done + 1, True,
+                                        multi_streams, part_queue)
+            if part_queue is not None:
+                await part_queue.put(out_path)
+        return True
+    finally:
+        await stop()
+
+
+async def split_file(path, size, file_, dirpath, split_size, listener, start_time=0, i=1, inLoop=False, multi_streams=True, part_queue=None):
     if listener.suproc == 'cancelled' or listener.suproc is not None and listener.suproc.returncode == -9:
         return False
     if listener.seed and not listener.newDir:
@@ -180,6 +364,8 @@ async def split_file(path, size, file_, dirpath, split_size, listener, start_tim
         duration = (await get_media_info(path))[0]
         base_name, extension = ospath.splitext(file_)
         split_size -= 5000000
+        if not inLoop and (res := await split_video(path, size, file_, dirpath, split_size, listener, multi_streams, part_queue)) is not None:
+            return res
         while i <= parts or start_time < duration - 4:
             parted_name = f"{base_name}.part{i:03}{extension}"
             out_path = ospath.join(dirpath, parted_name)
@@ -204,7 +390,7 @@ async def split_file(path, size, file_, dirpath, split_size, listener, start_tim
                 if multi_streams:
                     LOGGER.warning(
                         f"{err}. Retrying without map, -map 0 not working in all situations. Path: {path}")
-                    return await split_file(path, size, file_, dirpath, split_size, listener, start_time, i, True, False)
+                    return await split_file(path, size, file_, dirpath, split_size, listener, start_time, i, True, False, part_queue=part_queue)
                 else:
                     LOGGER.warning(
                         f"{err}. Unable to split this video, if it's size less than {MAX_SPLIT_SIZE} will be uploaded as it is. Path: {path}")
@@ -214,8 +400,10 @@ async def split_file(path, size, file_, dirpath, split_size, listener, start_tim
                 dif = out_size - MAX_SPLIT_SIZE
                 split_size -= dif + 5000000
                 await aioremove(out_path)
-                return await split_file(path, size, file_, dirpath, split_size, listener, start_time, i, True, )
+                return await split_file(path, size, file_, dirpath, split_size, listener, start_time, i, True, part_queue=part_queue)
             lpd = (await get_media_info(out_path))[0]
+            if part_queue is not None and (lpd == 0 or lpd == duration or lpd > 3):
+                await part_queue.put(out_path)
             if lpd == 0:
                 LOGGER.error(
                     f'Something went wrong while splitting, mostly file is corrupted. Path: {path}')
@@ -229,6 +417,9 @@ async def split_file(path, size, file_, dirpath, split_size, listener, start_tim
                 break
             start_time += lpd - 3
             i += 1
+    elif part_queue is not None:
+        for index, offset in enumerate(range(0, size, split_size), start=1):
+            await part_queue.put(FilePart(path, f"{file_}.{index:03}", offset, min(split_size, size - offset)))
     else:
         out_path = ospath.join(dirpath, f"{file_}.")
         listener.suproc = await create_subprocess_exec("split", "--numeric-suffixes=1", "--suffix-length=3",
@@ -241,7 +432,22 @@ async def split_file(path, size, file_, dirpath, split_size, listener, start_tim
             LOGGER.error(err)
     return True
 
-async def format_filename(file_, user_id, dirpath=None, isMirror=False):
+
+async def split_reserve(path, split_size):
+    window = (max(config_dict['LEECH_CONCURRENCY'], 1) + 1) * split_size
+    if await aiopath.isfile(path):
+        files = [path]
+    else:
+        files = [ospath.join(dirpath, name) for dirpath, _, names in await sync_to_async(list, walk(path)) for name in names]
+    reserve = 0
+    for file_ in files:
+        with suppress(OSError):
+            if (size := (await aiostat(file_)).st_size) > split_size and (await get_document_type(file_))[0]:
+                reserve = max(reserve, min(size, window))
+    return reserve
+
+
+async def format_filename(file_, user_id, dirpath=None, isMirror=False, part=None):
     user_dict = user_data.get(user_id, {})
     ftag, ctag = ('m', 'MIRROR') if isMirror else ('l', 'LEECH')
     prefix = config_dict[f'{ctag}_FILENAME_PREFIX'] if (val:=user_dict.get(f'{ftag}prefix', '')) == '' else val
@@ -305,15 +511,15 @@ async def format_filename(file_, user_id, dirpath=None, isMirror=False):
         slit = lcaption.split("|")
         slit[0] = re_sub(r'\{([^}]+)\}', lowerVars, slit[0])
         up_path = ospath.join(dirpath, prefile_)
-        dur, qual, lang, subs = await get_media_info(up_path, True)
+        dur, qual, lang, subs = await get_media_info(up_path, True) if part is None else (0, "", "", "")
         cap_mono = slit[0].format(
             filename = nfile_,
-            size = get_readable_file_size(await aiopath.getsize(up_path)),
+            size = get_readable_file_size(part.length if part is not None else await aiopath.getsize(up_path)),
             duration = get_readable_time(dur),
             quality = qual,
             languages = lang,
             subtitles = subs,
-            md5_hash = get_md5_hash(up_path)
+            md5_hash = get_md5_hash(part if part is not None else up_path)
         )
         if len(slit) > 1:
             for rep in range(1, len(slit)):
@@ -334,8 +540,7 @@ async def get_ss(up_path, ss_no):
     up_sem = Semaphore(25)
     async def telefile(thumb):
         async with up_sem:
-            tele_id = await sync_to_async(upload_file, ospath.join(thumbs_path, thumb))
-            return tele_id[0], tstamps[thumb]
+            return await telegraph.upload_file(ospath.join(thumbs_path, thumb)), tstamps[thumb]
     tasks = [telefile(thumb) for thumb in natsorted(await listdir(thumbs_path))]
     results = await gather(*tasks)
     th_html += ''.join(f'<img src="https://graph.org{tele_id}"><br><pre>Screenshot at {stamp}</pre>' for tele_id, stamp in results)
@@ -355,7 +560,9 @@ async def get_mediainfo_link(up_path):
 
 def get_md5_hash(up_path):
     md5_hash = md5()
-    with open(up_path, "rb") as f:
+    with open(up_path, "rb") if isinstance(up_path, str) else nullcontext(up_path) as f:
+        f.seek(0)
         for byte_block in iter(lambda: f.read(4096), b""):
             md5_hash.update(byte_block)
+        f.seek(0)
         return md5_hash.hexdigest()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging import getLogger
+from time import monotonic, sleep
+
+LOGGER = getLogger(__name__)
+
+
+def wait_until(name, probe, timeout=30, interval=0.2):
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            if (result := probe()) is not None:
+                return result
+        except Exception as e:
+            error = e
+        else:
+            error = None
+        if monotonic() >= deadline:
+            LOGGER.error(f"{name} not ready after {timeout}s: {error}")
+            return None
+        sleep(interval)
+
+
+class Startup:
+    def __init__(self):
+        self.__started = monotonic()
+        self.__steps = {}
+        self.__timings = {}
+        self.__results = {}
+        self.__futures = {}
+        self.__executor = None
+
+    def add(self, name, func, *deps):
+        if missing := [dep for dep in deps if dep not in self.__steps]:
+            raise ValueError(f"Startup step {name} depends on unknown {missing}")
+        self.__steps[name] = (func, deps)
+
+    def __record(self, name, start):
+        self.__timings[name] = (start - self.__started, monotonic() - start)
+
+    def __run_step(self, name, func, deps):
+        for dep in deps:
+            dep.result()
+        start = monotonic()
+        try:
+            self.__results[name] = func()
+            return self.__results[name]
+        finally:
+            self.__record(name, start)
+
+    def result(self, name):
+        return self.__results.get(name)
+
+    def start(self):
+        steps, self.__steps = self.__steps, {}
+        self.__executor = ThreadPoolExecutor(max_workers=max(len(steps), 1), thread_name_prefix='startup')
+        for name, (func, deps) in steps.items():
+            self.__futures[name] = self.__executor.submit(self.__run_step, name, func, [self.__futures[dep] for dep in deps])
+
+    def wait(self):
+        try:
+            for future in self.__futures.values():
+                future.result()
+        finally:
+            self.__executor.shutdown()
+
+    @contextmanager
+    def measure(self, name):
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.__record(name, start)
+
+    async def track(self, name, coro):
+        start = monotonic()
+        try:
+            return await coro
+        finally:
+            self.__record(name, start)
+
+    def report(self):
+        total = monotonic() - self.__started
+        LOGGER.info(f"Startup finished in {total:.2f}s")
+        for name, (offset, duration) in sorted(self.__timings.items(), key=lambda item: item[1][0]):
+            LOGGER.info(f"  {name:<20} +{offset:6.2f}s  {duration:6.2f}s")
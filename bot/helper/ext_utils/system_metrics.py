@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+from time import time
+from collections import deque
+from threading import Thread, Event, Lock
+from typing import NamedTuple, Any
+
+from psutil import cpu_percent, virtual_memory, swap_memory, disk_usage, disk_io_counters, net_io_counters
+
+from bot import config_dict, LOGGER
+
+SPARK_BLOCKS = '▁▂▃▄▅▆▇█'
+
+
+class MetricsSample(NamedTuple):
+    time: float
+    cpu: float
+    memory: Any
+    swap: Any
+    disk: Any
+    download_disk: Any
+    disk_io: Any
+    net_io: Any
+
+
+class SystemMetrics:
+    def __init__(self, interval=2, history=60):
+        self.__interval = interval
+        self.__samples = deque(maxlen=history)
+        self.__lock = Lock()
+        self.__stop = Event()
+        self.__thread = None
+
+    def __sample(self):
+        download_dir = config_dict.get('DOWNLOAD_DIR', '/usr/src/app/downloads/')
+        try:
+            download_disk = disk_usage(download_dir)
+        except Exception:
+            download_disk = disk_usage('/')
+        try:
+            disk_io = disk_io_counters()
+        except Exception:
+            disk_io = None
+        return MetricsSample(time(), cpu_percent(), virtual_memory(), swap_memory(), disk_usage('/'),
+                             download_disk, disk_io, net_io_counters())
+
+    def __run(self):
+        cpu_percent()
+        while True:
+            try:
+                sample = self.__sample()
+                with self.__lock:
+                    self.__samples.append(sample)
+            except Exception as e:
+                LOGGER.error(f'{e}: while sampling system metrics')
+            if self.__stop.wait(self.__interval):
+                break
+
+    def start(self):
+        with self.__lock:
+            if self.__thread is not None:
+                return
+            self.__thread = Thread(target=self.__run, name='system-metrics', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+
+    def latest(self):
+        self.start()
+        with self.__lock:
+            if self.__samples:
+                return self.__samples[-1]
+        sample = self.__sample()
+        with self.__lock:
+            if not self.__samples:
+                self.__samples.append(sample)
+            return self.__samples[-1]
+
+    def history(self, seconds=None):
+        with self.__lock:
+            samples = list(self.__samples)
+        if seconds is not None and samples:
+            samples = [sample for sample in samples if samples[-1].time - sample.time <= seconds]
+        return samples
+
+    def rates(self):
+        samples = self.history()
+        if len(samples) < 2:
+            return 0, 0, 0, 0
+        first, last = samples[-2], samples[-1]
+        elapsed = (last.time - first.time) or 1
+        up = (last.net_io.bytes_sent - first.net_io.bytes_sent) / elapsed
+        down = (last.net_io.bytes_recv - first.net_io.bytes_recv) / elapsed
+        if first.disk_io and last.disk_io:
+            read = (last.disk_io.read_bytes - first.disk_io.read_bytes) / elapsed
+            write = (last.disk_io.write_bytes - first.disk_io.write_bytes) / elapsed
+        else:
+            read = write = 0
+        return up, down, read, write
+
+    def sparkline(self, key=lambda sample: sample.cpu, width=20, maximum=100):
+        values = [key(sample) for sample in self.history()[-width:]]
+        if not values:
+            return ''
+        maximum = maximum or max(values) or 1
+        return ''.join(SPARK_BLOCKS[min(int(value / maximum * (len(SPARK_BLOCKS) - 1)), len(SPARK_BLOCKS) - 1)] for value in values)
+
+
+system_metrics = SystemMetrics()
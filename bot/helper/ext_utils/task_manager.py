@@ -5,6 +5,8 @@ from asyncio import Event
 from bot import bot_cache, config_dict, queued_dl, queued_up, non_queued_up, non_queued_dl, queue_dict_lock, LOGGER, user_data, download_dict
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.ext_utils.fs_utils import get_base_name, check_storage_threshold
+from bot.helper.ext_utils.task_scheduler import queue_order
+from bot.helper.ext_utils.disk_ledger import disk_ledger
 from bot.helper.ext_utils.bot_utils import get_user_tasks, getdailytasks, sync_to_async, get_telegraph_list, get_readable_file_size, checking_access, get_readable_time
 from bot.helper.telegram_helper.message_utils import forcesub, check_botpm
 from bot.helper.telegram_helper.filters import CustomFilters
@@ -44,22 +46,80 @@ async def timeval_check(user_id):
     return None
 
 
-async def is_queued(uid):
+DL_ENGINES = ['qbit', 'aria2', 'ytdlp', 'telegram', 'mega', 'gdrive', 'rclone']
+UP_ENGINES = ['telegram', 'gdrive', 'rclone', 'ddl']
+dl_engines = {}
+up_engines = {}
+
+
+def get_engine_limits(key, engines):
+    limits = {}
+    for item in (config_dict[key] or '').split():
+        engine, _, limit = item.partition(':')
+        if (engine := engine.strip().lower()) in engines and limit.strip().isdigit():
+            limits[engine] = int(limit)
+    return limits
+
+
+def engine_counts(running, engines):
+    counts = {}
+    for uid in list(running):
+        if (engine := engines.get(uid)) is not None:
+            counts[engine] = counts.get(engine, 0) + 1
+    return counts
+
+
+def engine_full(engine, running, engines, limits):
+    if not engine or not (limit := limits.get(engine)):
+        return False
+    return engine_counts(running, engines).get(engine, 0) >= limit
+
+
+async def is_queued(uid, engine=None):
     all_limit = config_dict['QUEUE_ALL']
     dl_limit = config_dict['QUEUE_DOWNLOAD']
+    limits = get_engine_limits('QUEUE_DOWNLOAD_ENGINES', DL_ENGINES)
+    event = None
+    added_to_queue = False
+    async with queue_dict_lock:
+        if engine is not None:
+            dl_engines[uid] = engine
+        dl = len(non_queued_dl)
+        up = len(non_queued_up)
+        if (all_limit and dl + up >= all_limit and (not dl_limit or dl >= dl_limit)) or (dl_limit and dl >= dl_limit) \
+                or engine_full(engine, non_queued_dl, dl_engines, limits):
+            added_to_queue = True
+            event = Event()
+            queued_dl[uid] = event
+    return added_to_queue, event
+
+
+async def is_queued_up(uid, engine=None):
+    all_limit = config_dict['QUEUE_ALL']
+    up_limit = config_dict['QUEUE_UPLOAD']
+    limits = get_engine_limits('QUEUE_UPLOAD_ENGINES', UP_ENGINES)
     event = None
     added_to_queue = False
-    if all_limit or dl_limit:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (all_limit and dl + up >= all_limit and (not dl_limit or dl >= dl_limit)) or (dl_limit and dl >= dl_limit):
-                added_to_queue = True
-                event = Event()
-                queued_dl[uid] = event
+    async with queue_dict_lock:
+        if engine is not None:
+            up_engines[uid] = engine
+        dl = len(non_queued_dl)
+        up = len(non_queued_up)
+        if (all_limit and dl + up >= all_limit and (not up_limit or up >= up_limit)) or (up_limit and up >= up_limit) \
+                or engine_full(engine, non_queued_up, up_engines, limits):
+            added_to_queue = True
+            event = Event()
+            queued_up[uid] = event
     return added_to_queue, event
 
 
+def forget_engine(uid, status=None):
+    if status in [None, 'dl']:
+        dl_engines.pop(uid, None)
+    if status in [None, 'up']:
+        up_engines.pop(uid, None)
+
+
 def start_dl_from_queued(uid):
     queued_dl[uid].set()
     del queued_dl[uid]
@@ -70,65 +130,64 @@ def start_up_from_queued(uid):
     del queued_up[uid]
 
 
+def __release(status, slots):
+    if status == 'dl':
+        queue, running, engines, start = queued_dl, non_queued_dl, dl_engines, start_dl_from_queued
+        limits = get_engine_limits('QUEUE_DOWNLOAD_ENGINES', DL_ENGINES)
+    else:
+        queue, running, engines, start = queued_up, non_queued_up, up_engines, start_up_from_queued
+        limits = get_engine_limits('QUEUE_UPLOAD_ENGINES', UP_ENGINES)
+    if not queue or (slots is not None and slots <= 0):
+        return 0
+    counts = engine_counts(running, engines)
+    released = 0
+    for uid in queue_order(status):
+        if slots is not None and released >= slots:
+            break
+        engine = engines.get(uid)
+        if engine and (limit := limits.get(engine)) and counts.get(engine, 0) >= limit:
+            continue
+        counts[engine] = counts.get(engine, 0) + 1
+        start(uid)
+        released += 1
+    return released
+
+
+def __min_slots(*slots):
+    slots = [slot for slot in slots if slot is not None]
+    return min(slots) if slots else None
+
+
 async def start_from_queued():
-    if all_limit := config_dict['QUEUE_ALL']:
-        dl_limit = config_dict['QUEUE_DOWNLOAD']
-        up_limit = config_dict['QUEUE_UPLOAD']
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            all_ = dl + up
-            if all_ < all_limit:
-                f_tasks = all_limit - all_
-                if queued_up and (not up_limit or up < up_limit):
-                    for index, uid in enumerate(list(queued_up.keys()), start=1):
-                        f_tasks = all_limit - all_
-                        start_up_from_queued(uid)
-                        f_tasks -= 1
-                        if f_tasks == 0 or (up_limit and index >= up_limit - up):
-                            break
-                if queued_dl and (not dl_limit or dl < dl_limit) and f_tasks != 0:
-                    for index, uid in enumerate(list(queued_dl.keys()), start=1):
-                        start_dl_from_queued(uid)
-                        if (dl_limit and index >= dl_limit - dl) or index == f_tasks:
-                            break
-        return
+    all_limit = config_dict['QUEUE_ALL']
+    dl_limit = config_dict['QUEUE_DOWNLOAD']
+    up_limit = config_dict['QUEUE_UPLOAD']
+    async with queue_dict_lock:
+        dl = len(non_queued_dl)
+        up = len(non_queued_up)
+        free = all_limit - dl - up if all_limit else None
+        released = __release('up', __min_slots(free, up_limit - up if up_limit else None))
+        if free is not None:
+            free -= released
+        __release('dl', __min_slots(free, dl_limit - dl if dl_limit else None))
 
-    if up_limit := config_dict['QUEUE_UPLOAD']:
-        async with queue_dict_lock:
-            up = len(non_queued_up)
-            if queued_up and up < up_limit:
-                f_tasks = up_limit - up
-                for index, uid in enumerate(list(queued_up.keys()), start=1):
-                    start_up_from_queued(uid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_up:
-                for uid in list(queued_up.keys()):
-                    start_up_from_queued(uid)
-
-    if dl_limit := config_dict['QUEUE_DOWNLOAD']:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            if queued_dl and dl < dl_limit:
-                f_tasks = dl_limit - dl
-                for index, uid in enumerate(list(queued_dl.keys()), start=1):
-                    start_dl_from_queued(uid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_dl:
-                for uid in list(queued_dl.keys()):
-                    start_dl_from_queued(uid)
+
+def storage_phases(size, listener):
+    split_size = 0
+    if listener.isLeech:
+        split_size = user_data.get(listener.message.from_user.id, {}).get('split_size', False) or config_dict['LEECH_SPLIT_SIZE']
+    return disk_ledger.phases(size, bool(listener.extract), bool(listener.compress), split_size,
+                              max(config_dict['LEECH_CONCURRENCY'], 1) + 1)
 
 
 async def limit_checker(size, listener, isTorrent=False, isMega=False, isDriveLink=False, isYtdlp=False, isPlayList=None):
     LOGGER.info('Checking Size Limit of link/file/folder/tasks...')
     user_id = listener.message.from_user.id 
+    if config_dict['STORAGE_THRESHOLD'] and not listener.isClone:
+        phases = storage_phases(size, listener)
     if await CustomFilters.sudo('', listener.message):
+        if config_dict['STORAGE_THRESHOLD'] and not listener.isClone:
+            disk_ledger.reserve(listener.uid, phases)
         return
     limit_exceeded = ''
     if listener.isClone:
@@ -169,13 +228,6 @@ async def limit_checker(size, listener, isTorrent=False, isMega=False, isDriveLi
             limit = LEECH_LIMIT * 1024**3
             if size > limit:
                 limit_exceeded = f'Leech limit is {get_readable_file_size(limit)}'
-        
-        if (STORAGE_THRESHOLD := config_dict['STORAGE_THRESHOLD']) and not listener.isClone:
-            arch = any([listener.compress, listener.extract])
-            limit = STORAGE_THRESHOLD * 1024**3
-            acpt = await sync_to_async(check_storage_threshold, size, limit, arch)
-            if not acpt:
-                limit_exceeded = f'You must leave {get_readable_file_size(limit)} free storage.'
 
         if config_dict['DAILY_TASK_LIMIT'] and config_dict['DAILY_TASK_LIMIT'] <= await getdailytasks(user_id):
             limit_exceeded = f"Daily Total Task Limit: {config_dict['DAILY_TASK_LIMIT']}\nYou have exhausted all your Daily Task Limits."
@@ -184,19 +236,28 @@ async def limit_checker(size, listener, isTorrent=False, isMega=False, isDriveLi
             LOGGER.info(f"User: {user_id} | Daily Tasks: {ttask}")
         if (DAILY_MIRROR_LIMIT := config_dict['DAILY_MIRROR_LIMIT']) and not listener.isLeech:
             limit = DAILY_MIRROR_LIMIT * 1024**3
-            if (size >= (limit - await getdailytasks(user_id, check_mirror=True)) or limit <= await getdailytasks(user_id, check_mirror=True)):
+            used = await getdailytasks(user_id, check_mirror=True)
+            if size >= (limit - used) or limit <= used:
                 limit_exceeded = f'Daily Mirror Limit is {get_readable_file_size(limit)}\nYou have exhausted all your Daily Mirror Limit.'
             elif not listener.isLeech:
                 msize = await getdailytasks(user_id, upmirror=size, check_mirror=True)
                 LOGGER.info(f"User : {user_id} | Daily Mirror Size : {get_readable_file_size(msize)}")
         if (DAILY_LEECH_LIMIT := config_dict['DAILY_LEECH_LIMIT']) and listener.isLeech:
             limit = DAILY_LEECH_LIMIT * 1024**3
-            if (size >= (limit - await getdailytasks(user_id, check_leech=True)) or limit <= await getdailytasks(user_id, check_leech=True)):
+            used = await getdailytasks(user_id, check_leech=True)
+            if size >= (limit - used) or limit <= used:
                 limit_exceeded = f'Daily Leech Limit is {get_readable_file_size(limit)}\nYou have exhausted all your Daily Leech Limit.'
             elif listener.isLeech:
                 lsize = await getdailytasks(user_id, upleech=size, check_leech=True)
                 LOGGER.info(f"User : {user_id} | Daily Leech Size : {get_readable_file_size(lsize)}")
+
+    if not limit_exceeded and (STORAGE_THRESHOLD := config_dict['STORAGE_THRESHOLD']) and not listener.isClone:
+        limit = STORAGE_THRESHOLD * 1024**3
+        acpt = await sync_to_async(check_storage_threshold, size, limit, uid=listener.uid, phases=phases)
+        if not acpt:
+            limit_exceeded = f'You must leave {get_readable_file_size(limit)} free storage.'
     if limit_exceeded:
+        disk_ledger.release(listener.uid)
         if size:
             return f"{limit_exceeded}.\nYour List/File/Folder size is {get_readable_file_size(size)}."
         elif isPlayList != 0:
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+from time import time
+from logging import getLogger
+
+LOGGER = getLogger(__name__)
+
+
+class TaskRegistry(dict):
+    def __init__(self):
+        super().__init__()
+        self.__gids = {}
+        self.__users = {}
+        self.__statuses = {}
+        self.__keys = {}
+
+    @staticmethod
+    def __task_gid(task):
+        try:
+            return task.gid()
+        except Exception as e:
+            LOGGER.error(f'{e}: while indexing task gid')
+            return None
+
+    @staticmethod
+    def __task_status(task):
+        try:
+            return task.status()
+        except Exception as e:
+            LOGGER.error(f'{e}: while indexing task status')
+            return None
+
+    def __index(self, uid, gid, user_id, status):
+        self.__keys[uid] = (gid, user_id, status)
+        if gid is not None:
+            self.__gids[gid] = uid
+        self.__users.setdefault(user_id, {})[uid] = None
+        self.__statuses.setdefault(status, {})[uid] = None
+
+    def __unindex(self, uid):
+        if (keys := self.__keys.pop(uid, None)) is None:
+            return
+        gid, user_id, status = keys
+        if self.__gids.get(gid) == uid:
+            del self.__gids[gid]
+        for index, key in ((self.__users, user_id), (self.__statuses, status)):
+            if (uids := index.get(key)) is not None:
+                uids.pop(uid, None)
+                if not uids:
+                    del index[key]
+
+    def __setitem__(self, uid, task):
+        self.__unindex(uid)
+        super().__setitem__(uid, task)
+        self.__index(uid, self.__task_gid(task), task.message.from_user.id, self.__task_status(task))
+
+    def __delitem__(self, uid):
+        super().__delitem__(uid)
+        self.__unindex(uid)
+
+    def pop(self, uid, *default):
+        self.__unindex(uid)
+        return super().pop(uid, *default)
+
+    def clear(self):
+        super().clear()
+        for index in (self.__gids, self.__users, self.__statuses, self.__keys):
+            index.clear()
+
+    def reindex(self, uid, gid=None, status=None):
+        if (task := self.get(uid)) is None:
+            return
+        _, user_id, _ = self.__keys.get(uid, (None, task.message.from_user.id, None))
+        self.__unindex(uid)
+        self.__index(uid, gid or self.__task_gid(task), user_id, status or self.__task_status(task))
+
+    def update_status(self, uid, status):
+        if (keys := self.__keys.get(uid)) is not None and keys[2] != status:
+            self.reindex(uid, gid=keys[0], status=status)
+
+    def by_gid(self, gid):
+        if (uid := self.__gids.get(gid)) is not None:
+            return self.get(uid)
+
+    def by_user(self, user_id):
+        return [self[uid] for uid in list(self.__users.get(user_id, {})) if uid in self]
+
+    def by_status(self, status, user_id=None):
+        uids = list(self.__statuses.get(status, {}))
+        if user_id is not None:
+            uids = [uid for uid in uids if uid in self.__users.get(user_id, {})]
+        return [self[uid] for uid in uids if uid in self]
+
+    def count_user(self, user_id):
+        return len(self.__users.get(user_id, {}))
+
+
+class TaskQueue(dict):
+    def __init__(self):
+        super().__init__()
+        self.__added = {}
+
+    def __setitem__(self, uid, event):
+        super().__setitem__(uid, event)
+        self.__added.setdefault(uid, time())
+
+    def __delitem__(self, uid):
+        super().__delitem__(uid)
+        self.__added.pop(uid, None)
+
+    def pop(self, uid, *default):
+        self.__added.pop(uid, None)
+        return super().pop(uid, *default)
+
+    def clear(self):
+        super().clear()
+        self.__added.clear()
+
+    def added(self, uid):
+        return self.__added.get(uid, time())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+from time import time
+from math import inf
+from heapq import heapify, heappop, heappush
+
+from bot import config_dict, user_data, OWNER_ID, download_dict, queued_dl, queued_up, non_queued_dl, non_queued_up
+
+CLASS_OWNER = 0
+CLASS_PAID = 1
+CLASS_NORMAL = 2
+
+
+def priority_class(user_id):
+    user_dict = user_data.get(user_id, {})
+    if user_id == OWNER_ID or user_dict.get('is_sudo'):
+        return CLASS_OWNER
+    if user_dict.get('is_paid'):
+        return CLASS_PAID
+    return CLASS_NORMAL
+
+
+def task_owner(uid):
+    if (task := download_dict.get(uid)) is None:
+        return None
+    return task.message.from_user.id
+
+
+def task_size(uid):
+    if (task := download_dict.get(uid)) is None:
+        return inf
+    try:
+        if hasattr(task, 'size_raw'):
+            return task.size_raw() or inf
+        return task.progress_record().size or inf
+    except Exception:
+        return inf
+
+
+class FifoScheduler:
+    def order(self, queue, running):
+        return list(queue)
+
+
+class FairShareScheduler:
+    def __key(self, queue, uid, owner, now):
+        aging = config_dict['QUEUE_AGING'] or inf
+        added = queue.added(uid)
+        rank = priority_class(owner) - int((now - added) // aging)
+        size = task_size(uid) if config_dict['QUEUE_SMALL_FIRST'] else 0
+        return rank, size, added
+
+    def order(self, queue, running):
+        now = time()
+        buckets = {}
+        for index, uid in enumerate(list(queue)):
+            owner = task_owner(uid)
+            buckets.setdefault(owner, []).append((self.__key(queue, uid, owner, now), index, uid))
+        shares = {}
+        for uid in list(running):
+            if (owner := task_owner(uid)) is not None:
+                shares[owner] = shares.get(owner, 0) + 1
+        heap = []
+        for owner, bucket in buckets.items():
+            bucket.sort(reverse=True)
+            (rank, size, added), index, _ = bucket[-1]
+            heap.append((rank, shares.get(owner, 0), size, added, index, owner))
+        heapify(heap)
+        ordered = []
+        while heap:
+            *_, owner = heappop(heap)
+            bucket = buckets[owner]
+            ordered.append(bucket.pop()[2])
+            shares[owner] = shares.get(owner, 0) + 1
+            if bucket:
+                (rank, size, added), index, _ = bucket[-1]
+                heappush(heap, (rank, shares[owner], size, added, index, owner))
+        return ordered
+
+
+SCHEDULERS = {'fifo': FifoScheduler(), 'fair': FairShareScheduler()}
+
+
+def get_scheduler():
+    return SCHEDULERS.get(config_dict['QUEUE_POLICY'], SCHEDULERS['fair'])
+
+
+def queue_order(status):
+    if status == 'dl':
+        return get_scheduler().order(queued_dl, non_queued_dl)
+    return get_scheduler().order(queued_up, non_queued_up)
+
+
+class QueueEstimator:
+    def __init__(self, ttl=2):
+        self.__ttl = ttl
+        self.__cache = {}
+
+    def __running_etas(self, running):
+        etas = []
+        for uid in list(running):
+            if (task := download_dict.get(uid)) is None:
+                continue
+            try:
+                eta = task.progress_record().eta
+            except Exception:
+                eta = None
+            etas.append(inf if eta is None else eta)
+        return sorted(etas)
+
+    def __estimate(self, status):
+        running = non_queued_dl if status == 'dl' else non_queued_up
+        limit = (config_dict['QUEUE_DOWNLOAD'] if status == 'dl' else config_dict['QUEUE_UPLOAD']) or config_dict['QUEUE_ALL']
+        ordered = queue_order(status)
+        etas = self.__running_etas(running)
+        busy = max(len(etas) - limit, 0) if limit else 0
+        estimates = {}
+        for position, uid in enumerate(ordered):
+            index = busy + position
+            eta = etas[index] if index < len(etas) and etas[index] != inf else None
+            estimates[uid] = (position + 1, len(ordered), eta)
+        return estimates
+
+    def estimate(self, uid, status):
+        stamp, estimates = self.__cache.get(status, (0, {}))
+        if time() - stamp > self.__ttl or uid not in estimates:
+            estimates = self.__estimate(status)
+            self.__cache[status] = (time(), estimates)
+        return estimates.get(uid, (0, 0, None))
+
+
+queue_estimator = QueueEstimator()
@@ -5,7 +5,7 @@ from asyncio import sleep
 from telegraph.aio import Telegraph
 from telegraph.exceptions import RetryAfterError
 
-from bot import LOGGER, bot_loop, config_dict
+from bot import LOGGER, bot_loop, config_dict, startup
 
 
 class TelegraphHelper:
@@ -15,6 +15,19 @@ class TelegraphHelper:
         self.access_token = None
         self.author_name = author_name
         self.author_url = author_url
+        self.__account = None
+
+    def start(self):
+        self.__account = bot_loop.create_task(startup.track('telegraph', self.create_account()))
+
+    async def __ready(self):
+        if self.__account is None:
+            return
+        if self.__account.done() and (self.__account.cancelled() or self.__account.exception()):
+            if not self.__account.cancelled():
+                LOGGER.error(f"Telegraph account creation failed: {self.__account.exception()}, retrying")
+            self.__account = bot_loop.create_task(self.create_account())
+        await self.__account
 
     async def create_account(self):
         await self.telegraph.create_account(
@@ -26,6 +39,7 @@ class TelegraphHelper:
         LOGGER.info(f"Telegraph Account Generated : {self.short_name}")
 
     async def create_page(self, title, content):
+        await self.__ready()
         try:
             return await self.telegraph.create_page(
                 title=title,
@@ -39,6 +53,7 @@ class TelegraphHelper:
             return await self.create_page(title, content)
 
     async def edit_page(self, path, title, content):
+        await self.__ready()
         try:
             return await self.telegraph.edit_page(
                 path=path,
@@ -52,6 +67,14 @@ class TelegraphHelper:
             await sleep(st.retry_after)
             return await self.edit_page(path, title, content)
 
+    async def upload_file(self, path):
+        try:
+            return (await self.telegraph.upload_file(path))[0]['src']
+        except RetryAfterError as st:
+            LOGGER.warning(f'Telegraph Flood control exceeded. I will sleep for {st.retry_after} seconds.')
+            await sleep(st.retry_after)
+            return await self.upload_file(path)
+
     async def edit_telegraph(self, path, telegraph_content):
         nxt_page = 1
         prev_page = 0
@@ -78,4 +101,4 @@ class TelegraphHelper:
 telegraph = TelegraphHelper(config_dict['AUTHOR_NAME'],
                             config_dict['AUTHOR_URL'])
 
-bot_loop.run_until_complete(telegraph.create_account())
+telegraph.start()
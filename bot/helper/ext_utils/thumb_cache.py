@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+from asyncio import shield
+from collections import OrderedDict
+from hashlib import md5
+from time import time
+from io import BytesIO
+from os import path as ospath
+from PIL import Image
+from aiofiles.os import path as aiopath, makedirs, remove as aioremove
+from aiofiles import open as aiopen
+
+from bot import bot, user, bot_loop, LOGGER
+from bot.helper.ext_utils.bot_utils import is_telegram_link, is_url, sync_to_async, download_image_url
+from bot.helper.telegram_helper.message_utils import get_tg_link_content
+
+
+class ThumbCache:
+    def __init__(self, path='Thumbnails/cache', limit=50, ttl=600):
+        self.__path = path
+        self.__limit = limit
+        self.__ttl = ttl
+        self.__sources = OrderedDict()
+        self.__pending = {}
+
+    def owns(self, path):
+        return path is not None and ospath.dirname(path) == self.__path
+
+    @staticmethod
+    def __normalize(photo_dir):
+        with Image.open(photo_dir) as img:
+            buffer = BytesIO()
+            img.convert("RGB").save(buffer, "JPEG")
+        return buffer.getvalue()
+
+    @staticmethod
+    async def __download(source, user_id):
+        if is_telegram_link(source):
+            msg, client = await get_tg_link_content(source, user_id)
+            if msg and not msg.photo:
+                LOGGER.error("Thumb TgLink Invalid: Provide Link to Photo Only !")
+                return None
+            return await (bot if client == 'bot' else user).download_media(msg)
+        elif is_url(source):
+            return await download_image_url(source)
+        LOGGER.error("Custom Thumb Invalid")
+        return None
+
+    async def __discard(self, path):
+        if all(path != cached for cached, _ in self.__sources.values()) and await aiopath.exists(path):
+            await aioremove(path)
+
+    async def __evict(self):
+        while len(self.__sources) > self.__limit:
+            _, (path, _) = self.__sources.popitem(last=False)
+            await self.__discard(path)
+
+    async def __fetch(self, key):
+        user_id, source = key
+        try:
+            if not (photo_dir := await self.__download(source, user_id)) or not await aiopath.exists(photo_dir):
+                return None
+            try:
+                data = await sync_to_async(self.__normalize, photo_dir)
+            finally:
+                await aioremove(photo_dir)
+            path = ospath.join(self.__path, f"{md5(data).hexdigest()}.jpg")
+            if not await aiopath.exists(path):
+                await makedirs(self.__path, exist_ok=True)
+                async with aiopen(path, 'wb') as f:
+                    await f.write(data)
+            old = self.__sources.pop(key, (None, 0))[0]
+            self.__sources[key] = (path, time() + self.__ttl)
+            if old is not None and old != path:
+                await self.__discard(old)
+            await self.__evict()
+            return path
+        except Exception as e:
+            LOGGER.error(f"Thumb Access Error: {e}")
+            return None
+        finally:
+            self.__pending.pop(key, None)
+
+    async def get(self, source, user_id):
+        key = (user_id, source)
+        path, expiry = self.__sources.get(key, (None, 0))
+        if path and expiry > time() and await aiopath.exists(path):
+            self.__sources.move_to_end(key)
+            return path
+        if (task := self.__pending.get(key)) is None:
+            task = self.__pending[key] = bot_loop.create_task(self.__fetch(key))
+        return await shield(task)
+
+
+thumb_cache = ThumbCache()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from json import load as jload, dump as jdump
+from logging import getLogger
+from os import path as ospath, replace as osreplace
+from threading import Thread, Event
+from time import time
+from urllib.request import Request, urlopen
+
+LOGGER = getLogger(__name__)
+
+TRACKER_SOURCES = ['https://raw.githubusercontent.com/XIU2/TrackersListCollection/master/all.txt',
+                   'https://ngosang.github.io/trackerslist/trackers_all_http.txt',
+                   'https://newtrackon.com/api/all',
+                   'https://raw.githubusercontent.com/hezhijie0327/Trackerslist/main/trackerslist_tracker.txt']
+TRACKER_SCHEMES = ('udp://', 'http://', 'https://', 'ws://', 'wss://')
+
+
+class TrackerCache:
+    def __init__(self, path='trackers.json', sources=TRACKER_SOURCES, ttl=21600, timeout=15):
+        self.__path = path
+        self.__sources = sources
+        self.__ttl = ttl
+        self.__timeout = timeout
+        self.__updated = 0
+        self.__trackers = []
+        self.__stop = Event()
+        self.__load()
+
+    def __load(self):
+        if not ospath.exists(self.__path):
+            return
+        try:
+            with open(self.__path) as f:
+                data = jload(f)
+            self.__updated, self.__trackers = data['time'], data['trackers']
+        except Exception as e:
+            LOGGER.error(f"{e}: while reading tracker cache")
+
+    def __save(self):
+        with open(f'{self.__path}.tmp', 'w') as f:
+            jdump({'time': self.__updated, 'trackers': self.__trackers}, f)
+        osreplace(f'{self.__path}.tmp', self.__path)
+
+    @staticmethod
+    def normalize(lines):
+        trackers, seen = [], set()
+        for line in lines:
+            tracker = line.strip()
+            if not tracker.lower().startswith(TRACKER_SCHEMES) or ',' in tracker or (key := tracker.lower()) in seen:
+                continue
+            seen.add(key)
+            trackers.append(tracker)
+        return trackers
+
+    def __fetch(self, url):
+        try:
+            with urlopen(Request(url, headers={'User-Agent': 'Wget/1.12'}), timeout=self.__timeout) as response:
+                return response.read().decode('utf-8', 'ignore').splitlines()
+        except Exception as e:
+            LOGGER.warning(f"{e}: while fetching trackers from {url}")
+            return []
+
+    @property
+    def trackers(self):
+        return self.__trackers
+
+    @property
+    def stale(self):
+        return time() - self.__updated > self.__ttl
+
+    def refresh(self):
+        with ThreadPoolExecutor(max_workers=len(self.__sources)) as executor:
+            results = list(executor.map(self.__fetch, self.__sources))
+        if not (trackers := self.normalize(line for lines in results for line in lines)):
+            return False
+        self.__trackers, self.__updated = trackers, time()
+        try:
+            self.__save()
+        except Exception as e:
+            LOGGER.error(f"{e}: while writing tracker cache")
+        LOGGER.info(f"Tracker list refreshed: {len(trackers)} trackers")
+        return True
+
+    def apply(self, aria2):
+        if not self.__trackers:
+            return
+        try:
+            aria2.set_global_options({'bt-tracker': ','.join(self.__trackers)})
+        except Exception as e:
+            LOGGER.error(f"{e}: while applying trackers to aria2")
+
+    def __refresher(self, aria2):
+        while not self.__stop.is_set():
+            if self.stale and self.refresh():
+                self.apply(aria2)
+            self.__stop.wait(max(self.__updated + self.__ttl - time(), 600))
+
+    def start(self, aria2):
+        self.apply(aria2)
+        Thread(target=self.__refresher, args=(aria2,), daemon=True, name='trackers').start()
+
+    def stop(self):
+        self.__stop.set()
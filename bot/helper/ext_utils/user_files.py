@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+from asyncio import Lock
+from collections import OrderedDict
+from os import path as ospath
+from aiofiles.os import path as aiopath, makedirs, remove as aioremove
+from aiofiles import open as aiopen
+
+from bot import DATABASE_URL, user_data, download_dict, LOGGER
+from bot.helper.ext_utils.db_handler import DbManger
+
+USER_FILE_PATHS = {'thumb': 'Thumbnails/{}.jpg', 'rclone': 'wcl/{}.conf'}
+
+
+class UserFiles:
+    def __init__(self, limit=100):
+        self.__limit = limit
+        self.__cache = OrderedDict()
+        self.__lock = Lock()
+
+    @staticmethod
+    def path(user_id, key):
+        return USER_FILE_PATHS[key].format(user_id)
+
+    def __stored(self, user_id, key):
+        return bool(DATABASE_URL and user_data.get(user_id, {}).get(key))
+
+    async def exists(self, user_id, key):
+        return self.__stored(user_id, key) or await aiopath.exists(self.path(user_id, key))
+
+    def touch(self, user_id, key):
+        self.__cache[(user_id, key)] = self.path(user_id, key)
+        self.__cache.move_to_end((user_id, key))
+
+    async def materialize(self, user_id, key):
+        path = self.path(user_id, key)
+        if await aiopath.exists(path):
+            self.touch(user_id, key)
+            return path
+        if not self.__stored(user_id, key):
+            return None
+        async with self.__lock:
+            if not await aiopath.exists(path):
+                if not (doc := await DbManger().get_user_doc(user_id, key)):
+                    return None
+                await makedirs(ospath.dirname(path), exist_ok=True)
+                async with aiopen(path, 'wb+') as f:
+                    await f.write(doc)
+            self.touch(user_id, key)
+            await self.__evict()
+        return path
+
+    async def __evict(self):
+        if not DATABASE_URL:
+            return
+        for entry in list(self.__cache):
+            if len(self.__cache) <= self.__limit:
+                break
+            if download_dict.count_user(entry[0]):
+                continue
+            path = self.__cache.pop(entry)
+            try:
+                if await aiopath.exists(path):
+                    await aioremove(path)
+            except Exception as e:
+                LOGGER.error(f"{e}: while evicting {path}")
+
+    async def forget(self, user_id, key):
+        path = self.__cache.pop((user_id, key), None) or self.path(user_id, key)
+        if await aiopath.exists(path):
+            await aioremove(path)
+
+
+user_files = UserFiles()
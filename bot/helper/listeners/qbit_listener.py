@@ -5,7 +5,7 @@ from time import time
 from bot import download_dict, download_dict_lock, get_client, QbInterval, config_dict, QbTorrents, qb_listener_lock, LOGGER, bot_loop
 from bot.helper.mirror_utils.status_utils.qbit_status import QbittorrentStatus
 from bot.helper.telegram_helper.message_utils import update_all_messages
-from bot.helper.ext_utils.bot_utils import get_readable_time, getDownloadByGid, new_task, sync_to_async
+from bot.helper.ext_utils.bot_utils import get_readable_time, getDownloadByGid, sync_task_status, new_task, sync_to_async
 from bot.helper.ext_utils.fs_utils import clean_unwanted
 from bot.helper.ext_utils.task_manager import limit_checker, stop_duplicate_check
 
@@ -108,6 +108,7 @@ async def __onDownloadComplete(tor):
 async def __qb_listener():
     client = await sync_to_async(get_client)
     while True:
+        uids = []
         async with qb_listener_lock:
             try:
                 if len(await sync_to_async(client.torrents_info)) == 0:
@@ -159,9 +160,11 @@ async def __qb_listener():
                     elif state in ['pausedUP', 'pausedDL'] and QbTorrents[tag]['seeding']:
                         QbTorrents[tag]['seeding'] = False
                         __onSeedFinish(tor_info)
+                uids = [int(tag) for tag in QbTorrents if tag.isdigit()]
             except Exception as e:
                 LOGGER.error(str(e))
                 client = await sync_to_async(get_client)
+        await sync_task_status(*uids)
         await sleep(3)
 
 
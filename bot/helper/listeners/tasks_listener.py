@@ -10,21 +10,21 @@ from aiofiles.os import path as aiopath, remove as aioremove, listdir, makedirs
 from os import walk, path as ospath
 from html import escape
 from aioshutil import move
-from asyncio import create_subprocess_exec, sleep, Event
+from asyncio import create_subprocess_exec, sleep
 from pyrogram.enums import ChatType
 
 from bot import OWNER_ID, Interval, aria2, DOWNLOAD_DIR, download_dict, download_dict_lock, LOGGER, bot_name, DATABASE_URL, \
-    MAX_SPLIT_SIZE, config_dict, status_reply_dict_lock, user_data, non_queued_up, non_queued_dl, queued_up, \
+    config_dict, status_reply_dict_lock, user_data, non_queued_up, non_queued_dl, queued_up, \
     queued_dl, queue_dict_lock, bot, GLOBAL_EXTENSION_FILTER
 from bot.helper.ext_utils.bot_utils import extra_btns, sync_to_async, get_readable_file_size, get_readable_time, is_mega_link, is_gdrive_link
 from bot.helper.ext_utils.fs_utils import get_base_name, get_path_size, clean_download, clean_target, \
     is_first_archive_split, is_archive, is_archive_split, join_files
-from bot.helper.ext_utils.leech_utils import split_file, format_filename
+from bot.helper.ext_utils.leech_utils import format_filename, split_reserve
 from bot.helper.ext_utils.exceptions import NotSupportedExtractionArchive
-from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.task_manager import start_from_queued, is_queued_up, forget_engine
+from bot.helper.ext_utils.disk_ledger import disk_ledger, PHASE_DOWNLOAD, PHASE_SPLIT
 from bot.helper.mirror_utils.status_utils.extract_status import ExtractStatus
 from bot.helper.mirror_utils.status_utils.zip_status import ZipStatus
-from bot.helper.mirror_utils.status_utils.split_status import SplitStatus
 from bot.helper.mirror_utils.status_utils.gdrive_status import GdriveStatus
 from bot.helper.mirror_utils.status_utils.telegram_status import TelegramStatus
 from bot.helper.mirror_utils.status_utils.ddl_status import DDLStatus
@@ -192,9 +192,11 @@ class MirrorLeechListener:
         dl_path = f"{self.dir}/{name}"
         up_path = ''
         size = await get_path_size(dl_path)
+        disk_ledger.release(self.uid, PHASE_DOWNLOAD)
         async with queue_dict_lock:
             if self.uid in non_queued_dl:
                 non_queued_dl.remove(self.uid)
+            forget_engine(self.uid, 'dl')
         await start_from_queued()
         user_dict = user_data.get(self.message.from_user.id, {})
         
@@ -315,55 +317,18 @@ class MirrorLeechListener:
 
         up_dir, up_name = up_path.rsplit('/', 1)
         size = await get_path_size(up_dir)
-        if self.isLeech:
-            m_size = []
-            o_files = []
-            if not self.compress:
-                checked = False
-                LEECH_SPLIT_SIZE = user_dict.get(
-                    'split_size', False) or config_dict['LEECH_SPLIT_SIZE']
-                for dirpath, _, files in await sync_to_async(walk, up_dir, topdown=False):
-                    for file_ in files:
-                        f_path = ospath.join(dirpath, file_)
-                        f_size = await aiopath.getsize(f_path)
-                        if f_size > LEECH_SPLIT_SIZE:
-                            if not checked:
-                                checked = True
-                                async with download_dict_lock:
-                                    download_dict[self.uid] = SplitStatus(
-                                        up_name, size, gid, self)
-                                LOGGER.info(f"Splitting: {up_name}")
-                            res = await split_file(f_path, f_size, file_, dirpath, LEECH_SPLIT_SIZE, self)
-                            if not res:
-                                return
-                            if res == "errored":
-                                if f_size <= MAX_SPLIT_SIZE:
-                                    continue
-                                try:
-                                    await aioremove(f_path)
-                                except:
-                                    return
-                            elif not self.seed or self.newDir:
-                                try:
-                                    await aioremove(f_path)
-                                except:
-                                    return
-                            else:
-                                m_size.append(f_size)
-                                o_files.append(file_)
+        split_size = 0
+        if self.isLeech and not self.compress:
+            split_size = user_dict.get('split_size', False) or config_dict['LEECH_SPLIT_SIZE']
 
-        up_limit = config_dict['QUEUE_UPLOAD']
-        all_limit = config_dict['QUEUE_ALL']
-        added_to_queue = False
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (all_limit and dl + up >= all_limit and (not up_limit or up >= up_limit)) or (up_limit and up >= up_limit):
-                added_to_queue = True
-                LOGGER.info(f"Added to Queue/Upload: {name}")
-                event = Event()
-                queued_up[self.uid] = event
+        if split_size and (reserve := await split_reserve(up_dir, split_size)):
+            disk_ledger.reserve(self.uid, {PHASE_SPLIT: reserve})
+        else:
+            disk_ledger.release(self.uid)
+        engine = 'telegram' if self.isLeech else 'gdrive' if self.upPath == 'gd' else 'ddl' if self.upPath == 'ddl' else 'rclone'
+        added_to_queue, event = await is_queued_up(self.uid, engine)
         if added_to_queue:
+            LOGGER.info(f"Added to Queue/Upload: {name}")
             async with download_dict_lock:
                 download_dict[self.uid] = QueueStatus(
                     name, size, gid, self, 'Up')
@@ -376,8 +341,6 @@ class MirrorLeechListener:
             non_queued_up.add(self.uid)
         if self.isLeech:
             size = await get_path_size(up_dir)
-            for s in m_size:
-                size = size - s
             LOGGER.info(f"Leech Name: {up_name}")
             tg = TgUploader(up_name, up_dir, self)
             tg_upload_status = TelegramStatus(
@@ -385,7 +348,10 @@ class MirrorLeechListener:
             async with download_dict_lock:
                 download_dict[self.uid] = tg_upload_status
             await update_all_messages()
-            await tg.upload(o_files, m_size, size)
+            try:
+                await tg.upload(size, split_size)
+            finally:
+                disk_ledger.release(self.uid)
         elif self.upPath == 'gd':
             size = await get_path_size(up_path)
             LOGGER.info(f"Upload Name: {up_name}")
@@ -491,6 +457,7 @@ class MirrorLeechListener:
                 async with queue_dict_lock:
                     if self.uid in non_queued_up:
                         non_queued_up.remove(self.uid)
+                    forget_engine(self.uid, 'up')
                 await start_from_queued()
                 return
         else:
@@ -585,6 +552,7 @@ class MirrorLeechListener:
                 async with queue_dict_lock:
                     if self.uid in non_queued_up:
                         non_queued_up.remove(self.uid)
+                    forget_engine(self.uid, 'up')
                 await start_from_queued()
                 return
         
@@ -604,6 +572,7 @@ class MirrorLeechListener:
         async with queue_dict_lock:
             if self.uid in non_queued_up:
                 non_queued_up.remove(self.uid)
+            forget_engine(self.uid, 'up')
 
         await start_from_queued()
         await delete_links(self.message)
@@ -632,6 +601,7 @@ class MirrorLeechListener:
         if self.isSuperGroup and config_dict['INCOMPLETE_TASK_NOTIFIER'] and DATABASE_URL:
             await DbManger().rm_complete_task(self.message.link)
 
+        disk_ledger.release(self.uid)
         async with queue_dict_lock:
             if self.uid in queued_dl:
                 queued_dl[self.uid].set()
@@ -643,6 +613,7 @@ class MirrorLeechListener:
                 non_queued_dl.remove(self.uid)
             if self.uid in non_queued_up:
                 non_queued_up.remove(self.uid)
+            forget_engine(self.uid)
 
         await start_from_queued()
         await sleep(3)
@@ -670,6 +641,7 @@ class MirrorLeechListener:
         if self.isSuperGroup and config_dict['INCOMPLETE_TASK_NOTIFIER'] and DATABASE_URL:
             await DbManger().rm_complete_task(self.message.link)
 
+        disk_ledger.release(self.uid)
         async with queue_dict_lock:
             if self.uid in queued_dl:
                 queued_dl[self.uid].set()
@@ -681,6 +653,7 @@ class MirrorLeechListener:
                 non_queued_dl.remove(self.uid)
             if self.uid in non_queued_up:
                 non_queued_up.remove(self.uid)
+            forget_engine(self.uid)
 
         await start_from_queued()
         await sleep(3)
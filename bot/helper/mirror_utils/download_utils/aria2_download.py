@@ -22,7 +22,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
         a2c_opt['seed-time'] = seed_time
     if TORRENT_TIMEOUT := config_dict['TORRENT_TIMEOUT']:
         a2c_opt['bt-stop-timeout'] = f'{TORRENT_TIMEOUT}'
-    added_to_queue, event = await is_queued(listener.uid)
+    added_to_queue, event = await is_queued(listener.uid, 'aria2')
     if added_to_queue:
         if link.startswith('magnet:'):
             a2c_opt['pause-metadata'] = 'true'
@@ -76,6 +76,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
             download = download_dict[listener.uid]
             download.queued = False
             new_gid = download.gid()
+            download_dict.reindex(listener.uid, gid=new_gid)
 
         await sync_to_async(aria2.client.unpause, new_gid)
         LOGGER.info(f'Start Queued Download from Aria2c: {name}. Gid: {gid}')
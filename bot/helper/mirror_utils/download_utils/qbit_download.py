@@ -39,7 +39,7 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
         if await aiopath.exists(link):
             url = None
             tpath = link
-        added_to_queue, event = await is_queued(listener.uid)
+        added_to_queue, event = await is_queued(listener.uid, 'qbit')
         op = await sync_to_async(client.torrents_add, url, tpath, path, is_paused=added_to_queue, tags=f'{listener.uid}',
                                  ratio_limit=ratio, seeding_time_limit=seed_time, headers={'user-agent': 'Wget/1.12'})
         if op.lower() == "ok.":
@@ -109,6 +109,7 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
                 if listener.uid not in download_dict:
                     return
                 download_dict[listener.uid].queued = False
+                download_dict.reindex(listener.uid)
 
             await sync_to_async(client.torrents_resume, torrent_hashes=ext_hash)
             LOGGER.info(
@@ -11,10 +11,31 @@ from logging import getLogger
 from bot import config_dict, GLOBAL_EXTENSION_FILTER, bot_cache
 from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async
 from bot.helper.ext_utils.fs_utils import get_mime_type, count_files_and_folders
+from bot.helper.ext_utils.user_files import user_files
 
 
 LOGGER = getLogger(__name__)
 
+SIZE_UNITS = ['B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB']
+ETA_UNITS = {'w': 604800, 'd': 86400, 'h': 3600, 'm': 60, 's': 1}
+
+
+def size_to_bytes(size):
+    try:
+        value, unit = re_findall(r'([\d.]+)\s*(\w+)', size)[0]
+        unit = unit.replace('/s', '')
+        if unit in ['Bytes', 'Byte']:
+            unit = 'B'
+        return float(value) * 1024**SIZE_UNITS.index(unit)
+    except (IndexError, ValueError):
+        return 0
+
+
+def eta_to_seconds(eta):
+    if seconds := sum(int(value) * ETA_UNITS[unit] for value, unit in re_findall(r'(\d+)([wdhms])', eta)):
+        return seconds
+    return None
+
 
 class RcloneTransferHelper:
     def __init__(self, listener=None, name=''):
@@ -25,6 +46,10 @@ class RcloneTransferHelper:
         self.__percentage = '0%'
         self.__speed = '0 B/s'
         self.__size = '0 B'
+        self.__transferred_bytes = 0
+        self.__size_bytes = 0
+        self.__speed_bytes = 0
+        self.__eta_seconds = None
         self.__is_cancelled = False
         self.__is_download = False
         self.__is_upload = False
@@ -53,6 +78,22 @@ class RcloneTransferHelper:
     def size(self):
         return self.__size
 
+    @property
+    def transferred_bytes(self):
+        return self.__transferred_bytes
+
+    @property
+    def size_bytes(self):
+        return self.__size_bytes
+
+    @property
+    def speed_bytes(self):
+        return self.__speed_bytes
+
+    @property
+    def eta_seconds(self):
+        return self.__eta_seconds
+
     async def __progress(self):
         while not (self.__proc is None or self.__is_cancelled):
             try:
@@ -64,6 +105,10 @@ class RcloneTransferHelper:
             if data := re_findall(r'Transferred:\s+([\d.]+\s*\w+)\s+/\s+([\d.]+\s*\w+),\s+([\d.]+%)\s*,\s+([\d.]+\s*\w+/s),\s+ETA\s+([\dwdhms]+)', data):
                 self.__transferred_size, self.__size, self.__percentage, self.__speed, self.__eta = data[
                     0]
+                self.__transferred_bytes = size_to_bytes(self.__transferred_size)
+                self.__size_bytes = size_to_bytes(self.__size)
+                self.__speed_bytes = size_to_bytes(self.__speed)
+                self.__eta_seconds = eta_to_seconds(self.__eta)
 
     def __switchServiceAccount(self):
         if self.__sa_index == self.__sa_number - 1:
@@ -216,7 +261,7 @@ class RcloneTransferHelper:
         rc_path = self.__listener.upPath.strip('/')
         if rc_path.startswith('mrcc:'):
             rc_path = rc_path.split('mrcc:', 1)[1]
-            oconfig_path = f'wcl/{self.__listener.message.from_user.id}.conf'
+            oconfig_path = await user_files.materialize(self.__listener.message.from_user.id, 'rclone') or f'wcl/{self.__listener.message.from_user.id}.conf'
         else:
             oconfig_path = 'wcl.conf'
 
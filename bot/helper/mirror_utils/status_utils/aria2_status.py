@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 from time import time
 
-from bot import aria2, LOGGER
-from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, get_readable_time, sync_to_async
+from bot import aria2, download_dict, LOGGER
+from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, ProgressRecord, get_readable_time, sync_to_async
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
 
 
 def get_download(gid):
@@ -26,13 +27,14 @@ class Aria2Status:
         self.message = self.__listener.message
 
     def __update(self):
-        if self.__download is None:
-            self.__download = get_download(self.__gid)
-        else:
-            self.__download = self.__download.live
+        if (download := engine_snapshot.aria2(self.__gid)) is None:
+            download = get_download(self.__gid)
+        if download is not None:
+            self.__download = download
         if self.__download.followed_by_ids:
             self.__gid = self.__download.followed_by_ids[0]
-            self.__download = get_download(self.__gid)
+            self.__download = engine_snapshot.aria2(self.__gid) or get_download(self.__gid)
+            download_dict.reindex(self.__listener.uid, gid=self.__gid)
 
     def progress(self):
         return self.__download.progress_string()
@@ -69,6 +71,13 @@ class Aria2Status:
         else:
             return MirrorStatus.STATUS_DOWNLOADING
 
+    def progress_record(self):
+        state = self.status()
+        download = self.__download
+        if state == MirrorStatus.STATUS_SEEDING:
+            return ProgressRecord.build(download.completed_length, download.total_length, download.upload_speed, state, 0)
+        return ProgressRecord.build(download.completed_length, download.total_length, download.download_speed, state)
+
     def seeders_num(self):
         return self.__download.num_seeders
 
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from bot.helper.ext_utils.bot_utils import MirrorStatus, get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.bot_utils import MirrorStatus, ProgressRecord, get_readable_file_size, get_readable_time
 
 class DDLStatus:
     def __init__(self, obj, size, message, gid, upload_details):
@@ -38,6 +38,9 @@ class DDLStatus:
         except:
             return '-'
 
+    def progress_record(self):
+        return ProgressRecord.build(self.__obj.processed_bytes, self.__size, self.__obj.speed, self.status())
+
     def gid(self) -> str:
         return self.__gid
 
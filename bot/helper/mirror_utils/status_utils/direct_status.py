@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from bot.helper.ext_utils.bot_utils import (EngineStatus, MirrorStatus,
+                                            ProgressRecord,
                                             get_readable_file_size,
                                             get_readable_time)
 
@@ -47,6 +48,9 @@ class DirectStatus:
             return MirrorStatus.STATUS_QUEUEDL
         return MirrorStatus.STATUS_DOWNLOADING
 
+    def progress_record(self):
+        return ProgressRecord.build(self.__obj.processed_bytes, self.__obj.total_size, self.__obj.speed, self.status())
+
     def processed_bytes(self):
         return get_readable_file_size(self.__obj.processed_bytes)
 
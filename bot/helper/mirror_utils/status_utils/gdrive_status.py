@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, ProgressRecord, get_readable_file_size, get_readable_time
 
 
 class GdriveStatus:
@@ -51,6 +51,9 @@ class GdriveStatus:
         except:
             return '-'
 
+    def progress_record(self):
+        return ProgressRecord.build(self.__obj.processed_bytes, self.__size, self.__obj.speed, self.status())
+
     def download(self):
         return self.__obj
 
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus, get_readable_time
+from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus, ProgressRecord, get_readable_time
 
 
 class MegaDownloadStatus:
@@ -44,6 +44,9 @@ class MegaDownloadStatus:
     def speed(self):
         return f'{get_readable_file_size(self.__obj.speed)}/s'
 
+    def progress_record(self):
+        return ProgressRecord.build(self.__obj.downloaded_bytes, self.__size, self.__obj.speed, self.status())
+
     def gid(self):
         return self.__gid
 
@@ -2,7 +2,8 @@
 from asyncio import sleep
 
 from bot import LOGGER, get_client, QbTorrents, qb_listener_lock
-from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, get_readable_file_size, get_readable_time, sync_to_async
+from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, ProgressRecord, get_readable_file_size, get_readable_time, sync_to_async
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
 
 
 def get_download(client, tag):
@@ -26,7 +27,8 @@ class QbittorrentStatus:
         self.message = listener.message
 
     def __update(self):
-        new_info = get_download(self.__client, f'{self.__listener.uid}')
+        if (new_info := engine_snapshot.qbit(f'{self.__listener.uid}')) is None:
+            new_info = get_download(self.__client, f'{self.__listener.uid}')
         if new_info is not None:
             self.__info = new_info
 
@@ -67,6 +69,14 @@ class QbittorrentStatus:
         else:
             return MirrorStatus.STATUS_DOWNLOADING
 
+    def progress_record(self):
+        state = self.status()
+        info = self.__info
+        if state == MirrorStatus.STATUS_SEEDING:
+            return ProgressRecord.build(info.downloaded, info.size, info.upspeed, state, 0)
+        eta = info.eta if 0 <= info.eta < 8640000 else None
+        return ProgressRecord.build(info.downloaded, info.size, info.dlspeed, state, eta)
+
     def seeders_num(self):
         return self.__info.num_seeds
 
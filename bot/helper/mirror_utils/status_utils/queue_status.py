@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from bot import LOGGER
-from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus
+from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus, ProgressRecord
+from bot.helper.ext_utils.task_scheduler import queue_estimator
 
 
 class QueueStatus:
@@ -22,6 +23,12 @@ class QueueStatus:
     def size(self):
         return get_readable_file_size(self.__size)
 
+    def size_raw(self):
+        return self.__size
+
+    def queue_position(self):
+        return queue_estimator.estimate(self.__listener.uid, 'dl' if self.__status == 'dl' else 'up')
+
     def status(self):
         if self.__status == 'dl':
             return MirrorStatus.STATUS_QUEUEDL
@@ -39,6 +46,9 @@ class QueueStatus:
     def eta(self):
         return '-'
 
+    def progress_record(self):
+        return ProgressRecord.build(0, self.__size, 0, self.status())
+
     def download(self):
         return self
 
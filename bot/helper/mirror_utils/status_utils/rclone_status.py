@@ -1,4 +1,4 @@
-from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus
+from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, ProgressRecord
 
 
 class RcloneStatus:
@@ -38,6 +38,10 @@ class RcloneStatus:
     def processed_bytes(self):
         return self.__obj.transferred_size
 
+    def progress_record(self):
+        return ProgressRecord.build(self.__obj.transferred_bytes, self.__obj.size_bytes,
+                                    self.__obj.speed_bytes, self.status(), self.__obj.eta_seconds)
+
     def download(self):
         return self.__obj
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from bot import LOGGER
-from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus
+from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus, ProgressRecord
 
 
 class SplitStatus:
@@ -36,6 +36,9 @@ class SplitStatus:
     def processed_bytes(self):
         return 0
 
+    def progress_record(self):
+        return ProgressRecord.build(0, self.__size, 0, self.status())
+
     def download(self):
         return self
 
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, get_readable_file_size, get_readable_time, async_to_sync
+from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, ProgressRecord, get_readable_file_size, get_readable_time, async_to_sync
 from bot.helper.ext_utils.fs_utils import get_path_size
 
 
@@ -48,6 +48,10 @@ class YtDlpDownloadStatus:
         except:
             return '-'
 
+    def progress_record(self):
+        eta = self.__obj.eta if self.__obj.eta != '-' else None
+        return ProgressRecord.build(self.processed_raw(), self.__obj.size, self.__obj.download_speed, self.status(), eta)
+
     def download(self):
         return self.__obj
 
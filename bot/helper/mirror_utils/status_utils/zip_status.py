@@ -2,7 +2,7 @@
 from time import time
 
 from bot import LOGGER
-from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus, get_readable_time, async_to_sync
+from bot.helper.ext_utils.bot_utils import EngineStatus, get_readable_file_size, MirrorStatus, ProgressRecord, get_readable_time, async_to_sync
 from bot.helper.ext_utils.fs_utils import get_path_size
 
 
@@ -51,6 +51,10 @@ class ZipStatus:
     def status(self):
         return MirrorStatus.STATUS_ARCHIVING
 
+    def progress_record(self):
+        processed = self.processed_raw()
+        return ProgressRecord.build(processed, self.__size, processed / (time() - self.__start_time), self.status())
+
     def processed_raw(self):
         if self.__listener.newDir:
             return async_to_sync(get_path_size, self.__listener.newDir)
@@ -1,35 +1,73 @@
 #!/usr/bin/env python3
 from traceback import format_exc
 from logging import getLogger, ERROR
-from aiofiles.os import remove as aioremove, path as aiopath, rename as aiorename, makedirs, rmdir, mkdir
+from aiofiles.os import remove as aioremove, path as aiopath, rename as aiorename, makedirs, rmdir
 from os import walk, path as ospath
 from time import time
 from PIL import Image
+from pyrogram import raw
+from pyrogram.file_id import FileId, FileType
 from pyrogram.types import InputMediaVideo, InputMediaDocument, InlineKeyboardMarkup
 from pyrogram.errors import FloodWait, RPCError, PeerIdInvalid, ChannelInvalid
-from asyncio import sleep
+from asyncio import sleep, Semaphore, Queue
 from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type, RetryError
 from re import match as re_match, sub as re_sub
 from natsort import natsorted
 from aioshutil import copy
 
-from bot import config_dict, user_data, GLOBAL_EXTENSION_FILTER, bot, user, IS_PREMIUM_USER
+from bot import config_dict, user_data, GLOBAL_EXTENSION_FILTER, bot, user, IS_PREMIUM_USER, bot_loop, MAX_SPLIT_SIZE
 from bot.helper.themes import BotTheme
 from bot.helper.telegram_helper.button_build import ButtonMaker
-from bot.helper.telegram_helper.message_utils import sendCustomMsg, editReplyMarkup, sendMultiMessage, chat_info, deleteMessage, get_tg_link_content
+from bot.helper.telegram_helper.message_utils import sendCustomMsg, editReplyMarkup, sendMultiMessage, chat_info, deleteMessage
 from bot.helper.ext_utils.fs_utils import clean_unwanted, is_archive, get_base_name
-from bot.helper.ext_utils.bot_utils import get_readable_file_size, is_telegram_link, is_url, sync_to_async, download_image_url
-from bot.helper.ext_utils.leech_utils import get_audio_thumb, get_media_info, get_document_type, take_ss, get_ss, get_mediainfo_link, format_filename
+from bot.helper.ext_utils.bot_utils import get_readable_file_size, sync_to_async
+from bot.helper.ext_utils.leech_utils import get_audio_thumb, get_media_info, get_document_type, take_ss, get_ss, get_mediainfo_link, format_filename, split_file, FilePart
+from bot.helper.ext_utils.user_files import user_files
+from bot.helper.ext_utils.thumb_cache import thumb_cache
 
 LOGGER = getLogger(__name__)
 getLogger("pyrogram").setLevel(ERROR)
 
+chat_slots = {}
+
+
+def chat_slot(chat_id):
+    key = (chat_id, max(config_dict['LEECH_CHAT_CONCURRENCY'], 1))
+    if key not in chat_slots:
+        for stale in [k for k in chat_slots if k[0] == chat_id]:
+            del chat_slots[stale]
+        chat_slots[key] = Semaphore(key[1])
+    return chat_slots[key]
+
+
+class LeechFile:
+    def __init__(self, dirpath, file_, size, part=None):
+        self.dirpath = dirpath
+        self.part = part
+        self.file_ = file_
+        self.up_path = ospath.join(dirpath, file_)
+        self.size = size
+        self.prm_media = size > 2097152000
+        self.client = bot
+        self.cap_mono = ''
+        self.key = ''
+        self.is_video = self.is_audio = self.is_image = False
+        self.thumb = None
+        self.duration = 0
+        self.width = 480
+        self.height = 320
+        self.artist = None
+        self.title = None
+        self.buttons = None
+        self.file_id = None
+        self.last_uploaded = 0
+        self.staged = None
+
 
 class TgUploader:
 
     def __init__(self, name=None, path=None, listener=None):
         self.name = name
-        self.__last_uploaded = 0
         self.__processed_bytes = 0
         self.__listener = listener
         self.__path = path
@@ -45,9 +83,6 @@ class TgUploader:
         self.__is_corrupted = False
         self.__media_dict = {'videos': {}, 'documents': {}}
         self.__last_msg_in_group = False
-        self.__prm_media = False
-        self.__client = bot
-        self.__up_path = ''
         self.__mediainfo = False
         self.__as_doc = False
         self.__media_group = False
@@ -56,33 +91,15 @@ class TgUploader:
         self.__user_id = listener.message.from_user.id
         self.__leechmsg = {}
         self.__leech_utils = self.__listener.leech_utils
+        self.__split_size = 0
+        self.__failed_thumbs = set()
         
     async def get_custom_thumb(self, thumb):
-        if is_telegram_link(thumb):
-            try:
-                msg, client = await get_tg_link_content(thumb, self.__user_id )
-            except Exception as e:
-                LOGGER.error(f"Thumb Access Error: {e}")
-                return None
-            if msg and not msg.photo:
-                LOGGER.error("Thumb TgLink Invalid: Provide Link to Photo Only !")
-                return None
-            _client = bot if client == 'bot' else user
-            photo_dir = await _client.download_media(msg)
-        elif is_url(thumb):
-            photo_dir = await download_image_url(thumb)
-        else:
-            LOGGER.error("Custom Thumb Invalid")
+        if thumb in self.__failed_thumbs:
             return None
-        if await aiopath.exists(photo_dir):
-            path = "Thumbnails"
-            if not await aiopath.isdir(path):
-                await mkdir(path)
-            des_dir = ospath.join(path, f'{time()}.jpg')
-            await sync_to_async(Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG")
-            await aioremove(photo_dir)
-            return des_dir
-        return None
+        if (path := await thumb_cache.get(thumb, self.__user_id)) is None:
+            self.__failed_thumbs.add(thumb)
+        return path
 
     async def __buttons(self, up_path, is_video=False):
         buttons = ButtonMaker()
@@ -92,7 +109,7 @@ class TgUploader:
         except Exception as e:
             LOGGER.error(f"ScreenShots Error: {e}")
         try:
-            if self.__mediainfo:
+            if self.__mediainfo and await aiopath.exists(up_path):
                 buttons.ubutton(BotTheme('MEDIAINFO_LINK'), await get_mediainfo_link(up_path))
         except Exception as e:
             LOGGER.error(f"MediaInfo Error: {e}")
@@ -158,13 +175,13 @@ class TgUploader:
                 LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
 
 
-    async def __upload_progress(self, current, total):
+    async def __upload_progress(self, current, total, item):
         if self.__is_cancelled:
             if IS_PREMIUM_USER:
                 user.stop_transmission()
             bot.stop_transmission()
-        chunk_size = current - self.__last_uploaded
-        self.__last_uploaded = current
+        chunk_size = current - item.last_uploaded
+        item.last_uploaded = current
         self.__processed_bytes += chunk_size
 
     async def __user_settings(self):
@@ -175,7 +192,7 @@ class TgUploader:
         self.__mediainfo = user_dict.get('mediainfo') or (config_dict['SHOW_MEDIAINFO'] if 'mediainfo' not in user_dict else False)
         self.__upload_dest = ud if (ud:=self.__listener.upPath) and isinstance(ud, list) else [ud]
         self.__has_buttons = bool(config_dict['SAVE_MSG'] or self.__mediainfo or self.__leech_utils['screenshots'])
-        if not await aiopath.exists(self.__thumb):
+        if not await user_files.materialize(self.__user_id, 'thumb'):
             self.__thumb = None
 
     async def __msg_to_reply(self):
@@ -197,21 +214,28 @@ class TgUploader:
             self.__sent_msg = self.__listener.message
         return True
 
-    async def __prepare_file(self, prefile_, dirpath):
+    async def __rename(self, item, dirpath, name):
+        if item.part is not None:
+            item.part.name = name
+            item.up_path = ospath.join(dirpath, name)
+        elif self.__listener.seed and not self.__listener.newDir and not dirpath.endswith("/splited_files_mltb") \
+                and '/copied_mltb/' not in item.up_path:
+            dirpath = f'{dirpath}/copied_mltb'
+            await makedirs(dirpath, exist_ok=True)
+            item.up_path = await copy(item.up_path, ospath.join(dirpath, name))
+        else:
+            new_path = ospath.join(ospath.dirname(item.up_path), name)
+            await aiorename(item.up_path, new_path)
+            item.up_path = new_path
+
+    async def __prepare_file(self, item):
         try:
-            file_, cap_mono = await format_filename(prefile_, self.__user_id, dirpath)
+            file_, item.cap_mono = await format_filename(item.file_, self.__user_id, item.dirpath, part=item.part)
         except Exception as err:
-            return await self.__listener.onUploadError(f'Error in Format Filename : {err}')
-        if prefile_ != file_:
-            if self.__listener.seed and not self.__listener.newDir and not dirpath.endswith("/splited_files_mltb"):
-                dirpath = f'{dirpath}/copied_mltb'
-                await makedirs(dirpath, exist_ok=True)
-                new_path = ospath.join(dirpath, file_)
-                self.__up_path = await copy(self.__up_path, new_path)
-            else:
-                new_path = ospath.join(dirpath, file_)
-                await aiorename(self.__up_path, new_path)
-                self.__up_path = new_path
+            await self.__listener.onUploadError(f'Error in Format Filename : {err}')
+            return False
+        if item.file_ != file_:
+            await self.__rename(item, item.dirpath, file_)
         if len(file_) > 64:
             if is_archive(file_):
                 name = get_base_name(file_)
@@ -228,16 +252,9 @@ class TgUploader:
             extn = len(ext)
             remain = 64 - extn
             name = name[:remain]
-            if self.__listener.seed and not self.__listener.newDir and not dirpath.endswith("/splited_files_mltb"):
-                dirpath = f'{dirpath}/copied_mltb'
-                await makedirs(dirpath, exist_ok=True)
-                new_path = ospath.join(dirpath, f"{name}{ext}")
-                self.__up_path = await copy(self.__up_path, new_path)
-            else:
-                new_path = ospath.join(dirpath, f"{name}{ext}")
-                await aiorename(self.__up_path, new_path)
-                self.__up_path = new_path
-        return cap_mono, file_
+            await self.__rename(item, item.dirpath, f"{name}{ext}")
+        item.file_ = file_
+        return True
 
     def __get_input_media(self, subkey, key):
         rlist = []
@@ -251,10 +268,6 @@ class TgUploader:
             rlist.append(input_media)
         return rlist
 
-    async def __switching_client(self):
-        LOGGER.info(f'Uploading Media {">" if self.__prm_media else "<"} 2GB by {"User" if self.__prm_media else "Bot"} Client')
-        self.__client = user if (self.__prm_media and IS_PREMIUM_USER) else bot
-
     async def __send_media_group(self, subkey, key, msgs):
         msgs_list = await msgs[0].reply_to_message.reply_media_group(media=self.__get_input_media(subkey, key),
                                                                     quote=True, disable_notification=True)
@@ -286,66 +299,261 @@ class TgUploader:
             if not self.__is_cancelled:
                 LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
 
-    async def upload(self, o_files, m_size, size):
+    async def __stage_thumb(self, item):
+        thumb = self.__thumb if self.__thumb is not None and await aiopath.exists(self.__thumb) else None
+        if self.__leech_utils['thumb']:
+            thumb = await self.get_custom_thumb(self.__leech_utils['thumb'])
+        if not item.is_image and thumb is None:
+            file_name = ospath.splitext(item.file_)[0]
+            thumb_path = f"{self.__path}/yt-dlp-thumb/{file_name}.jpg"
+            if await aiopath.isfile(thumb_path):
+                thumb = thumb_path
+            elif item.is_audio and not item.is_video:
+                thumb = await get_audio_thumb(item.up_path)
+        item.thumb = thumb
+
+    async def __stage_media(self, item, force_document=False):
+        if self.__as_doc or force_document or (not item.is_video and not item.is_audio and not item.is_image):
+            item.key = 'documents'
+            if item.is_video and item.thumb is None:
+                item.thumb = await take_ss(item.up_path, None)
+        elif item.is_video:
+            item.key = 'videos'
+            item.duration = (await get_media_info(item.up_path))[0]
+            if item.thumb is None:
+                item.thumb = await take_ss(item.up_path, item.duration)
+            if item.thumb is not None:
+                with Image.open(item.thumb) as img:
+                    item.width, item.height = img.size
+            if not item.up_path.upper().endswith(("MKV", "MP4")):
+                dirpath, file_ = item.up_path.rsplit('/', 1)
+                if self.__listener.seed and not self.__listener.newDir and not dirpath.endswith("/splited_files_mltb"):
+                    dirpath = f"{dirpath}/copied_mltb"
+                    await makedirs(dirpath, exist_ok=True)
+                    new_path = ospath.join(
+                        dirpath, f"{ospath.splitext(file_)[0]}.mp4")
+                    item.up_path = await copy(item.up_path, new_path)
+                else:
+                    new_path = f"{ospath.splitext(item.up_path)[0]}.mp4"
+                    await aiorename(item.up_path, new_path)
+                    item.up_path = new_path
+        elif item.is_audio:
+            item.key = 'audios'
+            item.duration, item.artist, item.title = await get_media_info(item.up_path)
+        else:
+            item.key = 'photos'
+        item.buttons = await self.__buttons(item.up_path, item.is_video)
+
+    async def __preupload(self, item):
+        item.file_id = None
+        if item.key == 'photos' or self.__is_cancelled:
+            return
+        client = item.client
+        try:
+            async with chat_slot(self.__sent_msg.chat.id):
+                file = await client.save_file(item.part or item.up_path, progress=self.__upload_progress, progress_args=(item,))
+                thumb = await client.save_file(item.thumb) if item.thumb else None
+            if file is None or self.__is_cancelled:
+                return
+            attributes = [raw.types.DocumentAttributeFilename(file_name=ospath.basename(item.up_path))]
+            if item.key == 'videos':
+                file_type, mime_type = FileType.VIDEO, 'video/mp4'
+                attributes.append(raw.types.DocumentAttributeVideo(supports_streaming=True, duration=item.duration,
+                                                                   w=item.width, h=item.height))
+            elif item.key == 'audios':
+                file_type, mime_type = FileType.AUDIO, 'audio/mpeg'
+                attributes.append(raw.types.DocumentAttributeAudio(duration=item.duration, performer=item.artist,
+                                                                   title=item.title))
+            else:
+                file_type, mime_type = FileType.DOCUMENT, 'application/zip'
+            media = await client.invoke(raw.functions.messages.UploadMedia(
+                peer=await client.resolve_peer(self.__sent_msg.chat.id),
+                media=raw.types.InputMediaUploadedDocument(file=file, thumb=thumb,
+                                                           mime_type=client.guess_mime_type(item.up_path) or mime_type,
+                                                           attributes=attributes,
+                                                           force_file=True if item.key == 'documents' else None)))
+            document = media.document
+            item.file_id = FileId(file_type=file_type, dc_id=document.dc_id, media_id=document.id,
+                                  access_hash=document.access_hash, file_reference=document.file_reference).encode()
+        except Exception as e:
+            if not self.__is_cancelled:
+                LOGGER.warning(f"Pre-upload failed, sending from path: {e}. Path: {item.up_path}")
+        finally:
+            if item.file_id is None:
+                self.__processed_bytes -= item.last_uploaded
+            item.last_uploaded = 0
+
+    async def __stage_file(self, item, slots):
+        async with slots:
+            if self.__is_cancelled:
+                return False
+            try:
+                if not await self.__prepare_file(item):
+                    return False
+            except Exception:
+                LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+                return False
+            if item.prm_media and IS_PREMIUM_USER:
+                item.client = user
+            LOGGER.info(f'Uploading Media {">" if item.prm_media else "<"} 2GB by {"User" if item.client == user else "Bot"} Client')
+            try:
+                if item.part is None:
+                    item.is_video, item.is_audio, item.is_image = await get_document_type(item.up_path)
+                await self.__stage_thumb(item)
+                await self.__stage_media(item)
+                await self.__preupload(item)
+            except Exception:
+                item.key = ''
+                if not self.__is_cancelled:
+                    LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+            return True
+
+    async def __clean_file(self, item):
+        if item.part is not None:
+            item.part.release()
+        if not self.__is_cancelled and await aiopath.exists(item.up_path) and \
+            (not self.__listener.seed or self.__listener.newDir or
+             item.dirpath.endswith("/splited_files_mltb") or '/copied_mltb/' in item.up_path):
+            await aioremove(item.up_path)
+        if item.thumb is not None and item.thumb != self.__thumb and not thumb_cache.owns(item.thumb) and await aiopath.exists(item.thumb):
+            await aioremove(item.thumb)
+            if (dir_name := ospath.dirname(item.thumb)) and dir_name != "Thumbnails":
+                try:
+                    await rmdir(dir_name)
+                except OSError:
+                    pass
+
+    def __kill_split(self):
+        if self.__listener.suproc not in [None, 'cancelled'] and self.__listener.suproc.returncode is None:
+            self.__listener.suproc.kill()
+
+    async def __split(self, item, parts):
+        try:
+            res = await split_file(item.up_path, item.size, item.file_, item.dirpath, self.__split_size, self.__listener, part_queue=parts)
+        except Exception:
+            LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+            res = "errored"
+        await parts.put(None)
+        return res
+
+    async def __leech_files(self, items):
+        for item in items:
+            if not self.__split_size or item.size <= self.__split_size:
+                yield item
+                continue
+            LOGGER.info(f"Splitting: {item.up_path}")
+            parts = Queue(maxsize=1)
+            splitter = bot_loop.create_task(self.__split(item, parts))
+            try:
+                while (part := await parts.get()) is not None:
+                    self.__total_files += 1
+                    if isinstance(part, FilePart):
+                        yield LeechFile(item.dirpath, part.name, part.length, part)
+                        continue
+                    dirpath, file_ = part.rsplit('/', 1)
+                    yield LeechFile(dirpath, file_, await aiopath.getsize(part))
+                res = await splitter
+            finally:
+                if not splitter.done():
+                    splitter.cancel()
+                    self.__kill_split()
+            if not res:
+                self.__is_cancelled = True
+                return
+            if res == "errored":
+                if item.size <= MAX_SPLIT_SIZE:
+                    self.__total_files += 1
+                    yield item
+                    continue
+                await aioremove(item.up_path)
+            elif not self.__listener.seed or self.__listener.newDir:
+                await aioremove(item.up_path)
+
+    async def __feed(self, items, staged, slots):
+        try:
+            async for item in self.__leech_files(items):
+                if self.__is_cancelled:
+                    break
+                await staged.put(item)
+                item.staged = bot_loop.create_task(self.__stage_file(item, slots))
+        except Exception:
+            LOGGER.error(format_exc())
+        await staged.put(None)
+
+    async def upload(self, size, split_size=0):
         await self.__user_settings()
         res = await self.__msg_to_reply()
         if not res:
             return
-        isDeleted = False
+        self.__split_size = split_size
+        items = []
         for dirpath, _, files in sorted(await sync_to_async(walk, self.__path)):
             if dirpath.endswith('/yt-dlp-thumb'):
                 continue
             for file_ in natsorted(files):
-                self.__up_path = ospath.join(dirpath, file_)
+                up_path = ospath.join(dirpath, file_)
                 if file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                    await aioremove(self.__up_path)
+                    await aioremove(up_path)
                     continue
                 try:
-                    f_size = await aiopath.getsize(self.__up_path)
-                    if self.__listener.seed and file_ in o_files and f_size in m_size:
-                        continue
+                    f_size = await aiopath.getsize(up_path)
+                except Exception:
+                    LOGGER.error(f"{format_exc()}. Path: {up_path}")
+                    continue
+                if f_size == 0:
+                    LOGGER.error(f"{up_path} size is zero, telegram don't upload zero size files")
+                    self.__total_files += 1
+                    self.__corrupted += 1
+                    continue
+                if not split_size or f_size <= split_size:
                     self.__total_files += 1
-                    if f_size == 0:
-                        LOGGER.error(f"{self.__up_path} size is zero, telegram don't upload zero size files")
-                        self.__corrupted += 1
+                items.append(LeechFile(dirpath, file_, f_size))
+        ahead = max(config_dict['LEECH_CONCURRENCY'], 1)
+        slots = Semaphore(ahead)
+        staged = Queue(maxsize=ahead)
+        feeder = bot_loop.create_task(self.__feed(items, staged, slots))
+        isDeleted = False
+        try:
+            while (item := await staged.get()) is not None:
+                if self.__is_cancelled:
+                    return
+                try:
+                    if not await item.staged:
                         continue
-                    if self.__is_cancelled:
-                        return
-                    self.__prm_media = True if f_size > 2097152000 else False
-                    cap_mono, file_ = await self.__prepare_file(file_, dirpath)
                     if self.__last_msg_in_group:
                         group_lists = [x for v in self.__media_dict.values()
                                        for x in v.keys()]
-                        if (match := re_match(r'.+(?=\.0*\d+$)|.+(?=\.part\d+\..+)', self.__up_path)) and match.group(0) not in group_lists:
+                        if (match := re_match(r'.+(?=\.0*\d+$)|.+(?=\.part\d+\..+)', item.up_path)) and match.group(0) not in group_lists:
                             for key, value in list(self.__media_dict.items()):
                                 for subkey, msgs in list(value.items()):
                                     if len(msgs) > 1:
                                         await self.__send_media_group(subkey, key, msgs)
                     self.__last_msg_in_group = False
-                    self.__last_uploaded = 0
-                    await self.__switching_client()
-                    await self.__upload_file(cap_mono, file_)
+                    await self.__upload_file(item)
                     if self.__leechmsg and not isDeleted and config_dict['CLEAN_LOG_MSG']:
                         await deleteMessage(list(self.__leechmsg.values())[0])
                         isDeleted = True
                     if self.__is_cancelled:
                         return
                     if not self.__is_corrupted and (self.__listener.isSuperGroup or config_dict['LEECH_LOG_ID']):
-                        self.__msgs_dict[self.__sent_msg.link] = file_
-                    await sleep(1)
+                        self.__msgs_dict[self.__sent_msg.link] = item.file_
                 except Exception as err:
                     if isinstance(err, RetryError):
                         LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
                     else:
-                        LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
+                        LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
                     if self.__is_cancelled:
                         return
                     continue
                 finally:
-                    if not self.__is_cancelled and await aiopath.exists(self.__up_path) and \
-                        (not self.__listener.seed or self.__listener.newDir or
-                         dirpath.endswith("/splited_files_mltb") or '/copied_mltb/' in self.__up_path):
-                        await aioremove(self.__up_path)
+                    await self.__clean_file(item)
+        finally:
+            feeder.cancel()
+            while not staged.empty():
+                if (item := staged.get_nowait()) is not None:
+                    item.staged.cancel()
+                    if item.part is not None:
+                        item.part.release()
         for key, value in list(self.__media_dict.items()):
             for subkey, msgs in list(value.items()):
                 if len(msgs) > 1:
@@ -368,127 +576,78 @@ class TgUploader:
 
     @retry(wait=wait_exponential(multiplier=2, min=4, max=8), stop=stop_after_attempt(3),
            retry=retry_if_exception_type(Exception))
-    async def __upload_file(self, cap_mono, file, force_document=False):
-        if self.__thumb is not None and not await aiopath.exists(self.__thumb):
-            self.__thumb = None
-        thumb = self.__thumb
+    async def __upload_file(self, item, force_document=False):
         self.__is_corrupted = False
         try:
-            is_video, is_audio, is_image = await get_document_type(self.__up_path)
-
-            if self.__leech_utils['thumb']:
-                thumb = await self.get_custom_thumb(self.__leech_utils['thumb'])
-            
-            if not is_image and thumb is None:
-                file_name = ospath.splitext(file)[0]
-                thumb_path = f"{self.__path}/yt-dlp-thumb/{file_name}.jpg"
-                if await aiopath.isfile(thumb_path):
-                    thumb = thumb_path
-                elif is_audio and not is_video:
-                    thumb = await get_audio_thumb(self.__up_path)
-
-            if self.__as_doc or force_document or (not is_video and not is_audio and not is_image):
-                key = 'documents'
-                if is_video and thumb is None:
-                    thumb = await take_ss(self.__up_path, None)
-                if self.__is_cancelled:
-                    return
-                buttons = await self.__buttons(self.__up_path, is_video)
-                nrml_media = await self.__client.send_document(chat_id=self.__sent_msg.chat.id,
-                                                                       reply_to_message_id=self.__sent_msg.id,
-                                                                       document=self.__up_path,
-                                                                       thumb=thumb,
-                                                                       caption=cap_mono,
-                                                                       force_document=True,
-                                                                       disable_notification=True,
-                                                                       progress=self.__upload_progress,
-                                                                       reply_markup=buttons)
-                
-                if self.__prm_media and (self.__has_buttons or not self.__leechmsg):
-                    try:
-                        self.__sent_msg = await bot.copy_message(nrml_media.chat.id, nrml_media.chat.id, nrml_media.id, reply_to_message_id=self.__sent_msg.id, reply_markup=buttons)
-                        if self.__sent_msg: await deleteMessage(nrml_media)
-                    except:
-                        self.__sent_msg = nrml_media
-                else:
-                    self.__sent_msg = nrml_media
-            elif is_video:
-                key = 'videos'
-                duration = (await get_media_info(self.__up_path))[0]
-                if thumb is None:
-                    thumb = await take_ss(self.__up_path, duration)
-                if thumb is not None:
-                    with Image.open(thumb) as img:
-                        width, height = img.size
-                else:
-                    width = 480
-                    height = 320
-                if not self.__up_path.upper().endswith(("MKV", "MP4")):
-                    dirpath, file_ = self.__up_path.rsplit('/', 1)
-                    if self.__listener.seed and not self.__listener.newDir and not dirpath.endswith("/splited_files_mltb"):
-                        dirpath = f"{dirpath}/copied_mltb"
-                        await makedirs(dirpath, exist_ok=True)
-                        new_path = ospath.join(
-                            dirpath, f"{ospath.splitext(file_)[0]}.mp4")
-                        self.__up_path = await copy(self.__up_path, new_path)
-                    else:
-                        new_path = f"{ospath.splitext(self.__up_path)[0]}.mp4"
-                        await aiorename(self.__up_path, new_path)
-                        self.__up_path = new_path
-                if self.__is_cancelled:
-                    return
-                buttons = await self.__buttons(self.__up_path, is_video)
-                nrml_media = await self.__client.send_video(chat_id=self.__sent_msg.chat.id,
-                                                                    reply_to_message_id=self.__sent_msg.id,
-                                                                    video=self.__up_path,
-                                                                    caption=cap_mono,
-                                                                    duration=duration,
-                                                                    width=width,
-                                                                    height=height,
-                                                                    thumb=thumb,
-                                                                    supports_streaming=True,
-                                                                    disable_notification=True,
-                                                                    progress=self.__upload_progress,
-                                                                    reply_markup=buttons)
-                if self.__prm_media and (self.__has_buttons or not self.__leechmsg):
+            if force_document or not item.key:
+                await self.__stage_media(item, force_document)
+                await self.__preupload(item)
+            if self.__is_cancelled:
+                return
+            media = item.file_id or item.part or item.up_path
+            thumb = None if item.file_id else item.thumb
+            progress = None if item.file_id else self.__upload_progress
+            if item.key == 'documents':
+                nrml_media = await item.client.send_document(chat_id=self.__sent_msg.chat.id,
+                                                             reply_to_message_id=self.__sent_msg.id,
+                                                             document=media,
+                                                             thumb=thumb,
+                                                             caption=item.cap_mono,
+                                                             force_document=True,
+                                                             disable_notification=True,
+                                                             progress=progress,
+                                                             progress_args=(item,),
+                                                             reply_markup=item.buttons)
+            elif item.key == 'videos':
+                nrml_media = await item.client.send_video(chat_id=self.__sent_msg.chat.id,
+                                                          reply_to_message_id=self.__sent_msg.id,
+                                                          video=media,
+                                                          caption=item.cap_mono,
+                                                          duration=item.duration,
+                                                          width=item.width,
+                                                          height=item.height,
+                                                          thumb=thumb,
+                                                          supports_streaming=True,
+                                                          disable_notification=True,
+                                                          progress=progress,
+                                                          progress_args=(item,),
+                                                          reply_markup=item.buttons)
+            elif item.key == 'audios':
+                self.__sent_msg = await item.client.send_audio(chat_id=self.__sent_msg.chat.id,
+                                                               reply_to_message_id=self.__sent_msg.id,
+                                                               audio=media,
+                                                               caption=item.cap_mono,
+                                                               duration=item.duration,
+                                                               performer=item.artist,
+                                                               title=item.title,
+                                                               thumb=thumb,
+                                                               disable_notification=True,
+                                                               progress=progress,
+                                                               progress_args=(item,),
+                                                               reply_markup=item.buttons)
+            else:
+                self.__sent_msg = await item.client.send_photo(chat_id=self.__sent_msg.chat.id,
+                                                               reply_to_message_id=self.__sent_msg.id,
+                                                               photo=media,
+                                                               caption=item.cap_mono,
+                                                               disable_notification=True,
+                                                               progress=progress,
+                                                               progress_args=(item,),
+                                                               reply_markup=item.buttons)
+
+            if item.key in ['documents', 'videos']:
+                if item.prm_media and (self.__has_buttons or not self.__leechmsg):
                     try:
-                        self.__sent_msg = await bot.copy_message(nrml_media.chat.id, nrml_media.chat.id, nrml_media.id, reply_to_message_id=self.__sent_msg.id, reply_markup=buttons)
+                        self.__sent_msg = await bot.copy_message(nrml_media.chat.id, nrml_media.chat.id, nrml_media.id, reply_to_message_id=self.__sent_msg.id, reply_markup=item.buttons)
                         if self.__sent_msg: await deleteMessage(nrml_media)
                     except:
                         self.__sent_msg = nrml_media
                 else:
                     self.__sent_msg = nrml_media
-            elif is_audio:
-                key = 'audios'
-                duration, artist, title = await get_media_info(self.__up_path)
-                if self.__is_cancelled:
-                    return
-                self.__sent_msg = await self.__client.send_audio(chat_id=self.__sent_msg.chat.id,
-                                                                    reply_to_message_id=self.__sent_msg.id,
-                                                                    audio=self.__up_path,
-                                                                    caption=cap_mono,
-                                                                    duration=duration,
-                                                                    performer=artist,
-                                                                    title=title,
-                                                                    thumb=thumb,
-                                                                    disable_notification=True,
-                                                                    progress=self.__upload_progress,
-                                                                    reply_markup=await self.__buttons(self.__up_path))
-            else:
-                key = 'photos'
-                if self.__is_cancelled:
-                    return
-                self.__sent_msg = await self.__client.send_photo(chat_id=self.__sent_msg.chat.id,
-                                                                    reply_to_message_id=self.__sent_msg.id,
-                                                                    photo=self.__up_path,
-                                                                    caption=cap_mono,
-                                                                    disable_notification=True,
-                                                                    progress=self.__upload_progress,
-                                                                    reply_markup=await self.__buttons(self.__up_path))
 
             if not self.__is_cancelled and self.__media_group and (self.__sent_msg.video or self.__sent_msg.document):
                 key = 'documents' if self.__sent_msg.document else 'videos'
-                if match := re_match(r'.+(?=\.0*\d+$)|.+(?=\.part\d+\..+)', self.__up_path):
+                if match := re_match(r'.+(?=\.0*\d+$)|.+(?=\.part\d+\..+)', item.up_path):
                     pname = match.group(0)
                     if pname in self.__media_dict[key].keys():
                         self.__media_dict[key][pname].append(self.__sent_msg)
@@ -501,25 +660,17 @@ class TgUploader:
                         self.__last_msg_in_group = True
             if self.__sent_msg:
                 await self.__copy_file()
-
-            if self.__thumb is None and thumb is not None and await aiopath.exists(thumb):
-                await aioremove(thumb)
-                if (dir_name := ospath.dirname(thumb)) and dir_name != "Thumbnails" and await aiopath.exists(dir_name):
-                    await rmdir(dir_name)
             self.__retry_error = False
         except FloodWait as f:
             LOGGER.warning(str(f))
             await sleep(f.value)
+            raise
         except Exception as err:
             self.__retry_error = True
-            if self.__thumb is None and thumb is not None and await aiopath.exists(thumb):
-                await aioremove(thumb)
-                if (dir_name := ospath.dirname(thumb)) and dir_name != "Thumbnails" and await aiopath.exists(dir_name):
-                    await rmdir(dir_name)
-            LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
-            if 'Telegram says: [400' in str(err) and key != 'documents':
-                LOGGER.error(f"Retrying As Document. Path: {self.__up_path}")
-                return await self.__upload_file(cap_mono, file, True)
+            LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+            if 'Telegram says: [400' in str(err) and item.key != 'documents':
+                LOGGER.error(f"Retrying As Document. Path: {item.up_path}")
+                return await self.__upload_file(item, True)
             raise err
 
     @property
@@ -535,5 +686,6 @@ class TgUploader:
 
     async def cancel_download(self):
         self.__is_cancelled = True
+        self.__kill_split()
         LOGGER.info(f"Cancelling Upload: {self.name}")
         await self.__listener.onUploadError('Your Upload has been Stopped!')
@@ -12,8 +12,8 @@ from pyrogram.enums import ParseMode
 from pyrogram.types import InputMediaPhoto
 from pyrogram.errors import ReplyMarkupInvalid, FloodWait, PeerIdInvalid, ChannelInvalid, RPCError, UserNotParticipant, MessageNotModified, MessageEmpty, PhotoInvalidDimensions, WebpageCurlFailed, MediaEmpty
 
-from bot import config_dict, user_data, categories_dict, bot_cache, LOGGER, bot_name, status_reply_dict, status_reply_dict_lock, Interval, bot, user, download_dict_lock
-from bot.helper.ext_utils.bot_utils import get_readable_message, setInterval, sync_to_async, download_image_url, fetch_user_tds, fetch_user_dumps, new_thread
+from bot import config_dict, user_data, categories_dict, bot_cache, LOGGER, bot_name, status_reply_dict, status_reply_dict_lock, Interval, bot, user, download_dict, download_dict_lock
+from bot.helper.ext_utils.bot_utils import get_readable_message, get_readable_messages, turn_page, setAdaptiveInterval, sync_to_async, download_image_url, fetch_user_tds, fetch_user_dumps, new_thread
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.exceptions import TgLinkException
 
@@ -40,6 +40,7 @@ async def sendMessage(message, text, buttons=None, photo=None, **kwargs):
                                     **kwargs)
     except FloodWait as f:
         LOGGER.warning(str(f))
+        setAdaptiveInterval.report_floodwait(f.value)
         await sleep(f.value * 1.2)
         return await sendMessage(message, text, buttons, photo)
     except ReplyMarkupInvalid:
@@ -72,6 +73,7 @@ async def sendCustomMsg(chat_id, text, buttons=None, photo=None, debug=False):
                                                   disable_notification=True, reply_markup=buttons)
     except FloodWait as f:
         LOGGER.warning(str(f))
+        setAdaptiveInterval.report_floodwait(f.value)
         await sleep(f.value * 1.2)
         return await sendCustomMsg(chat_id, text, buttons, photo)
     except ReplyMarkupInvalid:
@@ -128,6 +130,7 @@ async def sendMultiMessage(chat_ids, text, buttons=None, photo=None):
             msg_dict[f"{chat.id}:{topic_id}"] = sent
         except FloodWait as f:
             LOGGER.warning(str(f))
+            setAdaptiveInterval.report_floodwait(f.value)
             await sleep(f.value * 1.2)
             return await sendMultiMessage(chat_ids, text, buttons, photo)
         except Exception as e:
@@ -145,6 +148,7 @@ async def editMessage(message, text, buttons=None, photo=None):
         await message.edit(text=text, disable_web_page_preview=True, reply_markup=buttons)
     except FloodWait as f:
         LOGGER.warning(str(f))
+        setAdaptiveInterval.report_floodwait(f.value)
         await sleep(f.value * 1.2)
         return await editMessage(message, text, buttons, photo)
     except (MessageNotModified, MessageEmpty):
@@ -171,6 +175,7 @@ async def sendFile(message, file, caption=None, buttons=None):
         return await message.reply_document(document=file, quote=True, caption=caption, disable_notification=True, reply_markup=buttons)
     except FloodWait as f:
         LOGGER.warning(str(f))
+        setAdaptiveInterval.report_floodwait(f.value)
         await sleep(f.value * 1.2)
         return await sendFile(message, file, caption)
     except Exception as e:
@@ -188,6 +193,7 @@ async def sendRss(text):
                                           disable_notification=True)
     except FloodWait as f:
         LOGGER.warning(str(f))
+        setAdaptiveInterval.report_floodwait(f.value)
         await sleep(f.value * 1.2)
         return await sendRss(text)
     except Exception as e:
@@ -290,24 +296,44 @@ async def update_all_messages(force=False):
             return
         for chat_id in list(status_reply_dict.keys()):
             status_reply_dict[chat_id][1] = time()
+        chats = {chat_id: (data[0], (data[2], data[3])) for chat_id, data in status_reply_dict.items()}
     async with download_dict_lock:
-        msg, buttons = await sync_to_async(get_readable_message)
-    if msg is None:
-        return
+        views = await sync_to_async(get_readable_messages, {view for _, view in chats.values()})
+    edits = []
     async with status_reply_dict_lock:
-        for chat_id in list(status_reply_dict.keys()):
-            if status_reply_dict[chat_id] and msg != status_reply_dict[chat_id][0].text:
-                rmsg = await editMessage(status_reply_dict[chat_id][0], msg, buttons, 'IMAGES')
-                if isinstance(rmsg, str) and rmsg.startswith('Telegram says: [400'):
-                    del status_reply_dict[chat_id]
-                    continue
-                status_reply_dict[chat_id][0].text = msg
-                status_reply_dict[chat_id][1] = time()
+        for chat_id, (message, view) in chats.items():
+            msg, buttons = views[view]
+            if msg is None or not (data := status_reply_dict.get(chat_id)) or data[0] is not message:
+                continue
+            rendered = f"{msg}{buttons}"
+            if force or rendered != data[4]:
+                edits.append((chat_id, message, msg, buttons, rendered))
+    delay = min((Interval[0].interval if Interval else config_dict['STATUS_UPDATE_INTERVAL']) / 2 / len(edits), 1) if edits else 0
+    for index, (chat_id, message, msg, buttons, rendered) in enumerate(edits):
+        if index:
+            await sleep(delay)
+        async with status_reply_dict_lock:
+            if not (data := status_reply_dict.get(chat_id)) or data[0] is not message:
+                continue
+        rmsg = await editMessage(message, msg, buttons, 'IMAGES')
+        async with status_reply_dict_lock:
+            if not (data := status_reply_dict.get(chat_id)) or data[0] is not message:
+                continue
+            if isinstance(rmsg, str) and rmsg.startswith('Telegram says: [400'):
+                del status_reply_dict[chat_id]
+                continue
+            message.text = msg
+            data[1] = time()
+            data[4] = rendered
 
 
-async def sendStatusMessage(msg):
+def status_load():
+    return len(status_reply_dict), len(download_dict)
+
+
+async def sendStatusMessage(msg, status='all'):
     async with download_dict_lock:
-        progress, buttons = await sync_to_async(get_readable_message)
+        progress, buttons = await sync_to_async(get_readable_message, 1, status)
     if progress is None:
         return
     async with status_reply_dict_lock:
@@ -321,9 +347,17 @@ async def sendStatusMessage(msg):
                 message.caption = progress
             else:
                 message.text = progress
-        status_reply_dict[chat_id] = [message, time()]
+        status_reply_dict[chat_id] = [message, time(), 1, status, f"{progress}{buttons}"]
         if not Interval:
-            Interval.append(setInterval(config_dict['STATUS_UPDATE_INTERVAL'], update_all_messages))
+            Interval.append(setAdaptiveInterval(config_dict['STATUS_UPDATE_INTERVAL'], update_all_messages, status_load))
+
+
+async def turn_status_page(chat_id, data):
+    async with status_reply_dict_lock:
+        if not (entry := status_reply_dict.get(chat_id)):
+            return
+        async with download_dict_lock:
+            entry[2] = turn_page(entry[2], entry[3], data)
     
 
 async def open_category_btns(message):
@@ -2,6 +2,7 @@
 from os import listdir
 from importlib import import_module
 from random import choice as rchoice
+from threading import Lock
 from bot import config_dict, LOGGER
 from bot.helper.themes import wzml_minimal
 
@@ -10,20 +11,50 @@ for theme in listdir('bot/helper/themes'):
     if theme.startswith('wzml_') and theme.endswith('.py'):
         AVL_THEMES[theme[5:-3]] = import_module(f'bot.helper.themes.{theme[:-3]}')
 
-def BotTheme(var_name, **format_vars):
-    text = None
-    theme_ = config_dict['BOT_THEME']
+THEME_CACHE = {}
+theme_lock = Lock()
 
+
+def compile_theme(theme_):
     if theme_ in AVL_THEMES:
-        text = getattr(AVL_THEMES[theme_].WZMLStyle(), var_name, None)
-        if text is None:
-            LOGGER.error(f"{var_name} not Found in {theme_}. Please recheck with Official Repo")
+        theme_module = AVL_THEMES[theme_]
     elif theme_ == 'random':
-        rantheme = rchoice(list(AVL_THEMES.values()))
-        LOGGER.info(f"Random Theme Chosen: {rantheme}")
-        text = getattr(rantheme.WZMLStyle(), var_name, None)
-        
-    if text is None:
-        text = getattr(wzml_minimal.WZMLStyle(), var_name)
-
-    return text.format_map(format_vars)
+        theme_module = rchoice(list(AVL_THEMES.values()))
+        LOGGER.info(f"Random Theme Chosen: {theme_module}")
+    else:
+        theme_module = wzml_minimal
+    style, default = theme_module.WZMLStyle(), wzml_minimal.WZMLStyle()
+    templates = {}
+    for var_name in dir(default):
+        if var_name.startswith('_') or not isinstance(text := getattr(default, var_name), str):
+            continue
+        if theme_module is not wzml_minimal:
+            if (theme_text := getattr(style, var_name, None)) is None:
+                LOGGER.error(f"{var_name} not Found in {theme_}. Please recheck with Official Repo")
+            else:
+                text = theme_text
+        templates[var_name] = text.format_map
+    return templates
+
+
+def get_theme():
+    theme_ = config_dict['BOT_THEME']
+    if (templates := THEME_CACHE.get(theme_)) is None:
+        with theme_lock:
+            if (templates := THEME_CACHE.get(theme_)) is None:
+                THEME_CACHE.clear()
+                templates = THEME_CACHE[theme_] = compile_theme(theme_)
+    return templates
+
+
+def invalidate_themes():
+    THEME_CACHE.clear()
+
+
+def BotTheme(var_name, **format_vars):
+    return get_theme()[var_name](format_vars)
+
+
+def BotThemeBlock(*parts):
+    templates = get_theme()
+    return ''.join(templates[var_name](format_vars) for var_name, format_vars in parts)
@@ -41,7 +41,8 @@ class WZMLStyle:
 
     # async def stats(client, message):
     BOT_STATS = '''⌬ <b><i>BOT STATISTICS :</i></b>
-┖ <b>Bot Uptime :</b> {bot_uptime}
+┠ <b>Bot Uptime :</b> {bot_uptime}
+┖ <b>Status Refresh :</b> {status_cadence}
 
 ┎ <b><i>RAM ( MEMORY ) :</i></b>
 ┃ {ram_bar} {ram}%
@@ -68,10 +69,12 @@ class WZMLStyle:
 ┠ <b>Download Data:</b> {dl_data}
 ┠ <b>Pkts Sent:</b> {pkt_sent}k
 ┠ <b>Pkts Received:</b> {pkt_recv}k
-┖ <b>Total I/O Data:</b> {tl_data}
+┠ <b>Total I/O Data:</b> {tl_data}
+┖ <b>Current Rate:</b> {net_rate}
 
 ┎ <b>CPU :</b>
 ┃ {cpu_bar} {cpu}%
+┃ {cpu_spark}
 ┠ <b>CPU Frequency :</b> {cpu_freq}
 ┠ <b>System Avg Load :</b> {sys_load}
 ┠ <b>P-Core(s) :</b> {p_core} | <b>V-Core(s) :</b> {v_core}
@@ -184,6 +187,7 @@ class WZMLStyle:
     ELAPSED =                                     ' | <b>Elapsed:</b> {Elapsed}'
     ENGINE =            '\n┠ <b>Engine:</b> {Engine}'
     STA_MODE =          '\n┠ <b>Mode:</b> {Mode}'
+    QUEUE_POS =         '\n┠ <b>Queue:</b> #{Position} of {Total} | <b>Starts In:</b> {Start}'
     SEEDERS =           '\n┠ <b>Seeders:</b> {Seeders} | '
     LEECHERS =                                           '<b>Leechers:</b> {Leechers}'
 
@@ -1,18 +1,118 @@
 #!/usr/bin/env python3
 from os import path as ospath, listdir
 from importlib import import_module
+from inspect import iscoroutine
+from asyncio import Lock
+from sys import modules
+from time import monotonic
 import logging
 
+from pyrogram.handlers import MessageHandler, CallbackQueryHandler, EditedMessageHandler
+from pyrogram.filters import command, regex
+
+from bot import bot, rss_dict
+from bot.helper.telegram_helper.filters import CustomFilters
+from bot.helper.telegram_helper.bot_commands import BotCommands
+
+authorized = CustomFilters.authorized & ~CustomFilters.blacklisted
+
+# Modules imported on first use, with the handlers that trigger the import
+LAZY_MODULES = {
+    'anilist': [(MessageHandler, 'anilist', command(BotCommands.AniListCommand) & authorized),
+                (MessageHandler, 'character', command("character") & authorized),
+                (MessageHandler, 'manga', command("manga") & authorized),
+                (MessageHandler, 'anime_help', command(BotCommands.AnimeHelpCommand) & authorized),
+                (CallbackQueryHandler, 'setAnimeButtons', regex(r'^anime')),
+                (CallbackQueryHandler, 'setCharacButtons', regex(r'^cha'))],
+    'eval': [(MessageHandler, 'evaluate', command(BotCommands.EvalCommand) & CustomFilters.sudo),
+             (MessageHandler, 'execute', command(BotCommands.ExecCommand) & CustomFilters.sudo),
+             (MessageHandler, 'clear', command(BotCommands.ClearLocalsCommand) & CustomFilters.sudo)],
+    'imdb': [(MessageHandler, 'imdb_search', command(BotCommands.IMDBCommand) & authorized),
+             (CallbackQueryHandler, 'imdb_callback', regex(r'^imdb'))],
+    'mydramalist': [(MessageHandler, 'mydramalist_search', command(BotCommands.MyDramaListCommand) & authorized),
+                    (CallbackQueryHandler, 'mdl_callback', regex(r'^mdl'))],
+    'rss': [(MessageHandler, 'getRssMenu', command(BotCommands.RssCommand) & authorized),
+            (CallbackQueryHandler, 'rssListener', regex(r"^rss"))],
+    'shell': [(MessageHandler, 'shell', command(BotCommands.ShellCommand) & CustomFilters.sudo),
+              (EditedMessageHandler, 'shell', command(BotCommands.ShellCommand) & CustomFilters.sudo)],
+    'speedtest': [(MessageHandler, 'speedtest', command(BotCommands.SpeedCommand) & authorized)],
+    'torrent_search': [(MessageHandler, 'torrentSearch', command(BotCommands.SearchCommand) & authorized),
+                       (CallbackQueryHandler, 'torrentSearchUpdate', regex("^torser"))],
+}
+# Coroutines run once right after a lazy module is imported
+LAZY_HOOKS = {'torrent_search': 'initiate_search_tools'}
+
+import_profile = {}
+ready_modules = set()
+load_lock = Lock()
+
+
+def __import(module):
+    start = monotonic()
+    imported = import_module(f".{module}", __package__)
+    import_profile[module] = monotonic() - start
+    ready_modules.add(module)
+    return imported
+
+
+def loaded_module(module):
+    return modules.get(f"{__package__}.{module}")
+
+
+async def load_module(module):
+    if module in ready_modules:
+        return loaded_module(module)
+    async with load_lock:
+        if module in ready_modules:
+            return loaded_module(module)
+        start = monotonic()
+        imported = import_module(f".{module}", __package__)
+        if hook := LAZY_HOOKS.get(module):
+            await getattr(imported, hook)()
+        import_profile[module] = monotonic() - start
+        ready_modules.add(module)
+    logging.info(f"Loaded module {module} on demand in {import_profile[module]:.2f}s")
+    return imported
+
+
+async def run_if_loaded(module, func, *args):
+    if (imported := loaded_module(module)) is None:
+        return
+    if iscoroutine(result := getattr(imported, func)(*args)):
+        return await result
+    return result
+
+
+def lazy_callback(module, func):
+    async def callback(client, update):
+        if iscoroutine(result := getattr(await load_module(module), func)(client, update)):
+            return await result
+        return result
+    return callback
+
+
+def log_import_profile():
+    profile = ', '.join(f"{module} {took:.2f}s" for module, took in sorted(import_profile.items(), key=lambda item: -item[1]))
+    logging.info(f"Module import profile ({sum(import_profile.values()):.2f}s): {profile}")
+    if lazy := [module for module in LAZY_MODULES if loaded_module(module) is None]:
+        logging.info(f"Deferred modules: {', '.join(lazy)}")
+
+
 # Get all python files in the modules directory
 all_modules = sorted([
     f[:-3] for f in listdir(ospath.dirname(__file__))
     if f.endswith(".py") and not f.startswith("__")
 ])
+eager_modules = [module for module in all_modules if module not in LAZY_MODULES or (module == 'rss' and rss_dict)]
+
+for module, handlers in LAZY_MODULES.items():
+    for handler, func, filters in handlers:
+        bot.add_handler(handler(lazy_callback(module, func), filters=filters))
 
 # Import each module
-for module in all_modules:
+for module in eager_modules:
     try:
-        import_module(f".{module}", __package__)
+        __import(module)
         logging.info(f"Successfully imported module {module}")
     except Exception as e:
         logging.error(f"Error importing module {module}: {str(e)}")
@@ -15,18 +15,17 @@ from io import BytesIO
 from aioshutil import rmtree as aiormtree
 
 from bot import config_dict, user_data, DATABASE_URL, MAX_SPLIT_SIZE, list_drives_dict, categories_dict, aria2, GLOBAL_EXTENSION_FILTER, status_reply_dict_lock, Interval, aria2_options, aria2c_global, IS_PREMIUM_USER, download_dict, qbit_options, get_client, LOGGER, bot, extra_buttons, shorteners_list
-from bot.helper.telegram_helper.message_utils import sendMessage, sendFile, editMessage, deleteMessage, update_all_messages
+from bot.helper.telegram_helper.message_utils import sendMessage, sendFile, editMessage, deleteMessage, update_all_messages, status_load
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
-from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async, new_thread
+from bot.helper.ext_utils.bot_utils import setAdaptiveInterval, sync_to_async, new_thread
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.ext_utils.task_manager import start_from_queued
 from bot.helper.ext_utils.help_messages import default_desp
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
-from bot.modules.torrent_search import initiate_search_tools
-from bot.modules.rss import addJob
-from bot.helper.themes import AVL_THEMES
+from bot.modules import run_if_loaded
+from bot.helper.themes import AVL_THEMES, invalidate_themes
 
 START = 0
 STATE = 'view'
@@ -35,8 +34,12 @@ default_values = {'AUTO_DELETE_MESSAGE_DURATION': 30,
                   'DEFAULT_UPLOAD': 'gd',
                   'DOWNLOAD_DIR': '/usr/src/app/downloads/',
                   'LEECH_SPLIT_SIZE': MAX_SPLIT_SIZE,
+                  'LEECH_CONCURRENCY': 3,
+                  'LEECH_CHAT_CONCURRENCY': 6,
                   'RSS_DELAY': 600,
                   'STATUS_UPDATE_INTERVAL': 10,
+                  'QUEUE_POLICY': 'fair',
+                  'QUEUE_AGING': 1800,
                   'SEARCH_LIMIT': 0,
                   'UPSTREAM_BRANCH': 'master',
                   'BOT_THEME': 'minimal',
@@ -49,7 +52,7 @@ default_values = {'AUTO_DELETE_MESSAGE_DURATION': 30,
                   }
 bool_vars = ['AS_DOCUMENT', 'BOT_PM', 'STOP_DUPLICATE', 'SET_COMMANDS', 'SAVE_MSG', 'SHOW_MEDIAINFO', 'SOURCE_LINK', 'SAFE_MODE', 'SHOW_EXTRA_CMDS',
              'IS_TEAM_DRIVE', 'USE_SERVICE_ACCOUNTS', 'WEB_PINCODE', 'EQUAL_SPLITS', 'DISABLE_DRIVE_LINK', 'DELETE_LINKS', 'CLEAN_LOG_MSG', 'USER_TD_MODE', 
-             'INCOMPLETE_TASK_NOTIFIER', 'UPGRADE_PACKAGES', 'SCREENSHOTS_MODE']
+             'INCOMPLETE_TASK_NOTIFIER', 'UPGRADE_PACKAGES', 'SCREENSHOTS_MODE', 'QUEUE_SMALL_FIRST']
 
 
 async def load_config():
@@ -115,6 +118,11 @@ async def load_config():
         aid = SUDO_USERS.split()
         for id_ in aid:
             user_data[int(id_.strip())] = {'is_sudo': True}
+
+    PAID_USERS = environ.get('PAID_USERS', '')
+    if len(PAID_USERS) != 0:
+        for id_ in PAID_USERS.split():
+            user_data.setdefault(int(id_.strip()), {})['is_paid'] = True
             
     BLACKLIST_USERS = environ.get('BLACKLIST_USERS', '')
     if len(BLACKLIST_USERS) != 0:
@@ -205,6 +213,12 @@ async def load_config():
     else:
         LEECH_SPLIT_SIZE = int(LEECH_SPLIT_SIZE)
 
+    LEECH_CONCURRENCY = environ.get('LEECH_CONCURRENCY', '')
+    LEECH_CONCURRENCY = 3 if len(LEECH_CONCURRENCY) == 0 else int(LEECH_CONCURRENCY)
+
+    LEECH_CHAT_CONCURRENCY = environ.get('LEECH_CHAT_CONCURRENCY', '')
+    LEECH_CHAT_CONCURRENCY = 6 if len(LEECH_CHAT_CONCURRENCY) == 0 else int(LEECH_CHAT_CONCURRENCY)
+
     STATUS_UPDATE_INTERVAL = environ.get('STATUS_UPDATE_INTERVAL', '')
     if len(STATUS_UPDATE_INTERVAL) == 0:
         STATUS_UPDATE_INTERVAL = 10
@@ -215,7 +229,7 @@ async def load_config():
             if Interval:
                 Interval[0].cancel()
                 Interval.clear()
-                Interval.append(setInterval(STATUS_UPDATE_INTERVAL, update_all_messages))
+                Interval.append(setAdaptiveInterval(STATUS_UPDATE_INTERVAL, update_all_messages, status_load))
 
     AUTO_DELETE_MESSAGE_DURATION = environ.get(
         'AUTO_DELETE_MESSAGE_DURATION', '')
@@ -278,6 +292,18 @@ async def load_config():
     QUEUE_UPLOAD = environ.get('QUEUE_UPLOAD', '')
     QUEUE_UPLOAD = '' if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+    QUEUE_POLICY = environ.get('QUEUE_POLICY', '')
+    QUEUE_POLICY = 'fair' if QUEUE_POLICY.lower() != 'fifo' else 'fifo'
+
+    QUEUE_SMALL_FIRST = environ.get('QUEUE_SMALL_FIRST', '')
+    QUEUE_SMALL_FIRST = QUEUE_SMALL_FIRST.lower() == 'true'
+
+    QUEUE_AGING = environ.get('QUEUE_AGING', '')
+    QUEUE_AGING = 1800 if len(QUEUE_AGING) == 0 else int(QUEUE_AGING)
+
+    QUEUE_DOWNLOAD_ENGINES = environ.get('QUEUE_DOWNLOAD_ENGINES', '')
+    QUEUE_UPLOAD_ENGINES = environ.get('QUEUE_UPLOAD_ENGINES', '')
+
     INCOMPLETE_TASK_NOTIFIER = environ.get('INCOMPLETE_TASK_NOTIFIER', '')
     INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == 'true'
     if not INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
@@ -650,6 +676,8 @@ async def load_config():
                         'MIRROR_FILENAME_SUFFIX': MIRROR_FILENAME_SUFFIX,
                         'MIRROR_FILENAME_REMNAME': MIRROR_FILENAME_REMNAME,
                         'LEECH_SPLIT_SIZE': LEECH_SPLIT_SIZE,
+                        'LEECH_CONCURRENCY': LEECH_CONCURRENCY,
+                        'LEECH_CHAT_CONCURRENCY': LEECH_CHAT_CONCURRENCY,
                         'LOGIN_PASS': LOGIN_PASS,
                         'TOKEN_TIMEOUT': TOKEN_TIMEOUT,
                         'MEDIA_GROUP': MEDIA_GROUP,
@@ -660,6 +688,12 @@ async def load_config():
                         'QUEUE_ALL': QUEUE_ALL,
                         'QUEUE_DOWNLOAD': QUEUE_DOWNLOAD,
                         'QUEUE_UPLOAD': QUEUE_UPLOAD,
+                        'QUEUE_POLICY': QUEUE_POLICY,
+                        'QUEUE_SMALL_FIRST': QUEUE_SMALL_FIRST,
+                        'QUEUE_AGING': QUEUE_AGING,
+                        'QUEUE_DOWNLOAD_ENGINES': QUEUE_DOWNLOAD_ENGINES,
+                        'QUEUE_UPLOAD_ENGINES': QUEUE_UPLOAD_ENGINES,
+                        'PAID_USERS': PAID_USERS,
                         'RCLONE_FLAGS': RCLONE_FLAGS,
                         'RCLONE_PATH': RCLONE_PATH,
                         'RCLONE_SERVE_URL': RCLONE_SERVE_URL,
@@ -699,7 +733,7 @@ async def load_config():
 
     if DATABASE_URL:
         await DbManger().update_config(config_dict)
-    await gather(initiate_search_tools(), start_from_queued(), rclone_serve_booter())
+    await gather(run_if_loaded('torrent_search', 'initiate_search_tools'), start_from_queued(), rclone_serve_booter())
 
 
 async def get_buttons(key=None, edit_type=None, edit_mode=None, mess=None):
@@ -773,7 +807,7 @@ async def get_buttons(key=None, edit_type=None, edit_mode=None, mess=None):
         if key not in ['TELEGRAM_HASH', 'TELEGRAM_API', 'OWNER_ID', 'BOT_TOKEN'] and key not in bool_vars:
             buttons.ibutton('Reset', f"botset resetvar {key}")
         buttons.ibutton('Close', "botset close", position="footer")
-        if edit_mode and key in ['SUDO_USERS', 'CMD_SUFFIX', 'OWNER_ID', 'USER_SESSION_STRING', 'TELEGRAM_HASH',
+        if edit_mode and key in ['SUDO_USERS', 'PAID_USERS', 'CMD_SUFFIX', 'OWNER_ID', 'USER_SESSION_STRING', 'TELEGRAM_HASH',
                                  'TELEGRAM_API', 'AUTHORIZED_CHATS', 'DATABASE_URL', 'BOT_TOKEN', 'DOWNLOAD_DIR']:
             msg += '<b>Note:</b> Restart required for this edit to take effect!\n\n'
         if edit_mode and key not in bool_vars:
@@ -811,7 +845,7 @@ async def edit_variable(_, message, pre_message, key):
     value = message.text
     if key == 'RSS_DELAY':
         value = int(value)
-        addJob(value)
+        await run_if_loaded('rss', 'addJob', value)
     elif key == 'DOWNLOAD_DIR':
         if not value.endswith('/'):
             value += '/'
@@ -824,7 +858,7 @@ async def edit_variable(_, message, pre_message, key):
                 if Interval:
                     Interval[0].cancel()
                     Interval.clear()
-                    Interval.append(setInterval(value, update_all_messages))
+                    Interval.append(setAdaptiveInterval(value, update_all_messages, status_load))
     elif key == 'TORRENT_TIMEOUT':
         value = int(value)
         downloads = await sync_to_async(aria2.get_downloads)
@@ -837,9 +871,12 @@ async def edit_variable(_, message, pre_message, key):
         aria2_options['bt-stop-timeout'] = f'{value}'
     elif key == 'LEECH_SPLIT_SIZE':
         value = min(int(value), MAX_SPLIT_SIZE)
+    elif key == 'QUEUE_POLICY':
+        value = 'fifo' if value.strip().lower() == 'fifo' else 'fair'
     elif key == 'BOT_THEME':
         if not value.strip() in AVL_THEMES.keys():
             value = 'minimal'
+        invalidate_themes()
     elif key == 'CAP_FONT':
         value = value.strip().lower()
         if value not in ['b', 'i', 'u', 's', 'spoiler', 'code']:
@@ -871,8 +908,8 @@ async def edit_variable(_, message, pre_message, key):
     if DATABASE_URL:
         await DbManger().update_config({key: value})
     if key in ['SEARCH_PLUGINS', 'SEARCH_API_LINK']:
-        await initiate_search_tools()
-    elif key in ['QUEUE_ALL', 'QUEUE_DOWNLOAD', 'QUEUE_UPLOAD']:
+        await run_if_loaded('torrent_search', 'initiate_search_tools')
+    elif key in ['QUEUE_ALL', 'QUEUE_DOWNLOAD', 'QUEUE_UPLOAD', 'QUEUE_POLICY', 'QUEUE_SMALL_FIRST', 'QUEUE_AGING', 'QUEUE_DOWNLOAD_ENGINES', 'QUEUE_UPLOAD_ENGINES']:
         await start_from_queued()
     elif key in ['RCLONE_SERVE_URL', 'RCLONE_SERVE_PORT', 'RCLONE_SERVE_USER', 'RCLONE_SERVE_PASS']:
         await rclone_serve_booter()
@@ -1086,8 +1123,8 @@ async def edit_bot_settings(client, query):
                     if Interval:
                         Interval[0].cancel()
                         Interval.clear()
-                        Interval.append(setInterval(
-                            value, update_all_messages))
+                        Interval.append(setAdaptiveInterval(
+                            value, update_all_messages, status_load))
         elif data[2] == 'EXTENSION_FILTER':
             GLOBAL_EXTENSION_FILTER.clear()
             GLOBAL_EXTENSION_FILTER.extend(['aria2', '!qB'])
@@ -1126,8 +1163,8 @@ async def edit_bot_settings(client, query):
         if DATABASE_URL:
             await DbManger().update_config({data[2]: value})
         if data[2] in ['SEARCH_PLUGINS', 'SEARCH_API_LINK']:
-            await initiate_search_tools()
-        elif data[2] in ['QUEUE_ALL', 'QUEUE_DOWNLOAD', 'QUEUE_UPLOAD']:
+            await run_if_loaded('torrent_search', 'initiate_search_tools')
+        elif data[2] in ['QUEUE_ALL', 'QUEUE_DOWNLOAD', 'QUEUE_UPLOAD', 'QUEUE_POLICY', 'QUEUE_SMALL_FIRST', 'QUEUE_AGING', 'QUEUE_DOWNLOAD_ENGINES', 'QUEUE_UPLOAD_ENGINES']:
             await start_from_queued()
         elif data[2] in ['RCLONE_SERVE_URL', 'RCLONE_SERVE_PORT', 'RCLONE_SERVE_USER', 'RCLONE_SERVE_PASS']:
             await rclone_serve_booter()
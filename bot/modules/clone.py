@@ -21,6 +21,7 @@ from bot.helper.mirror_utils.download_utils.direct_link_generator import direct_
 from bot.helper.mirror_utils.rclone_utils.list import RcloneList
 from bot.helper.mirror_utils.rclone_utils.transfer import RcloneTransferHelper
 from bot.helper.ext_utils.help_messages import CLONE_HELP_MESSAGE
+from bot.helper.ext_utils.user_files import user_files
 from bot.helper.mirror_utils.status_utils.rclone_status import RcloneStatus
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
 from bot.helper.themes import BotTheme
@@ -35,7 +36,7 @@ async def rcloneNode(client, message, link, dst_path, rcf, tag):
 
     if link.startswith('mrcc:'):
         link = link.split('mrcc:', 1)[1]
-        config_path = f'wcl/{message.from_user.id}.conf'
+        config_path = await user_files.materialize(message.from_user.id, 'rclone') or f'wcl/{message.from_user.id}.conf'
     else:
         config_path = 'wcl/.conf'
 
@@ -254,7 +255,7 @@ async def clone(client, message):
         return
 
     if is_rclone_path(link):
-        if not await aiopath.exists('wcl.conf') and not await aiopath.exists(f'wcl/{message.from_user.id}.conf'):
+        if not await aiopath.exists('wcl.conf') and not await user_files.exists(message.from_user.id, 'rclone'):
             await sendMessage(message, 'RClone Config Not exists!')
             await delete_links(message)
             return
@@ -1,6 +1,4 @@
 #!/usr/bin/env python3
-from pyrogram.handlers import MessageHandler
-from pyrogram.filters import command
 from os import path as ospath, getcwd, chdir
 from aiofiles import open as aiopen
 from traceback import format_exc
@@ -10,8 +8,6 @@ from re import match
 from contextlib import redirect_stdout, suppress
 
 from bot import LOGGER, bot, user
-from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.message_utils import sendFile, sendMessage
 from bot.helper.ext_utils.bot_utils import new_task
 
@@ -112,11 +108,3 @@ async def clear(client, message):
         await send("<b>Cached Locals Cleared !</b>", message)
     else:
         await send("<b>No Cache Locals Found !</b>", message)
-
-
-bot.add_handler(MessageHandler(evaluate, filters=command(
-    BotCommands.EvalCommand) & CustomFilters.sudo))
-bot.add_handler(MessageHandler(execute, filters=command(
-    BotCommands.ExecCommand) & CustomFilters.sudo))
-bot.add_handler(MessageHandler(clear, filters=command(
-    BotCommands.ClearLocalsCommand) & CustomFilters.sudo))
@@ -31,6 +31,7 @@ from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, e
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
 from bot.helper.ext_utils.help_messages import MIRROR_HELP_MESSAGE, CLONE_HELP_MESSAGE, YT_HELP_MESSAGE, help_string
 from bot.helper.ext_utils.bulk_links import extract_bulk_links
+from bot.helper.ext_utils.user_files import user_files
 from bot.modules.gen_pyro_sess import get_decrypt_key
 
 @new_task
@@ -292,7 +293,7 @@ async def _mirror_leech(client, message, isQbit=False, isLeech=False, sameDir=No
             return
         elif up not in ['rcl', 'gd', 'ddl']:
             if up.startswith('mrcc:'):
-                config_path = f'wcl/{message.from_user.id}.conf'
+                config_path = await user_files.materialize(message.from_user.id, 'rclone') or f'wcl/{message.from_user.id}.conf'
             else:
                 config_path = 'wcl.conf'
             if not await aiopath.exists(config_path):
@@ -363,7 +364,7 @@ async def _mirror_leech(client, message, isQbit=False, isLeech=False, sameDir=No
     elif is_rclone_path(link):
         if link.startswith('mrcc:'):
             link = link.split('mrcc:', 1)[1]
-            config_path = f'wcl/{message.from_user.id}.conf'
+            config_path = await user_files.materialize(message.from_user.id, 'rclone') or f'wcl/{message.from_user.id}.conf'
         else:
             config_path = 'wcl.conf'
         if not await aiopath.exists(config_path):
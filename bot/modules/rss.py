@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 from feedparser import parse as feedparse
-from pyrogram.handlers import MessageHandler, CallbackQueryHandler
-from pyrogram.filters import command, regex, create
+from pyrogram.handlers import MessageHandler
+from pyrogram.filters import create
 from asyncio import Lock, sleep
 from datetime import datetime, timedelta
 from time import time
@@ -11,10 +11,9 @@ from apscheduler.triggers.interval import IntervalTrigger
 from re import split as re_split
 from io import BytesIO
 
-from bot import scheduler, rss_dict, LOGGER, DATABASE_URL, config_dict, bot
+from bot import scheduler, rss_dict, LOGGER, DATABASE_URL, config_dict
 from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, sendRss, sendFile
 from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.bot_utils import new_thread
@@ -653,6 +652,3 @@ def addJob(delay):
 
 addJob(config_dict['RSS_DELAY'])
 scheduler.start()
-bot.add_handler(MessageHandler(getRssMenu, filters=command(
-    BotCommands.RssCommand) & CustomFilters.authorized & ~CustomFilters.blacklisted))
-bot.add_handler(CallbackQueryHandler(rssListener, filters=regex(r"^rss")))
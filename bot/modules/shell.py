@@ -1,13 +1,9 @@
 #!/usr/bin/env python3
-from pyrogram.handlers import MessageHandler, EditedMessageHandler
-from pyrogram.filters import command
 from io import BytesIO
 
-from bot import LOGGER, bot
+from bot import LOGGER
 from bot.helper.telegram_helper.message_utils import sendMessage, sendFile
 from bot.helper.ext_utils.bot_utils import cmd_exec, new_task
-from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.bot_commands import BotCommands
 
 
 @new_task
@@ -33,9 +29,3 @@ async def shell(_, message):
         await sendMessage(message, reply)
     else:
         await sendMessage(message, 'No Reply')
-
-
-bot.add_handler(MessageHandler(shell, filters=command(
-    BotCommands.ShellCommand) & CustomFilters.sudo))
-bot.add_handler(EditedMessageHandler(shell, filters=command(
-    BotCommands.ShellCommand) & CustomFilters.sudo))
@@ -1,11 +1,7 @@
 #!/usr/bin/env python3
 from speedtest import Speedtest, ConfigRetrievalError
-from pyrogram.handlers import MessageHandler
-from pyrogram.filters import command
 
-from bot import bot, LOGGER
-from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.bot_commands import BotCommands
+from bot import LOGGER
 from bot.helper.telegram_helper.message_utils import sendMessage, deleteMessage, editMessage
 from bot.helper.ext_utils.bot_utils import get_readable_file_size, new_task
 
@@ -54,6 +50,3 @@ async def speedtest(_, message):
     except Exception as e:
         LOGGER.error(str(e))
         await editMessage(speed, string_speed)
-
-bot.add_handler(MessageHandler(speedtest, filters=command(
-    BotCommands.SpeedCommand) & CustomFilters.authorized & ~CustomFilters.blacklisted))
@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.filters import command, regex
-from psutil import cpu_percent, virtual_memory, disk_usage
 from time import time
 from asyncio import sleep
 
 from bot import bot_cache, status_reply_dict_lock, download_dict, download_dict_lock, botStartTime, Interval, config_dict, bot
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
-from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, deleteMessage, auto_delete_message, sendStatusMessage, user_info, update_all_messages, delete_all_messages
-from bot.helper.ext_utils.bot_utils import get_readable_file_size, get_readable_time, turn_page, setInterval, new_task
+from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, deleteMessage, auto_delete_message, sendStatusMessage, user_info, update_all_messages, delete_all_messages, turn_status_page, status_load
+from bot.helper.ext_utils.bot_utils import get_readable_file_size, get_readable_time, setAdaptiveInterval, new_task, MirrorStatus
+from bot.helper.ext_utils.system_metrics import system_metrics
 from bot.helper.themes import BotTheme
 
 
@@ -19,19 +19,24 @@ async def mirror_status(_, message):
         count = len(download_dict)
     if count == 0:
         currentTime = get_readable_time(time() - botStartTime)
-        free = get_readable_file_size(disk_usage(config_dict['DOWNLOAD_DIR']).free)
-        msg = BotTheme('NO_ACTIVE_DL', cpu=cpu_percent(), free=free, free_p=round(100-disk_usage(config_dict['DOWNLOAD_DIR']).percent, 1),
-                       ram=virtual_memory().percent, uptime=currentTime)
+        sample = system_metrics.latest()
+        free = get_readable_file_size(sample.download_disk.free)
+        msg = BotTheme('NO_ACTIVE_DL', cpu=sample.cpu, free=free, free_p=round(100-sample.download_disk.percent, 1),
+                       ram=sample.memory.percent, uptime=currentTime)
         reply_message = await sendMessage(message, msg)
         await auto_delete_message(message, reply_message)
     else:
-        await sendStatusMessage(message)
+        status = 'all'
+        if len(message.command) > 1:
+            arg = message.command[1].lower()
+            status = next((value for key, value in vars(MirrorStatus).items() if key.startswith('STATUS_') and value.lower() == arg), 'all')
+        await sendStatusMessage(message, status)
         await deleteMessage(message)
         async with status_reply_dict_lock:
             if Interval:
                 Interval[0].cancel()
                 Interval.clear()
-                Interval.append(setInterval(config_dict['STATUS_UPDATE_INTERVAL'], update_all_messages))
+                Interval.append(setAdaptiveInterval(config_dict['STATUS_UPDATE_INTERVAL'], update_all_messages, status_load))
 
 
 @new_task
@@ -48,7 +53,7 @@ async def status_pages(_, query):
         await sleep(1.5)
         await update_all_messages(True)
     elif data[1] in ['nex', 'pre']:
-        await turn_page(data)
+        await turn_status_page(query.message.chat.id, data)
         await update_all_messages(True)
     elif data[1] == 'close':
         await delete_all_messages()
@@ -8,7 +8,7 @@ from bot import bot, bot_name, aria2, download_dict, download_dict_lock, OWNER_I
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.message_utils import sendMessage, sendStatusMessage, deleteMessage
-from bot.helper.ext_utils.bot_utils import getDownloadByGid, MirrorStatus, bt_selection_buttons, sync_to_async
+from bot.helper.ext_utils.bot_utils import getDownloadByGid, sync_task_status, MirrorStatus, bt_selection_buttons, sync_to_async
 
 
 async def select(client, message):
@@ -66,6 +66,7 @@ async def select(client, message):
     except Exception:
         await sendMessage(message, "This is not a bittorrent task!")
         return
+    await sync_task_status(listener.uid)
 
     SBUTTONS = bt_selection_buttons(id_)
     msg = "Your download paused. Choose files then press Done Selecting button to resume downloading."
@@ -118,6 +119,7 @@ async def get_confirm(client, query):
                     await sync_to_async(aria2.client.unpause, id_)
                 except Exception as e:
                     LOGGER.error(f"{e} Error in resume, this mostly happens after abuse aria2. Try to use select cmd again!")
+        await sync_task_status(listener.uid)
         await sendStatusMessage(message)
         await deleteMessage(message)
     elif data[1] == "rm":
@@ -21,6 +21,7 @@ from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.ext_utils.db_handler import DbManger
+from bot.helper.ext_utils.user_files import user_files
 from bot.helper.ext_utils.bot_utils import getdailytasks, update_user_ldata, get_readable_file_size, sync_to_async, new_thread, is_gdrive_link
 from bot.helper.mirror_utils.upload_utils.ddlserver.gofile import Gofile
 from bot.helper.themes import BotTheme
@@ -69,8 +70,6 @@ async def get_user_settings(from_user, key=None, edit_type=None, edit_mode=None)
     user_id = from_user.id
     name = from_user.mention(style="html")
     buttons = ButtonMaker()
-    thumbpath = f"Thumbnails/{user_id}.jpg"
-    rclone_path = f'wcl/{user_id}.conf'
     user_dict = user_data.get(user_id, {})
     if key is None:
         buttons.ibutton("Universal Settings", f"userset {user_id} universal")
@@ -111,7 +110,7 @@ async def get_user_settings(from_user, key=None, edit_type=None, edit_mode=None)
         button = buttons.build_menu(2)
     elif key == 'mirror':
         buttons.ibutton("RClone", f"userset {user_id} rcc")
-        rccmsg = "Exists" if await aiopath.exists(rclone_path) else "Not Exists"
+        rccmsg = "Exists" if await user_files.exists(user_id, 'rclone') else "Not Exists"
         dailytlup = get_readable_file_size(config_dict['DAILY_MIRROR_LIMIT'] * 1024**3) if config_dict['DAILY_MIRROR_LIMIT'] else "∞"
         dailyup = get_readable_file_size(await getdailytasks(user_id, check_mirror=True)) if config_dict['DAILY_MIRROR_LIMIT'] and user_id != OWNER_ID else "️∞"
         buttons.ibutton("Mirror Prefix", f"userset {user_id} mprefix")
@@ -150,7 +149,7 @@ async def get_user_settings(from_user, key=None, edit_type=None, edit_mode=None)
         dailytlle = get_readable_file_size(config_dict['DAILY_LEECH_LIMIT'] * 1024**3) if config_dict['DAILY_LEECH_LIMIT'] else "️∞"
         dailyll = get_readable_file_size(await getdailytasks(user_id, check_leech=True)) if config_dict['DAILY_LEECH_LIMIT'] and user_id != OWNER_ID else "∞"
 
-        thumbmsg = "Exists" if await aiopath.exists(thumbpath) else "Not Exists"
+        thumbmsg = "Exists" if await user_files.exists(user_id, 'thumb') else "Not Exists"
         buttons.ibutton(f"{'✅️' if thumbmsg == 'Exists' else ''} Thumbnail", f"userset {user_id} thumb")
         
         split_size = get_readable_file_size(config_dict['LEECH_SPLIT_SIZE']) + ' (Default)' if user_dict.get('split_size', '') == '' else get_readable_file_size(user_dict['split_size'])
@@ -200,10 +199,10 @@ async def get_user_settings(from_user, key=None, edit_type=None, edit_mode=None)
     elif edit_type:
         text = f"㊂ <b><u>{fname_dict[key]} Settings :</u></b>\n\n"
         if key == 'rcc':
-            set_exist = await aiopath.exists(rclone_path)
+            set_exist = await user_files.exists(user_id, 'rclone')
             text += f"➲ <b>RClone.Conf File :</b> <i>{'' if set_exist else 'Not'} Exists</i>\n\n"
         elif key == 'thumb':
-            set_exist = await aiopath.exists(thumbpath)
+            set_exist = await user_files.exists(user_id, 'thumb')
             text += f"➲ <b>Custom Thumbnail :</b> <i>{'' if set_exist else 'Not'} Exists</i>\n\n"
         elif key == 'yt_opt':
             set_exist = 'Not Exists' if (val:=user_dict.get('yt_opt', config_dict.get('YT_DLP_OPTIONS', ''))) == '' else val
@@ -381,6 +380,7 @@ async def set_thumb(client, message, pre_event, key, direct=False):
     await sync_to_async(Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG")
     await aioremove(photo_dir)
     update_user_ldata(user_id, 'thumb', des_dir)
+    user_files.touch(user_id, 'thumb')
     await deleteMessage(message)
     await update_user_settings(pre_event, key, 'leech', msg=message, sdirect=direct)
     if DATABASE_URL:
@@ -396,6 +396,7 @@ async def add_rclone(client, message, pre_event):
     des_dir = ospath.join(path, f'{user_id}.conf')
     await message.download(file_name=des_dir)
     update_user_ldata(user_id, 'rclone', f'wcl/{user_id}.conf')
+    user_files.touch(user_id, 'rclone')
     await deleteMessage(message)
     await update_user_settings(pre_event, 'rcc', 'mirror')
     if DATABASE_URL:
@@ -450,7 +451,6 @@ async def edit_user_settings(client, query):
     message = query.message
     data = query.data.split()
     thumb_path = f'Thumbnails/{user_id}.jpg'
-    rclone_path = f'wcl/{user_id}.conf'
     user_dict = user_data.get(user_id, {})
     if user_id != int(data[1]):
         await query.answer("Not Yours!", show_alert=True)
@@ -468,6 +468,7 @@ async def edit_user_settings(client, query):
         await query.answer()
         buttons = ButtonMaker()
         buttons.ibutton('Cʟᴏsᴇ', f'wzmlx {user_id} close')
+        await user_files.materialize(user_id, 'thumb')
         await sendMessage(message, from_user.mention, buttons.build_menu(1), thumb_path)
         await update_user_settings(query, 'thumb', 'leech')
     elif data[2] == 'show_tds':
@@ -486,9 +487,9 @@ async def edit_user_settings(client, query):
         await update_user_settings(query, 'user_tds', 'mirror')
     elif data[2] == "dthumb":
         handler_dict[user_id] = False
-        if await aiopath.exists(thumb_path):
+        if await user_files.exists(user_id, 'thumb'):
             await query.answer()
-            await aioremove(thumb_path)
+            await user_files.forget(user_id, 'thumb')
             update_user_ldata(user_id, 'thumb', '')
             await update_user_settings(query, 'thumb', 'leech')
             if DATABASE_URL:
@@ -591,9 +592,9 @@ async def edit_user_settings(client, query):
         await event_handler(client, query, pfunc, rfunc, document=True)
     elif data[2] == 'drcc':
         handler_dict[user_id] = False
-        if await aiopath.exists(rclone_path):
+        if await user_files.exists(user_id, 'rclone'):
             await query.answer()
-            await aioremove(rclone_path)
+            await user_files.forget(user_id, 'rclone')
             update_user_ldata(user_id, 'rclone', '')
             await update_user_settings(query, 'rcc', 'mirror')
             if DATABASE_URL:
@@ -653,10 +654,8 @@ async def edit_user_settings(client, query):
         handler_dict[user_id] = False
         if data[3] == 'n':
             return await update_user_settings(query)
-        if await aiopath.exists(thumb_path):
-            await aioremove(thumb_path)
-        if await aiopath.exists(rclone_path):
-            await aioremove(rclone_path)
+        await user_files.forget(user_id, 'thumb')
+        await user_files.forget(user_id, 'rclone')
         await query.answer()
         update_user_ldata(user_id, None, None)
         await update_user_settings(query)
@@ -667,12 +666,8 @@ async def edit_user_settings(client, query):
     elif data[2] == 'user_del':
         user_id = int(data[3])
         await query.answer()
-        thumb_path = f'Thumbnails/{user_id}.jpg'
-        rclone_path = f'wcl/{user_id}.conf'
-        if await aiopath.exists(thumb_path):
-            await aioremove(thumb_path)
-        if await aiopath.exists(rclone_path):
-            await aioremove(rclone_path)
+        await user_files.forget(user_id, 'thumb')
+        await user_files.forget(user_id, 'rclone')
         update_user_ldata(user_id, None, None)
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
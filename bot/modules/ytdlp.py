@@ -21,6 +21,7 @@ from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
 from bot.helper.ext_utils.help_messages import YT_HELP_MESSAGE
 from bot.helper.ext_utils.bulk_links import extract_bulk_links
+from bot.helper.ext_utils.user_files import user_files
 
 
 @new_task
@@ -427,7 +428,7 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
             return
         elif up not in ['rcl', 'gd', 'ddl']:
             if up.startswith('mrcc:'):
-                config_path = f'wcl/{message.from_user.id}.conf'
+                config_path = await user_files.materialize(message.from_user.id, 'rclone') or f'wcl/{message.from_user.id}.conf'
             else:
                 config_path = 'wcl.conf'
             if not await aiopath.exists(config_path):